@@ -1,23 +1,17 @@
 import sys
 import subprocess
-import importlib
+from src.pipeline.stages import ETL_TARGETS, run_pipeline
 
 def run_etl(job_role="data analyst"):
     print(f"🚀 Running ETL pipeline for role: '{job_role}' ...")
-    # Pass job_role into fetch_jobs.main(job_role)
-    fetch_module = importlib.import_module("src.etl.fetch_jobs")
-    fetch_module.main(job_role)
-
-    # Ingest + Process remain same
-    importlib.import_module("src.etl.ingest").main()
-    importlib.import_module("src.etl.process").main()
-
+    # The fetch searches only job_role; unchanged stages are skipped
+    run_pipeline(ETL_TARGETS, job_role=job_role)
     print("✅ ETL pipeline finished successfully!")
 
-def run_report():
+def run_report(job_role="data analyst"):
     print("🚀 Generating report...")
-    module = importlib.import_module("src.analysis.report")
-    module.main()
+    # Brings the stages the report reads up to date first (a no-op when nothing changed)
+    run_pipeline(["report"], job_role=job_role)
     print("✅ Report generated successfully!")
 
 def run_dashboard():
@@ -25,8 +19,9 @@ def run_dashboard():
     subprocess.run([sys.executable, "-m", "streamlit", "run", "src/dash/app.py"])
 
 def run_all(job_role="data analyst"):
-    run_etl(job_role)
-    run_report()
+    print(f"🚀 Running ETL pipeline and report for role: '{job_role}' ...")
+    # Report and forecast are independent branches and run in parallel
+    run_pipeline([*ETL_TARGETS, "report"], job_role=job_role)
     run_dashboard()
 
 if __name__ == "__main__":
@@ -40,7 +35,7 @@ if __name__ == "__main__":
     if option == "etl":
         run_etl(job_role)
     elif option == "report":
-        run_report()
+        run_report(job_role)
     elif option == "dashboard":
         run_dashboard()
     elif option == "all":
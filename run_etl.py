@@ -1,30 +1,21 @@
 # run_etl.py
-from src.etl import fetch_jobs, ingest, process, skills, export
+from src.pipeline.stages import ETL_TARGETS, run_pipeline
 
-def run_etl():
-    print("🚀 Starting ETL pipeline...")
-    try:
-        # 1. Fetch jobs
-        fetch_jobs.main()
-
-        # 2. Ingest raw jobs into database
-        ingest.main()
-
-        # 3. Process data (cleaning, transformations)
-        process.main()
-
-        # 4. Extract skills (NLP)
-        skills.main()
 
-        # 5. Export cleaned data
-        export.main()
-
-        print("✅ ETL pipeline completed successfully!")
-
-    except Exception as e:
-        print(f"❌ ETL pipeline failed: {e}")
-        raise
+def run_etl(profile=False, force=(), targets=None):
+    print("🚀 Starting ETL pipeline...")
+    # Stages declare their inputs and outputs (src/pipeline/stages.py); those whose
+    # code, inputs and upstream data are unchanged since their last run are skipped,
+    # and every stage that runs is recorded in pipeline_runs
+    run_pipeline(targets or ETL_TARGETS, force=force, profile=profile)
+    print("✅ ETL pipeline completed successfully!")
 
 
 if __name__ == "__main__":
-    run_etl()
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the ETL pipeline")
+    parser.add_argument("--profile", action="store_true", help="save a cProfile of every stage to data/profiles")
+    parser.add_argument("--force", nargs="*", metavar="STAGE",
+                        help="re-run these stages even if unchanged (all stages when none are named)")
+    args = parser.parse_args()
+    run_etl(profile=args.profile, force=True if args.force == [] else tuple(args.force or ()))
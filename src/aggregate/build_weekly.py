@@ -1,39 +1,184 @@
 # src/aggregate/build_weekly.py
 import pandas as pd
-from sqlalchemy import create_engine, text
-from src.config import DB_URL
-
-def main():
-    engine = create_engine(DB_URL, future=True)
-    jc = pd.read_sql("select id, posted_at, salary_min, salary_max from jobs_clean", engine)
-    js = pd.read_sql("""select job_skills.job_id, skills.id as skill_id
-                        from job_skills join skills on skills.id = job_skills.skill_id""", engine)
-    if jc.empty or js.empty:
-        print("No data to aggregate"); return
-
-    df = js.merge(jc, left_on="job_id", right_on="id", how="inner")
-    df["posted_at"] = pd.to_datetime(df["posted_at"], errors="coerce")
-    df["week_start"] = df["posted_at"].dt.to_period("W").apply(lambda p: p.start_time.date())
-    df["sal"] = df["salary_min"].fillna(df["salary_max"])
-
-    ag = (df.groupby(["week_start","skill_id"])
-            .agg(demand=("job_id","count"),
-                 median_salary=("sal","median"),
-                 p25_salary=("sal",lambda s: s.quantile(0.25)),
-                 p75_salary=("sal",lambda s: s.quantile(0.75)))
-            .reset_index())
+from sqlalchemy import text
+from src.db import connection, get_engine
+from src.etl.bulk import bulk_write, frame_rows
+from src.schema import migrate
 
+# Name of this stage's entry in etl_watermarks
+WATERMARK = "weekly_skill_demand"
+
+# jobs_clean column that records when a posting was last loaded or changed
+CHANGED_COL = "updated_at"
+
+AGG_COLS = ["week_start", "skill_id", "demand", "median_salary", "p25_salary", "p75_salary"]
+
+
+def week_start(posted_at: pd.Series) -> pd.Series:
+    """Monday of each posting's week, computed with array arithmetic (NaT for bad dates)."""
+    d = pd.to_datetime(posted_at, errors="coerce", utc=True).dt.tz_localize(None).dt.normalize()
+    return d - pd.to_timedelta(d.dt.dayofweek, unit="D")
+
+
+def aggregate(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Weekly demand and salary quartiles per skill.
+
+    `df` has one row per (job, skill) with posted_at, salary_min and salary_max.
+    All three quantiles come out of a single grouped pass.
+    """
+    df = df.assign(
+        week_start=week_start(df["posted_at"]),
+        # Numeric even when every salary in the batch is missing (object dtype from SQL)
+        sal=pd.to_numeric(df["salary_min"].fillna(df["salary_max"]), errors="coerce"),
+    ).dropna(subset=["week_start"])
+    if df.empty:
+        return pd.DataFrame(columns=AGG_COLS)
+
+    grouped = df.groupby(["week_start", "skill_id"])
+    q = grouped["sal"].quantile([0.25, 0.5, 0.75]).unstack()
+    ag = pd.DataFrame({
+        "demand": grouped.size(),
+        "median_salary": q[0.5],
+        "p25_salary": q[0.25],
+        "p75_salary": q[0.75],
+    }).reset_index()
+    ag["week_start"] = ag["week_start"].dt.strftime("%Y-%m-%d")
+    ag["skill_id"] = ag["skill_id"].astype("int64")
+    return ag[AGG_COLS]
+
+
+def _get_watermark(engine):
+    with engine.begin() as conn:
+        row = conn.execute(text("select value from etl_watermarks where name = :n"), {"n": WATERMARK}).fetchone()
+    return row[0] if row else None
+
+
+def _set_watermark(conn, value):
+    conn.execute(text("""
+        insert or replace into etl_watermarks (name, value, updated_at)
+        values (:n, :v, datetime('now'))
+    """), {"n": WATERMARK, "v": value})
+
+
+def _load(engine, where="", params=None):
+    """(job, skill) rows with posted_at and salaries; `where` filters jobs_clean, and job_skills with it."""
+    jc = pd.read_sql(text(f"select id, posted_at, salary_min, salary_max from jobs_clean {where}"),
+                     engine, params=params or {})
+    js = pd.read_sql(text(f"""
+        select job_skills.job_id, skills.id as skill_id
+        from job_skills join skills on skills.id = job_skills.skill_id
+        {f"where job_skills.job_id in (select id from jobs_clean {where})" if where else ""}
+    """), engine, params=params or {})
+    return js.merge(jc, left_on="job_id", right_on="id", how="inner")
+
+
+def _week_ranges(weeks):
+    """WHERE clause and parameters selecting postings in `weeks`, one posted_at range per run of consecutive weeks."""
+    ranges = []
+    for w in sorted(weeks):
+        if ranges and ranges[-1][1] == w:
+            ranges[-1][1] = w + pd.Timedelta(days=7)
+        else:
+            ranges.append([w, w + pd.Timedelta(days=7)])
+    clauses, params = [], {}
+    for i, (lo, hi) in enumerate(ranges):
+        clauses.append(f"(posted_at >= :lo{i} and posted_at < :hi{i})")
+        params.update({f"lo{i}": lo.strftime("%Y-%m-%d"), f"hi{i}": hi.strftime("%Y-%m-%d")})
+    return "where " + " or ".join(clauses), params
+
+
+def _touched_weeks(engine, watermark):
+    """
+    Weeks holding postings loaded or changed after `watermark`, plus the new watermark.
+
+    An update that moved a posting to another week also touches the week it
+    left, which jobs_changes records as prev_posted_at.
+    """
+    changed = pd.read_sql(
+        text(f"select posted_at, {CHANGED_COL} from jobs_clean where {CHANGED_COL} > :wm"),
+        engine, params={"wm": watermark},
+    )
+    if changed.empty:
+        return [], watermark
+    left = pd.read_sql(
+        text("select prev_posted_at from jobs_changes where loaded_at > :wm and prev_posted_at is not null"),
+        engine, params={"wm": watermark},
+    )
+    dates = pd.concat([changed["posted_at"], left["prev_posted_at"]])
+    weeks = week_start(dates).dropna().drop_duplicates().sort_values()
+    return list(weeks), changed[CHANGED_COL].max()
+
+
+def _emptied_weeks(engine):
+    """
+    Weeks in weekly_skill_demand that no longer hold any posting.
+
+    Deleted postings (export's full reload cascades into jobs_clean) leave no
+    changed row behind for the watermark to see, so their weeks are found here.
+    """
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("""
+            select distinct w.week_start from weekly_skill_demand w
+            where not exists (
+                select 1 from jobs_clean c
+                where c.posted_at >= w.week_start and c.posted_at < date(w.week_start, '+7 days')
+            )
+        """).fetchall()
+    return [pd.Timestamp(r[0]) for r in rows]
+
+
+def main(incremental=True):
+    # jobs_clean, job_skills, skills, weekly_skill_demand and etl_watermarks (src/schema.py)
+    with connection() as conn:
+        migrate(conn)
+    engine = get_engine()
+
+    with engine.connect() as conn:
+        jc_cols = {r[1] for r in conn.exec_driver_sql("PRAGMA table_info(jobs_clean)").fetchall()}
+    watermark = _get_watermark(engine)
+
+    if incremental and watermark and CHANGED_COL in jc_cols:
+        weeks, new_watermark = _touched_weeks(engine, watermark)
+        weeks = sorted(set(weeks) | set(_emptied_weeks(engine)))
+        if not weeks:
+            print("✅ weekly_skill_demand is up to date"); return
+        # Only postings inside the touched weeks (and their skills) are re-read and re-aggregated
+        df = _load(engine, *_week_ranges(weeks))
+        touched = {w.strftime("%Y-%m-%d") for w in weeks}
+        ag = aggregate(df)
+        ag = ag[ag["week_start"].isin(touched)]
+    else:
+        df = _load(engine)
+        if df.empty:
+            print("No data to aggregate"); return
+        ag = aggregate(df)
+        touched = None
+        new_watermark = None
+        if CHANGED_COL in jc_cols:
+            with engine.connect() as conn:
+                new_watermark = conn.execute(text(f"select max({CHANGED_COL}) from jobs_clean")).scalar()
+
+    # Upsert, stale-row deletes and the watermark commit together: a failed run
+    # leaves the table and its watermark as they were
     with engine.begin() as conn:
-        for _, r in ag.iterrows():
-            conn.execute(text("""
-                insert or replace into weekly_skill_demand
-                (week_start, skill_id, demand, median_salary, p25_salary, p75_salary)
-                values (:w,:s,:d,:m,:p25,:p75)
-            """), {"w": str(r.week_start), "s": int(r.skill_id), "d": int(r.demand),
-                   "m": (None if pd.isna(r.median_salary) else float(r.median_salary)),
-                   "p25": (None if pd.isna(r.p25_salary) else float(r.p25_salary)),
-                   "p75": (None if pd.isna(r.p75_salary) else float(r.p75_salary))})
-    print("✅ Built weekly_skill_demand")
+        bulk_write(conn, """
+            insert or replace into weekly_skill_demand
+            (week_start, skill_id, demand, median_salary, p25_salary, p75_salary)
+            values (?,?,?,?,?,?)
+        """, frame_rows(ag, AGG_COLS), commit=False)
+
+        # Drop (week, skill) rows that no longer have any postings in the rebuilt weeks
+        existing = pd.read_sql(text("select week_start, skill_id from weekly_skill_demand"), conn)
+        if touched is not None:
+            existing = existing[existing["week_start"].isin(touched)]
+        fresh = set(zip(ag["week_start"], ag["skill_id"]))
+        stale = [(w, int(s)) for w, s in zip(existing["week_start"], existing["skill_id"]) if (w, s) not in fresh]
+        bulk_write(conn, "delete from weekly_skill_demand where week_start = ? and skill_id = ?", stale, commit=False)
+
+        if new_watermark:
+            _set_watermark(conn, str(new_watermark))
+    print(f"✅ Built weekly_skill_demand ({len(ag)} rows, {len(stale)} removed)")
 
 if __name__ == "__main__":
     main()
@@ -1,22 +1,21 @@
 import os
-import sqlite3
 import pandas as pd
 import matplotlib.pyplot as plt
+from src.db import connect
 
 # Ensure output folder exists
 os.makedirs("reports/plots", exist_ok=True)
 
 # Connect to DB
-conn = sqlite3.connect("data/jobs.db")
+conn = connect()
 
 # ---- Top 10 skills ----
 skills = pd.read_sql("""
-    SELECT s.name AS skill, COUNT(*) AS demand
-    FROM job_skills js
-    JOIN skills s ON js.skill_id = s.id
-    GROUP BY s.name
-    ORDER BY demand DESC
-    LIMIT 10;
+    SELECT s.name AS skill, top.demand
+    FROM (SELECT skill_id, COUNT(*) AS demand FROM job_skills
+          GROUP BY skill_id ORDER BY demand DESC LIMIT 10) top
+    JOIN skills s ON s.id = top.skill_id
+    ORDER BY top.demand DESC;
 """, conn)
 
 plt.figure(figsize=(10,6))
@@ -1,13 +1,12 @@
 # src/analysis/report.py
 import os
-import sqlite3
 import pandas as pd
 import matplotlib.pyplot as plt
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.pagesizes import A4
+from src.db import connect
 
-DB_PATH = "data/jobs.db"
 REPORT_PATH = "reports/job_market_report.pdf"
 
 def generate_report():
@@ -15,15 +14,15 @@ def generate_report():
     os.makedirs("reports", exist_ok=True)
 
     # 1. Query top skills
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect()
 
+    # Counted on the job_skills(skill_id) index; names joined for the top 10 only
     skills = pd.read_sql("""
-        SELECT s.name AS skill, COUNT(*) AS demand
-        FROM job_skills js
-        JOIN skills s ON js.skill_id = s.id
-        GROUP BY s.name
-        ORDER BY demand DESC
-        LIMIT 10;
+        SELECT s.name AS skill, top.demand
+        FROM (SELECT skill_id, COUNT(*) AS demand FROM job_skills
+              GROUP BY skill_id ORDER BY demand DESC LIMIT 10) top
+        JOIN skills s ON s.id = top.skill_id
+        ORDER BY top.demand DESC;
     """, conn)
 
     titles = pd.read_sql("""
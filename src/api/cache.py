@@ -0,0 +1,174 @@
+# src/api/cache.py
+import os
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+from src.config import DB_PATH
+from src.db import connect, dataset_version, stamp
+from src.etl import storage
+
+# Columns served by the API
+COLUMNS = [
+    "title", "company", "location", "created", "salary_min", "salary_max",
+    "salary_min_annual", "salary_max_annual", "description", "redirect_url", "skills",
+    "matched_roles", "duplicates"
+]
+
+# Text columns with many repeats are held as categoricals
+CATEGORICAL = ["title", "company", "location"]
+
+
+class Snapshot:
+    """One immutable load of the dataset plus everything precomputed from it."""
+
+    def __init__(self, df, version, source):
+        self.df = df
+        self.version = version
+        self.source = source
+        self.loaded_at = time.time()
+        self.skill_counts = _skill_counts(df)
+
+
+def _skill_counts(df) -> pd.Series:
+    col = "skills" if "skills" in df.columns else "tags" if "tags" in df.columns else None
+    if col is None:
+        return pd.Series(dtype="int64")
+    counts = Counter(
+        s.strip()
+        for tags in df[col].dropna()
+        for s in str(tags).split(",")
+        if s.strip()
+    )
+    return pd.Series(counts, dtype="int64").sort_values(ascending=False, kind="stable")
+
+
+def _compact(df) -> pd.DataFrame:
+    df = df[[c for c in COLUMNS if c in df.columns]].copy()
+    for col in CATEGORICAL:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
+
+
+class DatasetCache:
+    """
+    Keeps the jobs dataset in memory and reloads it only when its source changes.
+
+    The source is the `jobs` table in jobs.db when it exists, else the raw jobs
+    artifact. A check costs a few stat() calls of the DB (and its WAL) or the
+    artifact file; only when the DB files changed is the jobs counter in
+    dataset_versions read, and only a new count reloads. Readers always get a
+    complete snapshot; a reload swaps the reference in one step.
+    """
+
+    def __init__(self, db_path=DB_PATH, min_check_interval=1.0):
+        self.db_path = db_path
+        self.min_check_interval = min_check_interval
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.last_check = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._jobs = (None, None)  # (DB stamp, jobs version seen at it)
+
+    def _jobs_version(self, db_stamp):
+        """
+        dataset_versions' counter for jobs, or None without a jobs table.
+
+        Asked of sqlite only when the DB files changed; otherwise the last answer
+        stands. Writes to other tables move the stamp but not this counter.
+        """
+        if db_stamp != self._jobs[0]:
+            version = None
+            if db_stamp[0] is not None:
+                conn = connect(self.db_path, readonly=True)
+                try:
+                    if conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'"
+                    ).fetchone() is not None:
+                        version = dataset_version(conn, "jobs")
+                finally:
+                    conn.close()
+            self._jobs = (db_stamp, version)
+        return self._jobs[1]
+
+    def _version(self):
+        jobs_version = self._jobs_version(stamp(self.db_path))
+        if jobs_version is not None:
+            return ("db", jobs_version)
+        for fmt in storage.FORMATS:
+            path = storage.artifact_path("jobs", fmt)
+            if os.path.exists(path):
+                return ("file", path, _file_stamp(path))
+        return None
+
+    def _load(self, version):
+        if version is None:
+            return Snapshot(pd.DataFrame(columns=COLUMNS), version, None)
+        if version[0] == "db":
+            conn = connect(self.db_path, readonly=True)
+            try:
+                cols = [c[1] for c in conn.execute("PRAGMA table_info(jobs)").fetchall()]
+                wanted = ", ".join(c for c in COLUMNS if c in cols)
+                df = pd.read_sql(f"SELECT {wanted} FROM jobs", conn)
+            finally:
+                conn.close()
+            return Snapshot(_compact(df), version, self.db_path)
+        df = storage.read_frame("jobs", columns=COLUMNS)
+        return Snapshot(_compact(df), version, version[1])
+
+    def refresh(self, force=False) -> bool:
+        """Reload if the source changed; returns True when a new snapshot was loaded."""
+        with self.lock:
+            self.last_check = time.monotonic()
+            version = self._version()
+            if not force and self.snapshot is not None and version == self.snapshot.version:
+                return False
+            self.snapshot = self._load(version)
+            return True
+
+    def get(self) -> Snapshot:
+        snapshot = self.snapshot
+        if snapshot is None or time.monotonic() - self.last_check >= self.min_check_interval:
+            if self._thread is None or snapshot is None:
+                self.refresh()
+            snapshot = self.snapshot
+        return snapshot
+
+    def start_background_refresh(self, interval=5.0):
+        """Poll for changes on a daemon thread so requests never wait on a reload."""
+        if self._thread is not None:
+            return
+        self.refresh()
+
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Dataset reload failed: {e}")
+
+        self._thread = threading.Thread(target=loop, name="dataset-cache", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def records(df) -> list:
+    """DataFrame rows as JSON-safe dicts (NaN -> None)."""
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict(orient="records")
@@ -1,10 +1,56 @@
-from fastapi import FastAPI
-import pandas as pd
-from pathlib import Path
+import os
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query
+from src.api.cache import DatasetCache, records
+from src.api.query import query_jobs, search_jobs
+from src.config import DB_PATH
+from src.db import connect
+from src.schema import SCHEMA_VERSION, version
 
-app = FastAPI(title="Job Market Analytics API")
+# In-memory dataset, reloaded only when the DB / jobs artifact changes
+cache = DatasetCache()
 
-DATA_PATH = Path("data/jobs.csv")
+# Poll for changes on a background thread instead of checking inside requests
+BACKGROUND_RELOAD = float(os.getenv("API_BACKGROUND_RELOAD_SECS", "0"))
+
+
+def _check_schema():
+    """
+    Refuse to start on a database the pipeline has not migrated.
+
+    The API only reads: migrations and the search index are applied by the
+    pipeline or `python -m src.db_init`, never by a serving process.
+    """
+    if not os.path.exists(DB_PATH):
+        return
+    conn = connect(DB_PATH, readonly=True)
+    try:
+        current = version(conn)
+        has_search = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+        ).fetchone() is not None
+    finally:
+        conn.close()
+    if current < SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema is v{current}, the API needs v{SCHEMA_VERSION}. "
+                           "Run `python -m src.db_init` or the pipeline first.")
+    if not has_search:
+        raise RuntimeError("Search index jobs_fts is missing (SQLite without FTS5?). "
+                           "Run `python -m src.db_init` with an FTS5-enabled SQLite.")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    _check_schema()
+    if BACKGROUND_RELOAD > 0:
+        cache.start_background_refresh(BACKGROUND_RELOAD)
+    else:
+        cache.refresh()
+    yield
+    cache.stop()
+
+app = FastAPI(title="Job Market Analytics API", lifespan=lifespan)
 
 @app.get("/")
 def root():
@@ -13,17 +59,52 @@ def root():
 @app.get("/jobs")
 def get_jobs(limit: int = 20):
     """Return job listings"""
-    df = pd.read_csv(DATA_PATH)
-    return df.head(limit).to_dict(orient="records")
+    df = cache.get().df
+    return records(df.head(limit))
 
 @app.get("/skills")
 def get_skills():
     """Return top skills from job postings"""
-    df = pd.read_csv(DATA_PATH)
-    if "tags" not in df.columns:
-        return {"error": "No tags column found"}
-    
-    skills = df["tags"].dropna().str.split(",")
-    all_skills = [s.strip() for sub in skills for s in sub]
-    skill_counts = pd.Series(all_skills).value_counts().head(20)
-    return skill_counts.to_dict()
+    snapshot = cache.get()
+    if snapshot.skill_counts.empty:
+        return {"error": "No skills column found"}
+    return snapshot.skill_counts.head(20).to_dict()
+
+@app.get("/jobs/query")
+def get_jobs_query(
+    company: Optional[List[str]] = Query(None),
+    location: Optional[List[str]] = Query(None),
+    title: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    salary_min: Optional[float] = None,
+    salary_max: Optional[float] = None,
+    skill: Optional[List[str]] = Query(None),
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    include_description: bool = False,
+):
+    """Filter jobs in the database; pass `next_cursor` back as `cursor` for the next page"""
+    if not os.path.exists(DB_PATH):
+        raise HTTPException(status_code=503, detail="Database not found. Run the ETL first.")
+    try:
+        return query_jobs(
+            DB_PATH, company=company, location=location, title=title,
+            created_from=created_from, created_to=created_to,
+            salary_min=salary_min, salary_max=salary_max, skill=skill,
+            cursor=cursor, limit=limit, include_description=include_description
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/search")
+def search(q: str, limit: int = 20, offset: int = 0, include_description: bool = False):
+    """Keyword search over title, company and description, best matches first (BM25)"""
+    if not os.path.exists(DB_PATH):
+        raise HTTPException(status_code=503, detail="Database not found. Run the ETL first.")
+    try:
+        return search_jobs(DB_PATH, q, limit=limit, offset=offset, include_description=include_description)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
@@ -0,0 +1,156 @@
+# src/api/query.py
+import base64
+import json
+import re
+import sqlite3
+
+from src.config import DB_PATH
+from src.db import reader
+
+# Columns returned by the query endpoint (description only on request)
+LIST_COLUMNS = ["id", "title", "company", "location", "created", "salary_min", "salary_max", "redirect_url",
+                "salary_min_annual", "salary_max_annual", "canonical_id", "matched_roles", "duplicates"]
+
+MAX_LIMIT = 500
+
+# bm25 column weights for jobs_fts (title, company, description)
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def encode_cursor(created, job_id) -> str:
+    raw = json.dumps([created or "", job_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        created, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created), int(job_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def query_jobs(db_path=DB_PATH, company=None, location=None, title=None,
+               created_from=None, created_to=None, salary_min=None, salary_max=None,
+               skill=None, cursor=None, limit=50, include_description=False) -> dict:
+    """
+    Filter the jobs table and return one page, newest first.
+
+    Pages are keyed on (created, id): the cursor carries the last row of the
+    previous page, so page N costs the same as page 1 and rows inserted meanwhile
+    never shift the window. Company/location match exactly (case-insensitive),
+    title is a substring match, skill requires every listed skill.
+    """
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    where, params = [], []
+
+    if company:
+        where.append(f"company COLLATE NOCASE IN ({', '.join('?' for _ in company)})")
+        params.extend(company)
+    if location:
+        where.append(f"location COLLATE NOCASE IN ({', '.join('?' for _ in location)})")
+        params.extend(location)
+    if title:
+        where.append("title LIKE ?")
+        params.append(f"%{title}%")
+    if created_from:
+        where.append("IFNULL(created, '') >= ?")
+        params.append(created_from)
+    if created_to:
+        # Date-only bounds include the whole day
+        where.append("IFNULL(created, '') <= ?")
+        params.append(created_to + "\uffff" if len(created_to) == 10 else created_to)
+    if salary_min is not None:
+        where.append("IFNULL(salary_max, salary_min) >= ?")
+        params.append(salary_min)
+    if salary_max is not None:
+        where.append("IFNULL(salary_min, salary_max) <= ?")
+        params.append(salary_max)
+
+    # Read-only connection kept per worker thread; it is not closed here
+    conn = reader(db_path)
+    columns = {c[1] for c in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+    for s in skill or []:
+        # Through the job_skills junction, so ix_job_skills_skill finds the postings
+        where.append("""id IN (
+            SELECT js.job_id FROM job_skills js JOIN skills sk ON sk.id = js.skill_id WHERE sk.name = ?
+        )""")
+        params.append(s.strip().lower())
+    if cursor:
+        # Written as a range on the index's leading column so SQLite seeks instead of scanning
+        last_created, last_id = decode_cursor(cursor)
+        where.append("IFNULL(created, '') <= ? AND (IFNULL(created, '') < ? OR id < ?)")
+        params.extend([last_created, last_created, last_id])
+
+    select = [c for c in LIST_COLUMNS if c in columns]
+    if "skills" in columns:
+        select.append("skills")
+    if include_description:
+        select.append("description")
+
+    sql = f"""
+        SELECT {", ".join(select)} FROM jobs
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY IFNULL(created, '') DESC, id DESC
+        LIMIT ?
+    """
+    rows = [dict(r) for r in conn.execute(sql, [*params, limit + 1]).fetchall()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created"], rows[-1]["id"])
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def fts_query(text) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match, and the last
+    word also matches as a prefix (so "pyth" finds "python").
+    """
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        return ""
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += " *"
+    return " AND ".join(quoted)
+
+
+def search_jobs(db_path=DB_PATH, q="", limit=20, offset=0, include_description=False,
+                highlight=("<mark>", "</mark>")) -> dict:
+    """
+    Ranked keyword search over title, company and description.
+
+    Matches come from the jobs_fts index ordered by BM25 (title hits weigh most),
+    each with a description snippet around the matched terms, wrapped in `highlight`.
+    """
+    match = fts_query(q)
+    if not match:
+        raise ValueError("Empty search query")
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    offset = max(0, int(offset))
+
+    conn = reader(db_path)
+    columns = {c[1] for c in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+    select = [f"j.{c}" for c in LIST_COLUMNS if c in columns]
+    if include_description:
+        select.append("j.description")
+    sql = f"""
+        SELECT {", ".join(select)},
+               snippet(jobs_fts, 2, ?, ?, '…', 16) AS snippet,
+               bm25(jobs_fts, {", ".join(map(str, SEARCH_WEIGHTS))}) AS score
+        FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid
+        WHERE jobs_fts MATCH ?
+        ORDER BY score
+        LIMIT ? OFFSET ?
+    """
+    try:
+        rows = conn.execute(sql, [*highlight, match, limit + 1, offset]).fetchall()
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            raise LookupError("Search index not built yet. Run `python -m src.db_init` or the pipeline.")
+        raise
+
+    items = [dict(r) for r in rows[:limit]]
+    next_offset = offset + limit if len(rows) > limit else None
+    return {"items": items, "next_offset": next_offset}
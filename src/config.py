@@ -4,14 +4,37 @@ import os
 # Base project directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Data directory (always the same for fetch & process); JOBS_DATA_DIR points a run
+# (e.g. a benchmark) at a separate workspace
+DATA_DIR = os.getenv("JOBS_DATA_DIR") or os.path.join(BASE_DIR, "..", "data")
+
 # Database path
-DB_PATH = os.path.join(BASE_DIR, "..", "data", "jobs.db")
+DB_PATH = os.path.join(DATA_DIR, "jobs.db")
 
 # SQLAlchemy connection URL
 DB_URL = f"sqlite:///{DB_PATH}"
 
-# Data directory (always the same for fetch & process)
-DATA_DIR = os.path.join(BASE_DIR, "..", "data")
+# Skills taxonomy (name, category, |-separated aliases)
+TAXONOMY_PATH = os.path.join(BASE_DIR, "..", "taxonomy", "skills.csv")
+
+# Gazetteer of canonical cities/states/countries (with |-separated spelling variants)
+LOCATIONS_PATH = os.path.join(BASE_DIR, "..", "taxonomy", "locations.csv")
+
+# Local exchange-rate table used to normalize parsed salaries
+CURRENCY_RATES_PATH = os.path.join(BASE_DIR, "..", "taxonomy", "currency_rates.csv")
+BASE_CURRENCY = os.getenv("BASE_CURRENCY", "USD")
+
+# Processed artifacts written by process.py
+PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
+
+# Storage format for intermediate ETL artifacts: "parquet" (needs pyarrow) or "csv"
+ETL_FORMAT = os.getenv("ETL_FORMAT", "parquet").lower()
+
+# Also write CSV (and jobs.json) copies of the intermediate artifacts
+ETL_EXPORT_CSV = os.getenv("ETL_EXPORT_CSV", "0").lower() in ("1", "true", "yes")
+
+# Persistent cache of skills extracted per description (used by the dashboard)
+NLP_CACHE_PATH = os.path.join(DATA_DIR, "nlp_cache.db")
 
 # Ensure the folder exists
 os.makedirs(DATA_DIR, exist_ok=True)
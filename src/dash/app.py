@@ -3,13 +3,12 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine
-from src.config import DB_URL
+from src.db import get_engine
 
 st.set_page_config(page_title="Job Market Analytics", layout="wide")
 st.title("📊 Real-Time Job Market Analytics")
 
-engine = create_engine(DB_URL, future=True)
+engine = get_engine()
 
 skills = pd.read_sql("select id, name from skills order by name", engine)
 if skills.empty:
@@ -55,4 +54,4 @@ if not fc.empty:
     fc["ds"] = pd.to_datetime(fc["ds"])
     st.area_chart(fc.set_index("ds")["yhat"])
 else:
-    st.info("No forecast yet. Run: python src\\forecast\\train.py")
+    st.info("No forecast yet. Run: python -m src.forecast.train")
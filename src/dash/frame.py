@@ -0,0 +1,152 @@
+# src/dash/frame.py
+import numpy as np
+import pandas as pd
+
+from src.config import DB_PATH
+from src.dash import query
+from src.db import connection
+
+# Facet columns matched case-insensitively, like the SQL filters in src/dash/query.py
+TEXT_FACETS = ["title", "location", "company"]
+
+
+class Facet:
+    """
+    One dictionary-encoded column with a row-ID index per value.
+
+    `codes` holds an int32 code per row (-1 where missing) and `labels` the value
+    of each code. `rows(code)` is a slice of `order`, the row positions sorted
+    by code, so selecting a value never scans the column.
+    """
+
+    def __init__(self, codes, labels, keys):
+        self.codes = codes.astype(np.int32)
+        self.labels = labels
+        self.lookup = {k: c for c, k in enumerate(keys)}
+        self.order = np.argsort(self.codes, kind="stable").astype(np.int32)
+        self.starts = np.searchsorted(self.codes[self.order], np.arange(len(labels) + 1))
+
+    @classmethod
+    def text(cls, values: pd.Series):
+        """Codes per case-insensitive spelling, labelled with its first spelling in sort order."""
+        codes, keys = pd.factorize(values.str.lower(), sort=True)
+        present = codes >= 0
+        labels = values[present].groupby(codes[present]).min().reindex(range(len(keys))).to_numpy()
+        return cls(codes, labels, list(keys))
+
+    def rows(self, code):
+        return self.order[self.starts[code]:self.starts[code + 1]]
+
+    def mask(self, values, n):
+        """Rows holding any of `values` (the union of their row-ID lists)."""
+        selected = np.zeros(n, dtype=bool)
+        for v in values:
+            code = self.lookup.get(v.lower())
+            if code is not None:
+                selected[self.rows(code)] = True
+        return selected
+
+    def counts(self, mask, limit=10) -> pd.Series:
+        """Rows per value under `mask`, most common first (ties by label)."""
+        codes = self.codes[mask]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.labels))
+        top = np.lexsort((np.arange(len(counts)), -counts))[:limit]
+        top = top[counts[top] > 0]
+        return pd.Series(counts[top], index=self.labels[top], dtype="int64")
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.order.nbytes + self.starts.nbytes + self.labels.nbytes
+
+
+class JobFrame:
+    """
+    The dashboard's jobs, held once per process in a compact form.
+
+    Facets are dictionary-encoded with per-value row-ID indexes, salaries are
+    float32 and descriptions and URLs stay in the database: the rows of the
+    visible page are fetched by ID. A multi-facet filter is the intersection of
+    the facets' row sets, and facet counts are a bincount over that mask.
+    """
+
+    def __init__(self, df: pd.DataFrame, city_labels=None, db_path=DB_PATH):
+        self.db_path = db_path
+        self.n = len(df)
+        self.city_labels = city_labels or {}
+        self.ids = df["id"].to_numpy(dtype=np.int64)
+        if self.city_labels and "location" in df:
+            # Resolved postings go by their city label, the rest by their raw location
+            df = df.assign(location=df["city_id"].map(self.city_labels).where(df["city_id"].notna(), df["location"]))
+        self.facets = {c: Facet.text(df[c]) for c in TEXT_FACETS if c in df}
+        self.salary_min = df["salary_min"].to_numpy(dtype=np.float32) if "salary_min" in df else None
+        self.salary_max = df["salary_max"].to_numpy(dtype=np.float32) if "salary_max" in df else None
+        # Row positions newest first, the order pages are shown in
+        newest = df.assign(created=df["created"].fillna("") if "created" in df else "")
+        self.newest = np.asarray(newest.sort_values(["created", "id"], ascending=False).index, dtype=np.int32)
+
+    @classmethod
+    def load(cls, db_path=DB_PATH):
+        """Read the filterable columns of jobs (no descriptions) and encode them."""
+        with connection(db_path, readonly=True) as conn:
+            columns = {c[1] for c in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+            select = [c for c in ["id", "created", *TEXT_FACETS, "salary_min", "salary_max", "city_id"]
+                      if c in columns]
+            df = pd.read_sql(f"SELECT {', '.join(select)} FROM jobs", conn)
+        city_labels = query.city_facets(db_path) if query.by_city(db_path) else {}
+        return cls(df, city_labels, db_path)
+
+    def options(self) -> dict:
+        """Sidebar options in the shape of the SQL backend's facets."""
+        def labels(column):
+            facet = self.facets.get(column)
+            return [] if facet is None else list(facet.labels)
+
+        salary = None
+        if self.salary_min is not None and (np.isfinite(self.salary_min).any() or np.isfinite(self.salary_max).any()):
+            salary = (int(np.nan_to_num(self.salary_min, nan=0).min()), int(np.nan_to_num(self.salary_max, nan=0).max()))
+        return {
+            "roles": labels("title"),
+            "locations": labels("location"),
+            "city_labels": self.city_labels,
+            "companies": labels("company"),
+            "salary": salary,
+        }
+
+    def select(self, roles=(), locations=(), companies=(), salary=None) -> np.ndarray:
+        """Boolean row mask for the sidebar filters (same semantics as query.filter_sql)."""
+        mask = np.ones(self.n, dtype=bool)
+        for column, values in (("title", roles), ("location", locations), ("company", companies)):
+            if values and column in self.facets:
+                mask &= self.facets[column].mask(values, self.n)
+        if salary and self.salary_min is not None:
+            low, high = salary
+            mask &= np.nan_to_num(self.salary_min, nan=0) >= low
+            mask &= np.nan_to_num(self.salary_max, nan=query.SALARY_CEILING) <= high
+        return mask
+
+    def insights(self, mask) -> dict:
+        """KPI cards and top-10 counts under `mask`, as query.kpis / query.top_locations / query.top_counts return them."""
+        averages = []
+        for column in (self.salary_min, self.salary_max):
+            values = column[mask] if column is not None else np.array([])
+            values = values[np.isfinite(values)]
+            if len(values):
+                averages.append(float(values.mean(dtype=np.float64)))
+        empty = pd.Series(dtype="int64")
+        return {
+            "total": int(mask.sum()),
+            "avg_salary": sum(averages) / len(averages) if averages else None,
+            "locations": self.facets["location"].counts(mask) if "location" in self.facets else empty,
+            "companies": self.facets["company"].counts(mask) if "company" in self.facets else empty,
+        }
+
+    def page(self, mask, number=1, size=50) -> pd.DataFrame:
+        """One page of the selected postings, newest first, fetched from the database by ID."""
+        selected = self.newest[mask[self.newest]]
+        start = (max(1, number) - 1) * size
+        return query.rows(self.db_path, self.ids[selected[start:start + size]])
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.ids, self.newest] + [a for a in (self.salary_min, self.salary_max) if a is not None]
+        return sum(a.nbytes for a in arrays) + sum(f.nbytes for f in self.facets.values())
@@ -0,0 +1,220 @@
+# src/dash/query.py
+import sqlite3
+
+import pandas as pd
+
+from src.config import DB_PATH
+from src.db import reader
+
+# Columns of the postings table on the dashboard (descriptions stay in the database)
+PAGE_COLUMNS = ["id", "title", "company", "location", "created", "salary_min", "salary_max", "redirect_url"]
+
+# The dashboard's salary filter treats a missing maximum as this
+SALARY_CEILING = 1_000_000
+
+
+def _columns(conn) -> set:
+    return {c[1] for c in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+
+
+def has_jobs(db_path=DB_PATH) -> bool:
+    conn = reader(db_path)
+    if "jobs" not in {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}:
+        return False
+    return conn.execute("SELECT EXISTS (SELECT 1 FROM jobs)").fetchone()[0] == 1
+
+
+def by_city(db_path=DB_PATH) -> bool:
+    """True when the location stage has resolved postings to gazetteer city IDs."""
+    conn = reader(db_path)
+    if "city_id" not in _columns(conn):
+        return False
+    return conn.execute("SELECT EXISTS (SELECT 1 FROM jobs WHERE city_id IS NOT NULL)").fetchone()[0] == 1
+
+
+def filter_sql(roles=(), locations=(), companies=(), salary=None, city_labels=None):
+    """
+    WHERE clause and parameters for the dashboard's sidebar filters.
+
+    Roles, locations and companies match any of the selected values (case-
+    insensitive, like the API, so the NOCASE indexes serve them). Locations are
+    labels from location_values(): with `city_labels` ({city_id: label}), a
+    label selects the postings resolved to that city as well as unresolved
+    postings whose raw location reads the same. `salary` is a (low, high) range.
+    """
+    where, params = [], []
+    if roles:
+        where.append(f"title COLLATE NOCASE IN ({', '.join('?' for _ in roles)})")
+        params.extend(roles)
+    if locations:
+        raw = f"location COLLATE NOCASE IN ({', '.join('?' for _ in locations)})"
+        if city_labels:
+            selected = {l.lower() for l in locations}
+            ids = [i for i, label in city_labels.items() if label.lower() in selected]
+            matches = [f"(city_id IS NULL AND {raw})"]
+            if ids:
+                matches.insert(0, f"city_id IN ({', '.join('?' for _ in ids)})")
+            where.append(f"({' OR '.join(matches)})")
+            params.extend(ids)
+        else:
+            where.append(raw)
+        params.extend(locations)
+    if companies:
+        where.append(f"company COLLATE NOCASE IN ({', '.join('?' for _ in companies)})")
+        params.extend(companies)
+    if salary:
+        where.append(f"IFNULL(salary_min, 0) >= ? AND IFNULL(salary_max, {SALARY_CEILING}) <= ?")
+        params.extend(salary)
+    return ("WHERE " + " AND ".join(where) if where else ""), params
+
+
+def facet_values(column, db_path=DB_PATH) -> list:
+    """Distinct non-empty values of a text column, one per case-insensitive spelling."""
+    conn = reader(db_path)
+    if column not in _columns(conn):
+        return []
+    rows = conn.execute(f"""
+        SELECT MIN({column}) FROM jobs WHERE {column} IS NOT NULL
+        GROUP BY {column} COLLATE NOCASE ORDER BY {column} COLLATE NOCASE
+    """).fetchall()
+    return [r[0] for r in rows]
+
+
+def city_facets(db_path=DB_PATH) -> dict:
+    """{city_id: "City, Country"} for the cities postings resolved to, ordered by label."""
+    conn = reader(db_path)
+    rows = conn.execute("""
+        SELECT c.id, c.name || ', ' || k.name AS label
+        FROM geo_cities c JOIN geo_countries k ON k.id = c.country_id
+        WHERE c.id IN (SELECT DISTINCT city_id FROM jobs WHERE city_id IS NOT NULL)
+        ORDER BY label
+    """).fetchall()
+    return {r[0]: r[1] for r in rows}
+
+
+def _merge_labels(labels) -> list:
+    """One label per case-insensitive spelling (the first in sort order), sorted case-insensitively."""
+    merged = {}
+    for label in sorted(labels):
+        merged.setdefault(label.lower(), label)
+    return [merged[k] for k in sorted(merged)]
+
+
+def location_values(db_path=DB_PATH, city_labels=None) -> list:
+    """
+    Location filter options: the city label of every resolved posting and the
+    raw location of every posting the gazetteer could not resolve.
+    """
+    if not city_labels:
+        return facet_values("location", db_path)
+    rows = reader(db_path).execute(
+        "SELECT DISTINCT location FROM jobs WHERE city_id IS NULL AND location IS NOT NULL"
+    ).fetchall()
+    return _merge_labels([*city_labels.values(), *(r[0] for r in rows)])
+
+
+def top_locations(db_path=DB_PATH, where="", params=(), city_labels=None, limit=10) -> pd.Series:
+    """Postings per location label (city label, else raw location) among the filtered rows."""
+    if not city_labels:
+        return top_counts("location", db_path, where, params, limit)
+    rows = reader(db_path).execute(f"""
+        SELECT city_id, MIN(location), COUNT(*) FROM jobs {where}
+        GROUP BY city_id, (CASE WHEN city_id IS NULL THEN location END) COLLATE NOCASE
+    """, list(params)).fetchall()
+    counts, names = {}, {}
+    for city_id, location, n in rows:
+        label = city_labels.get(city_id) if city_id is not None else location
+        if label is None:
+            continue
+        key = label.lower()
+        counts[key] = counts.get(key, 0) + n
+        names[key] = min(names.get(key, label), label)
+    top = sorted(counts, key=lambda k: (-counts[k], k))[:limit]
+    return pd.Series([counts[k] for k in top], index=[names[k] for k in top], dtype="int64")
+
+
+def salary_bounds(db_path=DB_PATH):
+    """(lowest, highest) salary for the slider, or None when no posting has one."""
+    conn = reader(db_path)
+    if not {"salary_min", "salary_max"} <= _columns(conn):
+        return None
+    low, high, known = conn.execute("""
+        SELECT MIN(IFNULL(salary_min, 0)), MAX(IFNULL(salary_max, 0)),
+               EXISTS (SELECT 1 FROM jobs WHERE salary_min IS NOT NULL OR salary_max IS NOT NULL)
+        FROM jobs
+    """).fetchone()
+    return (int(low), int(high)) if known else None
+
+
+def kpis(db_path=DB_PATH, where="", params=()) -> dict:
+    """Posting count and mean salary of the filtered postings (one aggregate scan)."""
+    conn = reader(db_path)
+    total, avg_min, avg_max = conn.execute(f"""
+        SELECT COUNT(*), AVG(salary_min), AVG(salary_max) FROM jobs {where}
+    """, list(params)).fetchone()
+    averages = [a for a in (avg_min, avg_max) if a is not None]
+    return {"total": total, "avg_salary": sum(averages) / len(averages) if averages else None}
+
+
+def top_counts(column, db_path=DB_PATH, where="", params=(), limit=10) -> pd.Series:
+    """Postings per value of `column` among the filtered rows, most common first."""
+    conn = reader(db_path)
+    if column not in _columns(conn):
+        return pd.Series(dtype="int64")
+    # Text values group case-insensitively, as the filters match them
+    rows = conn.execute(f"""
+        SELECT MIN({column}), COUNT(*) AS n FROM jobs
+        {where + " AND" if where else "WHERE"} {column} IS NOT NULL
+        GROUP BY {column} COLLATE NOCASE ORDER BY n DESC, {column} COLLATE NOCASE LIMIT ?
+    """, [*params, limit]).fetchall()
+    return pd.Series([r[1] for r in rows], index=[r[0] for r in rows], dtype="int64")
+
+
+def top_skills(db_path=DB_PATH, limit=10) -> pd.Series:
+    """Postings per skill from the job_skills table the skills stage writes."""
+    conn = reader(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT s.name, t.n FROM (
+                SELECT skill_id, COUNT(*) AS n FROM job_skills GROUP BY skill_id ORDER BY n DESC LIMIT ?
+            ) t JOIN skills s ON s.id = t.skill_id
+            ORDER BY t.n DESC, s.name
+        """, (limit,)).fetchall()
+    except sqlite3.OperationalError:  # skills stage has not run yet
+        rows = []
+    return pd.Series([r[1] for r in rows], index=[r[0] for r in rows], dtype="int64")
+
+
+def descriptions(db_path=DB_PATH, batch_size=1000):
+    """Posting descriptions in batches, for tagging skills when job_skills is still empty."""
+    cursor = reader(db_path).execute("SELECT description FROM jobs WHERE description IS NOT NULL")
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        yield [r[0] for r in batch]
+
+
+def page(db_path=DB_PATH, where="", params=(), number=1, size=50) -> pd.DataFrame:
+    """One page of the filtered postings, newest first, without descriptions."""
+    conn = reader(db_path)
+    select = [c for c in PAGE_COLUMNS if c in _columns(conn)]
+    rows = conn.execute(f"""
+        SELECT {", ".join(select)} FROM jobs {where}
+        ORDER BY IFNULL(created, '') DESC, id DESC
+        LIMIT ? OFFSET ?
+    """, [*params, size, (max(1, number) - 1) * size]).fetchall()
+    return pd.DataFrame([tuple(r) for r in rows], columns=select)
+
+
+def rows(db_path=DB_PATH, ids=()) -> pd.DataFrame:
+    """PAGE_COLUMNS of the postings with these IDs, in the order given."""
+    conn = reader(db_path)
+    select = [c for c in PAGE_COLUMNS if c in _columns(conn)]
+    ids = [int(i) for i in ids]
+    found = conn.execute(f"""
+        SELECT {", ".join(select)} FROM jobs WHERE id IN ({", ".join("?" for _ in ids)})
+    """, ids).fetchall() if ids else []
+    position = {i: n for n, i in enumerate(ids)}
+    df = pd.DataFrame([tuple(r) for r in found], columns=select)
+    return df.sort_values("id", key=lambda s: s.map(position)).reset_index(drop=True)
@@ -0,0 +1,122 @@
+# src/db.py
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from src.config import DB_PATH
+
+# Connection tuning (env overrides). WAL lets the dashboard and API read while
+# the ETL writes; a writer or checkpoint holding the lock is waited out for up
+# to BUSY_TIMEOUT_MS instead of failing with "database is locked".
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", "64"))
+MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+# Truncate the WAL file back to this size after checkpoints
+WAL_LIMIT_MB = int(os.getenv("SQLITE_WAL_LIMIT_MB", "64"))
+
+# Connections the pooled SQLAlchemy engine keeps open
+POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "5"))
+
+
+def configure(conn, readonly=False):
+    """Apply the shared pragmas to a DB-API sqlite3 connection."""
+    cur = conn.cursor()
+    cur.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    if not readonly:
+        # Persistent on the file; a no-op once the database is in WAL mode
+        cur.execute("PRAGMA journal_mode = WAL")
+        cur.execute(f"PRAGMA journal_size_limit = {WAL_LIMIT_MB * 1024 * 1024}")
+    cur.execute(f"PRAGMA synchronous = {SYNCHRONOUS}")
+    cur.execute(f"PRAGMA cache_size = -{CACHE_MB * 1024}")
+    cur.execute(f"PRAGMA mmap_size = {MMAP_MB * 1024 * 1024}")
+    cur.execute("PRAGMA temp_store = MEMORY")
+    # Enforces the keys declared in src/schema.py (and their ON DELETE CASCADE)
+    cur.execute("PRAGMA foreign_keys = ON")
+    cur.close()
+    return conn
+
+
+def connect(db_path=DB_PATH, readonly=False, check_same_thread=True) -> sqlite3.Connection:
+    """A sqlite3 connection to the jobs database with WAL and the shared pragmas."""
+    if readonly:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000,
+                               check_same_thread=check_same_thread)
+    else:
+        conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=check_same_thread)
+    return configure(conn, readonly)
+
+
+@contextmanager
+def connection(db_path=DB_PATH, readonly=False):
+    """connect() as a context manager that always closes the connection."""
+    conn = connect(db_path, readonly)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+_readers = threading.local()
+
+
+def reader(db_path=DB_PATH) -> sqlite3.Connection:
+    """
+    Read-only connection reused by the calling thread (API workers, dashboard).
+
+    Rows come back as sqlite3.Row. The connection is reopened if the database
+    file was replaced; do not close it.
+    """
+    cache = getattr(_readers, "conns", None)
+    if cache is None:
+        cache = _readers.conns = {}
+    inode = os.stat(db_path).st_ino if os.path.exists(db_path) else None
+    entry = cache.get(db_path)
+    if entry is None or entry[0] != inode:
+        if entry is not None:
+            entry[1].close()
+        conn = connect(db_path, readonly=True)
+        conn.row_factory = sqlite3.Row
+        entry = cache[db_path] = (inode, conn)
+    return entry[1]
+
+
+@lru_cache(maxsize=None)
+def get_engine(db_path=DB_PATH):
+    """Process-wide pooled SQLAlchemy engine; every pooled connection gets the shared pragmas."""
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.pool import QueuePool
+
+    engine = create_engine(
+        f"sqlite:///{db_path}", future=True, poolclass=QueuePool, pool_size=POOL_SIZE,
+        connect_args={"timeout": BUSY_TIMEOUT_MS / 1000, "check_same_thread": False},
+    )
+    event.listen(engine, "connect", lambda dbapi_conn, _: configure(dbapi_conn))
+    return engine
+
+
+def stamp(db_path=DB_PATH):
+    """Changes whenever committed data changes: WAL commits touch the -wal file, not the database."""
+    def file_stamp(path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+    return file_stamp(db_path), file_stamp(db_path + "-wal")
+
+
+def bump_version(conn, name):
+    """Count a change to dataset `name` (e.g. "jobs") for readers that cache it; runs in the caller's transaction."""
+    conn.execute("""
+        INSERT INTO dataset_versions (name, version) VALUES (?, 1)
+        ON CONFLICT(name) DO UPDATE SET version = version + 1
+    """, (name,))
+
+
+def dataset_version(conn, name) -> int:
+    """How many times dataset `name` has changed (0 if never)."""
+    row = conn.execute("SELECT version FROM dataset_versions WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
@@ -1,24 +1,15 @@
 # src/db_init.py
-import sqlite3
+from src.db import connect
+from src.schema import SCHEMA_VERSION, migrate
 
 def init_db():
-    conn = sqlite3.connect("jobs.db")
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS jobs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT,
-            company TEXT,
-            location TEXT,
-            description TEXT,
-            date_posted TEXT
-        )
-    """)
-
-    conn.commit()
-    conn.close()
-    print("✅ Database initialized with 'jobs' table")
+    conn = connect()
+    try:
+        # Tables, keys and indexes are defined once, by the migrations in src/schema.py
+        migrate(conn)
+    finally:
+        conn.close()
+    print(f"✅ Database initialized (schema v{SCHEMA_VERSION})")
 
 if __name__ == "__main__":
     init_db()
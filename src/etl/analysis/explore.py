@@ -1,16 +1,16 @@
-import sqlite3
 import pandas as pd
+from src.db import connect
 
 # Connect to your jobs.db
-conn = sqlite3.connect("data/jobs.db")
+conn = connect()
 
 # Top 10 skills
 skills = pd.read_sql("""
-    SELECT skill, COUNT(*) AS demand
-    FROM job_skills
-    GROUP BY skill
-    ORDER BY demand DESC
-    LIMIT 10
+    SELECT s.name AS skill, top.demand
+    FROM (SELECT skill_id, COUNT(*) AS demand FROM job_skills
+          GROUP BY skill_id ORDER BY demand DESC LIMIT 10) top
+    JOIN skills s ON s.id = top.skill_id
+    ORDER BY top.demand DESC
 """, conn)
 
 print("\n🔥 Top 10 Skills in Demand:")
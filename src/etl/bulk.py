@@ -0,0 +1,69 @@
+# src/etl/bulk.py
+import os
+import sqlite3
+from itertools import islice
+
+import pandas as pd
+
+# Rows per executemany call / transaction (override with ETL_BATCH_SIZE)
+BATCH_SIZE = int(os.getenv("ETL_BATCH_SIZE", "5000"))
+
+
+def chunked(rows, size):
+    """Yield lists of at most `size` items from any iterable."""
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _column_values(s: pd.Series) -> list:
+    """Convert one column to DB-API friendly Python values (NaN/NaT -> None)."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        values = s.astype(str).tolist()
+    else:
+        values = s.tolist()
+    mask = s.isna()
+    if mask.any():
+        values = [None if m else v for v, m in zip(values, mask.tolist())]
+    return values
+
+
+def frame_rows(df: pd.DataFrame, columns) -> list:
+    """Row tuples for `columns` of df, converted a column at a time instead of via iterrows."""
+    if df.empty:
+        return []
+    return list(zip(*(_column_values(df[c]) for c in columns)))
+
+
+def bulk_write(target, sql, rows, batch_size=None, commit=True) -> int:
+    """
+    Run `sql` (qmark placeholders) once per row using chunked executemany.
+
+    `target` is a sqlite3 connection or a SQLAlchemy engine. Each batch runs in its
+    own transaction, so a large load never holds one giant write lock. Returns the
+    number of rows written.
+
+    With commit=False the batches join the caller's transaction instead, for
+    loads that must be all-or-nothing: `target` is then a sqlite3 connection the
+    caller commits (e.g. inside `with conn:`) or a SQLAlchemy connection from
+    engine.begin().
+    """
+    batch_size = batch_size or BATCH_SIZE
+    total = 0
+    for batch in chunked(rows, batch_size):
+        if isinstance(target, sqlite3.Connection):
+            if commit:
+                with target:
+                    target.executemany(sql, batch)
+            else:
+                target.executemany(sql, batch)
+        elif commit:
+            with target.begin() as conn:
+                conn.exec_driver_sql(sql, batch)
+        else:
+            target.exec_driver_sql(sql, batch)
+        total += len(batch)
+    return total
@@ -0,0 +1,227 @@
+# src/etl/dedup.py
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+from src.etl import storage
+from src.etl.utils import _missing, job_key, normalize_title
+from src.nlp.matcher import tokenize
+
+# MinHash signature length, split into LSH bands of NUM_PERM // BANDS rows.
+# 16 bands of 8 make postings with ~70%+ overlap collide in at least one band.
+NUM_PERM = 128
+BANDS = 16
+
+# Candidates count as duplicates when their estimated description Jaccard and
+# their title token overlap reach these levels
+SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.7"))
+TITLE_SIMILARITY = 0.5
+
+# Words per description shingle
+SHINGLE_SIZE = 3
+
+# Fixed hash parameters, so signatures are comparable across runs
+_rng = np.random.default_rng(20240521)
+_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+
+DEDUP_COLS = ["canonical_id", "matched_roles", "duplicates"]
+
+
+def shingles(text, k=SHINGLE_SIZE) -> np.ndarray:
+    """CRC32 hashes of the distinct k-word shingles of a description."""
+    tokens = tokenize(text)
+    if len(tokens) < k:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64)
+
+
+def minhash(hashes: np.ndarray) -> np.ndarray:
+    """NUM_PERM-wide MinHash signature of a set of shingle hashes (multiply-shift permutations)."""
+    if hashes.size == 0:
+        return None
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _A[None, :] + _B[None, :]) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def _title_tokens(title) -> frozenset:
+    return frozenset(normalize_title("" if _missing(title) else str(title)).split())
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _key_text(c) -> str:
+    return "" if _missing(c) else " ".join(str(c).lower().split())
+
+
+class Clusterer:
+    """
+    Clusters near-duplicate postings fed in batches; labels are row positions.
+
+    Candidates come from LSH buckets of description MinHash signatures, blocked by
+    company: every row is hashed into BANDS buckets and compared only with the first
+    row already in each bucket, so the work grows linearly with the number of rows.
+    Rows without a description fall back to an exact title/company/location key.
+
+    Descriptions are only needed while a batch is added; what is kept per row is
+    its signature (NUM_PERM uint32s), title tokens and BANDS bucket entries.
+    """
+
+    def __init__(self):
+        self.parent = []
+        self.titles = []
+        self.sigs = []
+        self.buckets = {}
+
+    def _find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _union(self, i, j):
+        ri, rj = self._find(i), self._find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+    def add(self, df: pd.DataFrame):
+        rows = NUM_PERM // BANDS
+        for company, title, location, description in zip(df["company"], df["title"], df["location"], df["description"]):
+            j = len(self.parent)
+            self.parent.append(j)
+            company = _key_text(company)
+            tokens = _title_tokens(title)
+            sig = minhash(shingles(description))
+            self.titles.append(tokens)
+            self.sigs.append(sig)
+            if sig is None:
+                key = ("exact", company, tokens, _key_text(location))
+                first = self.buckets.setdefault(key, j)
+                if first != j:
+                    self._union(first, j)
+                continue
+            for band in range(BANDS):
+                # Hashed to an int: a false collision only costs one similarity check
+                key = hash((company, band, sig[band * rows:(band + 1) * rows].tobytes()))
+                first = self.buckets.setdefault(key, j)
+                if first == j or self.sigs[first] is None or self._find(first) == self._find(j):
+                    continue
+                if (np.mean(self.sigs[first] == sig) >= SIMILARITY
+                        and _jaccard(self.titles[first], tokens) >= TITLE_SIMILARITY):
+                    self._union(first, j)
+
+    def labels(self) -> np.ndarray:
+        return np.array([self._find(i) for i in range(len(self.parent))], dtype=np.int64)
+
+
+def cluster(df: pd.DataFrame) -> np.ndarray:
+    """Cluster label (a row position) per row of df; see Clusterer."""
+    clusterer = Clusterer()
+    clusterer.add(df)
+    return clusterer.labels()
+
+
+def canonical_rows(labels, created, roles) -> pd.DataFrame:
+    """
+    The kept row of each cluster, in row order, with its folded-in metadata.
+
+    The earliest-created posting of a cluster is canonical; it gets the sorted
+    search roles that matched any copy (`matched_roles`, comma-separated) and how
+    many copies were folded in (`duplicates`). Indexed by row position.
+    """
+    order = pd.DataFrame({"label": labels, "created": created, "pos": np.arange(len(labels))})
+    canonical = order.sort_values(["label", "created", "pos"], na_position="last").drop_duplicates("label")
+    matched = (
+        pd.DataFrame({"label": labels, "role": roles})
+        .dropna()
+        .groupby("label")["role"]
+        .agg(lambda r: ", ".join(sorted(set(r))))
+    )
+    sizes = pd.Series(labels).value_counts()
+    return pd.DataFrame({
+        "matched_roles": canonical["label"].map(matched).to_numpy(),
+        "duplicates": (canonical["label"].map(sizes) - 1).to_numpy(),
+    }, index=canonical["pos"].to_numpy()).sort_index()
+
+
+def _with_dedup_cols(rows: pd.DataFrame, kept: pd.DataFrame) -> pd.DataFrame:
+    """Canonical rows (positions in `kept`'s index) with canonical_id/matched_roles/duplicates."""
+    rows = rows.copy()
+    rows["canonical_id"] = [
+        job_key(redirect_url=url, title=t, company=c, location=l, created=cr)
+        for url, t, c, l, cr in zip(rows["redirect_url"], rows["title"], rows["company"], rows["location"], rows["created"])
+    ]
+    rows["matched_roles"] = kept["matched_roles"].to_numpy()
+    rows["duplicates"] = kept["duplicates"].to_numpy()
+    return rows
+
+
+def _roles(df) -> pd.Series:
+    return df["search_role"] if "search_role" in df else pd.Series(None, index=df.index, dtype="object")
+
+
+def dedupe(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per cluster of near-duplicate postings (see canonical_rows), in row order."""
+    if df.empty:
+        return df.assign(**{c: pd.Series(dtype="object") for c in DEDUP_COLS})
+    df = df.reset_index(drop=True)
+    created = pd.to_datetime(df["created"], errors="coerce", utc=True)
+    kept = canonical_rows(cluster(df), created, _roles(df))
+    return _with_dedup_cols(df.iloc[kept.index], kept).reset_index(drop=True)
+
+
+def main(source="jobs", target="jobs_dedup"):
+    """
+    Stream `source` twice: once to cluster it, once to write the canonical rows.
+
+    Memory grows with the number of postings (signatures and LSH buckets, about
+    a few KB a row) but not with description text, which is the bulk of the data.
+    """
+    if not storage.exists(source):
+        print("❌ jobs data not found. Run fetch.py first.")
+        return
+
+    clusterer = Clusterer()
+    created, roles = [], []
+    for frame in storage.iter_frames(source, columns=["company", "title", "location", "description",
+                                                      "created", "search_role"]):
+        clusterer.add(frame)
+        created.append(pd.to_datetime(frame["created"], errors="coerce", utc=True))
+        roles.append(_roles(frame))
+    total = len(clusterer.parent)
+    if total == 0:
+        path = storage.write_frame(dedupe(storage.read_frame(source)), target)
+        print(f"✅ Deduplicated 0 postings into 0 → {path}")
+        return
+    kept = canonical_rows(clusterer.labels(), pd.concat(created, ignore_index=True),
+                          pd.concat(roles, ignore_index=True))
+    del clusterer
+
+    writer, offset = None, 0
+    try:
+        for frame in storage.iter_frames(source):
+            positions = kept.index[(kept.index >= offset) & (kept.index < offset + len(frame))]
+            out = _with_dedup_cols(frame.iloc[positions - offset], kept.loc[positions])
+            offset += len(frame)
+            if writer is None:
+                writer = storage.FrameWriter(target, [*frame.columns, *DEDUP_COLS])
+            writer.write_frame(out)
+    except BaseException:
+        if writer is not None:
+            writer.close(commit=False)
+        raise
+    path = writer.close()[0]
+    print(f"✅ Deduplicated {total} postings into {len(kept)} → {path}")
+
+
+if __name__ == "__main__":
+    main()
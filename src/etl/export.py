@@ -1,71 +1,162 @@
-import os
-import sqlite3
 import pandas as pd
 from src.config import DB_PATH
+from src.db import bump_version, connect
+from src.etl import storage
+from src.etl.bulk import bulk_write, frame_rows
+from src.etl.utils import job_key, content_hash, title_normalized
+from src.schema import CLEAN_COLS, migrate
 
-def main():
+# Columns loaded into the jobs table
+EXPECTED_COLS = [
+    "title",
+    "company",
+    "location",
+    "created",
+    "salary_min",
+    "salary_max",
+    "description",
+    "redirect_url",
+    # Yearly salary bounds in BASE_CURRENCY (src/etl/salary.py)
+    "salary_min_annual",
+    "salary_max_annual",
+    # Near-duplicate cluster of the posting (src/etl/dedup.py); empty without a dedup run
+    "canonical_id",
+    "matched_roles",
+    "duplicates"
+]
+
+
+def keyed_frame(df):
+    """Add job_key/content_hash columns and drop repeated postings (last one wins)."""
+    df = df[[c for c in EXPECTED_COLS if c in df.columns]].copy()
+    for col in EXPECTED_COLS:
+        if col not in df.columns:
+            df[col] = None
+
+    df["job_key"] = [
+        job_key(redirect_url=url, title=t, company=c, location=l, created=cr)
+        for url, t, c, l, cr in zip(df["redirect_url"], df["title"], df["company"], df["location"], df["created"])
+    ]
+    df["content_hash"] = [content_hash(vals) for vals in zip(*(df[c] for c in EXPECTED_COLS))]
+    return df.drop_duplicates("job_key", keep="last")
+
+
+def sync_clean(conn, df):
+    """
+    Upsert the jobs_clean rows of the postings in `df` (by job_key).
+
+    Values come from the just-written jobs rows, so jobs_clean shares their ids;
+    only the normalized title is computed here. Runs in the caller's transaction.
+    """
+    updates = ", ".join(f"{c} = excluded.{c}" for c in CLEAN_COLS if c != "id")
+    rows = zip(df["title"].map(title_normalized).tolist(), df["job_key"].tolist())
+    bulk_write(conn, f"""
+        INSERT INTO jobs_clean ({", ".join(CLEAN_COLS)})
+        SELECT id, title, ?, company, location, substr(created, 1, 10), salary_min, salary_max, updated_at
+        FROM jobs WHERE job_key = ?
+        ON CONFLICT(id) DO UPDATE SET {updates}
+    """, rows, commit=False)
+
+
+def load_incremental(conn, df):
+    """
+    Upsert new or changed postings and return a DataFrame of (job_key, change).
+
+    Unchanged postings are not written at all. A changed posting keeps its row id;
+    `skills` is cleared only if its description changed, so the skills stage only
+    has to revisit postings whose text it has not tagged yet.
+    Nothing is committed; main() commits the whole load at once.
+    """
+    cursor = conn.cursor()
+    existing = pd.DataFrame(
+        cursor.execute("SELECT job_key, content_hash, substr(created, 1, 10) FROM jobs").fetchall(),
+        columns=["job_key", "old_hash", "prev_posted_at"],
+    )
+
+    df = keyed_frame(df).merge(existing, on="job_key", how="left")
+    old_hash = df["old_hash"]
+    df["change"] = None
+    df.loc[old_hash.isna(), "change"] = "insert"
+    df.loc[old_hash.notna() & (old_hash != df["content_hash"]), "change"] = "update"
+    delta = df[df["change"].notna()]
+
+    delta = delta.assign(updated_at=pd.Timestamp.now(tz="UTC").isoformat())
+    cols = EXPECTED_COLS + ["job_key", "content_hash", "updated_at"]
+    updates = ", ".join(f"{c} = excluded.{c}" for c in EXPECTED_COLS + ["content_hash", "updated_at"])
+
+    updates += ", skills = CASE WHEN jobs.description IS excluded.description THEN jobs.skills END"
+
+    bulk_write(conn, f"""
+        INSERT INTO jobs ({", ".join(cols)})
+        VALUES ({", ".join("?" for _ in cols)})
+        ON CONFLICT(job_key) DO UPDATE SET {updates}
+    """, frame_rows(delta, cols), commit=False)
+
+    # Updates keep the posted date they had, so weekly aggregates can revisit that week
+    bulk_write(
+        conn,
+        "INSERT INTO jobs_changes (job_key, change, loaded_at, prev_posted_at) VALUES (?, ?, ?, ?)",
+        frame_rows(delta, ["job_key", "change", "updated_at", "prev_posted_at"]),
+        commit=False,
+    )
+    sync_clean(conn, delta)
+    return delta[["job_key", "change"]]
+
+
+def load_full(conn, df):
+    """Replace the contents of the jobs table with `df` (uncommitted, like load_incremental)."""
+    cursor = conn.cursor()
+    df = keyed_frame(df).assign(change="insert", updated_at=pd.Timestamp.now(tz="UTC").isoformat())
+    cols = EXPECTED_COLS + ["job_key", "content_hash", "updated_at"]
+
+    # Clear old data (jobs_clean and job_skills rows go with it)
+    cursor.execute("DELETE FROM jobs")
+    bulk_write(conn, f"""
+        INSERT INTO jobs ({", ".join(cols)})
+        VALUES ({", ".join("?" for _ in cols)})
+    """, frame_rows(df, cols), commit=False)
+
+    bulk_write(
+        conn,
+        "INSERT INTO jobs_changes (job_key, change, loaded_at) VALUES (?, ?, ?)",
+        frame_rows(df, ["job_key", "change", "updated_at"]),
+        commit=False,
+    )
+    sync_clean(conn, df)
+    return df[["job_key", "change"]]
+
+
+def main(mode="incremental"):
     # Load processed data
-    processed_path = os.path.join("data", "processed", "jobs_clean.csv")
-    if not os.path.exists(processed_path):
+    if not storage.exists("processed/jobs_clean"):
         print("❌ Processed file not found. Run process.py first.")
         return
 
-    df = pd.read_csv(processed_path)
-
-    # Keep only expected columns
-    expected_cols = [
-        "title",
-        "company",
-        "location",
-        "created",
-        "salary_min",
-        "salary_max",
-        "description",
-        "redirect_url"
-    ]
-    df = df[[c for c in expected_cols if c in df.columns]]
+    df = storage.read_frame("processed/jobs_clean", columns=EXPECTED_COLS)
 
     # Connect to SQLite
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    conn = connect(DB_PATH)
+    # jobs, jobs_clean and the jobs_fts search index (src/schema.py)
+    migrate(conn)
 
-    # Create table (with id column)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS jobs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT,
-        company TEXT,
-        location TEXT,
-        created TEXT,
-        salary_min REAL,
-        salary_max REAL,
-        description TEXT,
-        redirect_url TEXT
-    );
-    """)
-
-    # Clear old data
-    cursor.execute("DELETE FROM jobs")
+    # One transaction: readers never see a half-loaded jobs table, and a failed
+    # load rolls back to the previous contents
+    try:
+        with conn:
+            if mode == "full":
+                changes = load_full(conn, df)
+            else:
+                changes = load_incremental(conn, df)
+            if len(changes):
+                bump_version(conn, "jobs")
+    finally:
+        conn.close()
 
-    # Insert new data
-    for _, row in df.iterrows():
-        cursor.execute("""
-        INSERT INTO jobs (title, company, location, created, salary_min, salary_max, description, redirect_url)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            row.get("title"),
-            row.get("company"),
-            row.get("location"),
-            row.get("created"),
-            row.get("salary_min"),
-            row.get("salary_max"),
-            row.get("description"),
-            row.get("redirect_url")
-        ))
-
-    conn.commit()
-    conn.close()
-    print("✅ Data exported to jobs.db (table: jobs)")
+    inserted = int((changes["change"] == "insert").sum())
+    updated = int((changes["change"] == "update").sum())
+    print(f"✅ Data exported to jobs.db (table: jobs) — {inserted} new, {updated} changed")
+    return changes
 
 if __name__ == "__main__":
-    main()
+    import sys
+    main(sys.argv[1] if len(sys.argv) > 1 else "incremental")
@@ -0,0 +1,163 @@
+# src/etl/fetcher.py
+import math
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+
+# Statuses worth retrying: rate limited or a transient server failure
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+def parse_job(job, role, country):
+    """Flatten one Adzuna result into a jobs.csv row."""
+    return {
+        "title": job.get("title"),
+        "company": (job.get("company") or {}).get("display_name"),
+        "location": (job.get("location") or {}).get("display_name"),
+        "created": job.get("created"),
+        "salary_min": job.get("salary_min"),
+        "salary_max": job.get("salary_max"),
+        "description": job.get("description"),
+        "redirect_url": job.get("redirect_url"),
+        "search_role": role,       # keep track of which role we searched
+        "search_country": country  # keep track of which country we searched
+    }
+
+
+class AdzunaFetcher:
+    """
+    Fetches every page of every (role, country) search over one pooled session.
+
+    Page 1 of each search is requested first; its `count` tells us how many more
+    pages there are, and those are queued straight away. At most `concurrency`
+    requests are in flight and the token bucket caps the overall request rate.
+    """
+
+    def __init__(self, app_id, app_key, base_url=BASE_URL, results_per_page=50,
+                 max_pages=None, concurrency=8, rate=5.0, burst=None,
+                 max_retries=5, backoff=0.5, timeout=30, session=None):
+        self.app_id = app_id
+        self.app_key = app_key
+        self.base_url = base_url.rstrip("/")
+        self.results_per_page = results_per_page
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def _retry_delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    def get_page(self, role, country, page):
+        """Return the decoded JSON for one search page, or None if it could not be fetched."""
+        url = f"{self.base_url}/{country}/search/{page}"
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.app_key,
+            "results_per_page": self.results_per_page,
+            "what": role,
+            "content-type": "application/json"
+        }
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code == 200:
+                    return response.json()
+                retry, error = response.status_code in RETRY_STATUSES, response.status_code
+            except (requests.RequestException, ValueError) as e:
+                # Dropped connections, truncated bodies and bad JSON are retried like a 5xx
+                retry, error = True, e
+            if not retry or attempt == self.max_retries:
+                print(f"❌ Error fetching jobs for {role} in {country} (page {page}): {error}")
+                return None
+            time.sleep(self._retry_delay(attempt, response))
+
+        return None
+
+    def _page_count(self, data):
+        count = data.get("count") or 0
+        pages = math.ceil(count / self.results_per_page) if self.results_per_page else 1
+        if self.max_pages:
+            pages = min(pages, self.max_pages)
+        return pages
+
+    def run(self, searches, on_rows):
+        """
+        Fetch all pages for each (role, country) in `searches`.
+
+        `on_rows(rows)` is called from the calling thread as each page arrives, so
+        the caller can write results out without holding them all in memory.
+        Returns the number of rows delivered.
+        """
+        total = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = {}
+            for role, country in searches:
+                print(f"🚀 Fetching jobs for role: '{role}' in {country.upper()} ...")
+                fut = pool.submit(self.get_page, role, country, 1)
+                pending[fut] = (role, country, 1)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    role, country, page = pending.pop(fut)
+                    data = fut.result()
+                    if not data:
+                        continue
+
+                    if page == 1:
+                        for next_page in range(2, self._page_count(data) + 1):
+                            nxt = pool.submit(self.get_page, role, country, next_page)
+                            pending[nxt] = (role, country, next_page)
+
+                    rows = [parse_job(job, role, country) for job in data.get("results", [])]
+                    if rows:
+                        on_rows(rows)
+                        total += len(rows)
+        return total
@@ -0,0 +1,186 @@
+# src/etl/locations.py
+import csv
+import hashlib
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from src.config import DB_PATH, LOCATIONS_PATH
+from src.db import connect
+from src.etl.bulk import bulk_write, frame_rows
+from src.schema import migrate
+
+ID_COLS = ["city_id", "state_id", "country_id"]
+
+# Trailing words that do not change which place is meant ("Pune District", "Bangalore Rural")
+SUFFIXES = {"urban", "rural", "district", "city", "area", "region", "metropolitan", "metro"}
+
+
+def _norm(text) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+class Gazetteer:
+    """
+    Canonical countries, states and cities with integer IDs, plus an index from
+    every normalized name and spelling variant to its ID.
+
+    IDs follow the row order of taxonomy/locations.csv within each kind. Resolved
+    raw strings are memoized, so each distinct location is looked up once.
+    """
+
+    def __init__(self, rows):
+        self.countries, self.states, self.cities = [], [], []
+        self.index = {"country": {}, "state": {}, "city": {}}
+        self.state_country, self.city_parents = {}, {}
+        self._memo = {}
+
+        country_ids, state_ids = {}, {}
+        for row in rows:
+            kind, name = row["kind"].strip(), row["name"].strip()
+            if kind == "country":
+                self.countries.append(name)
+                ref = country_ids[name] = len(self.countries)
+            elif kind == "state":
+                self.states.append(name)
+                ref = state_ids[name] = len(self.states)
+                self.state_country[ref] = country_ids[row["country"].strip()]
+            elif kind == "city":
+                self.cities.append(name)
+                ref = len(self.cities)
+                self.city_parents[ref] = (state_ids[row["state"].strip()], country_ids[row["country"].strip()])
+            else:
+                continue
+            for term in [name, *(row.get("aliases") or "").split("|")]:
+                if _norm(term):
+                    self.index[kind].setdefault(_norm(term), ref)
+
+        # Identifies the gazetteer, so stored resolutions can be tied to it
+        self.version = hashlib.sha1(repr(rows).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_csv(cls, path=LOCATIONS_PATH):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return cls(list(csv.DictReader(f)))
+
+    def _lookup(self, kind, part):
+        index = self.index[kind]
+        words = part.split()
+        while words:
+            ref = index.get(" ".join(words))
+            if ref is not None:
+                return ref
+            if words[-1] not in SUFFIXES:
+                return None
+            words = words[:-1]
+        return None
+
+    def resolve(self, raw) -> tuple:
+        """(city_id, state_id, country_id) for a raw location string; None where unknown."""
+        if raw in self._memo:
+            return self._memo[raw]
+
+        city = state = country = None
+        # Parts run from most to least specific: "Pune, Maharashtra, India"
+        for part in filter(None, (_norm(p) for p in str(raw).split(","))):
+            if city is None and (ref := self._lookup("city", part)) is not None:
+                city = ref
+            elif state is None and (ref := self._lookup("state", part)) is not None:
+                state = ref
+            elif country is None and (ref := self._lookup("country", part)) is not None:
+                country = ref
+
+        if city is not None:
+            city_state, city_country = self.city_parents[city]
+            # "London, Ontario" is not the London in the gazetteer
+            if state not in (None, city_state) or country not in (None, city_country):
+                city = None
+            else:
+                state, country = city_state, city_country
+        if state is not None:
+            state_country = self.state_country[state]
+            if country not in (None, state_country):
+                state = None
+            else:
+                country = state_country
+
+        self._memo[raw] = result = (city, state, country)
+        return result
+
+    def resolve_many(self, locations: pd.Series) -> pd.DataFrame:
+        """Integer-coded ID_COLS aligned to `locations`, resolving each distinct value once."""
+        codes, uniques = pd.factorize(locations)
+        resolved = np.array([self.resolve(u) for u in uniques] + [(None, None, None)], dtype=float)
+        ids = resolved[codes]  # code -1 (missing) picks the trailing all-NaN row
+        return pd.DataFrame(ids, columns=ID_COLS, index=locations.index).astype("Int64")
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer() -> Gazetteer:
+    """Gazetteer compiled once per process from taxonomy/locations.csv."""
+    return Gazetteer.from_csv()
+
+
+def write_dimensions(conn, gaz):
+    """Replace the geo_* lookup tables with the gazetteer's current IDs and names."""
+    with conn:
+        conn.execute("DELETE FROM geo_countries")
+        conn.execute("DELETE FROM geo_states")
+        conn.execute("DELETE FROM geo_cities")
+        conn.executemany("INSERT INTO geo_countries (id, name) VALUES (?, ?)", enumerate(gaz.countries, 1))
+        conn.executemany("INSERT INTO geo_states (id, name, country_id) VALUES (?, ?, ?)",
+                         [(i, n, gaz.state_country[i]) for i, n in enumerate(gaz.states, 1)])
+        conn.executemany("INSERT INTO geo_cities (id, name, state_id, country_id) VALUES (?, ?, ?, ?)",
+                         [(i, n, *gaz.city_parents[i]) for i, n in enumerate(gaz.cities, 1)])
+
+
+def main():
+    """Resolve new distinct jobs.location strings and write city/state/country IDs onto jobs."""
+    conn = connect(DB_PATH)
+    try:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'").fetchone() is None:
+            print("⚠️ jobs table not found. Run export.py first.")
+            return
+        gaz = get_gazetteer()
+        migrate(conn)
+        write_dimensions(conn, gaz)
+
+        # Resolutions are kept across runs until the gazetteer changes
+        conn.execute("DELETE FROM location_map WHERE gazetteer_version IS NOT ?", (gaz.version,))
+        conn.commit()
+        known = {r for (r,) in conn.execute("SELECT raw FROM location_map").fetchall()}
+        distinct = pd.Series([r for (r,) in conn.execute(
+            "SELECT DISTINCT location FROM jobs WHERE location IS NOT NULL"
+        ).fetchall()], dtype="object")
+
+        new = distinct[~distinct.isin(known)].reset_index(drop=True)
+        ids = gaz.resolve_many(new)
+        bulk_write(conn, """
+            INSERT OR REPLACE INTO location_map (raw, city_id, state_id, country_id, gazetteer_version)
+            VALUES (?, ?, ?, ?, ?)
+        """, frame_rows(ids.assign(raw=new, gazetteer_version=gaz.version), ["raw", *ID_COLS, "gazetteer_version"]))
+
+        # One indexed update per distinct string, touching only rows whose codes differ
+        mapping = conn.execute("SELECT raw, city_id, state_id, country_id FROM location_map").fetchall()
+        in_jobs = set(distinct)
+        before = conn.total_changes
+        bulk_write(conn, """
+            UPDATE jobs SET city_id = ?, state_id = ?, country_id = ?
+            WHERE location = ? COLLATE NOCASE
+              AND (city_id IS NOT ? OR state_id IS NOT ? OR country_id IS NOT ?)
+        """, [(c, s, k, raw, c, s, k) for raw, c, s, k in mapping if raw in in_jobs])
+        updated = conn.total_changes - before
+    finally:
+        conn.close()
+
+    resolved = int(ids["country_id"].notna().sum())
+    print(f"✅ Locations: resolved {len(new)} new of {len(distinct)} distinct strings "
+          f"({resolved} matched the gazetteer); {updated} job rows updated")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,112 @@
 import os
-import pandas as pd
-import sqlite3
-from src.config import DB_PATH
-
-def main():
-    # Input & output paths
-    raw_path = os.path.join("data", "jobs.csv")
-    processed_dir = os.path.join("data", "processed")
-    processed_path = os.path.join(processed_dir, "jobs_clean.csv")
-
-    # Ensure processed folder exists
-    os.makedirs(processed_dir, exist_ok=True)
-
-    # Check if raw jobs.csv exists
-    if not os.path.exists(raw_path):
-        print("❌ jobs.csv not found. Run fetch.py first.")
-        return
+from src.etl import storage
+from src.etl.salary import ANNUAL_COLS, annual_salaries, posting_currency
+from src.nlp.matcher import get_matcher
+
+EXPECTED_COLS = [
+    "title", "company", "location", "created",
+    "salary_min", "salary_max", "description", "redirect_url",
+    "canonical_id", "matched_roles", "duplicates"
+]
+# Also read from the raw artifact: search_country picks the salary currency
+READ_COLS = EXPECTED_COLS + ["search_country"]
+SKILL_COLS = ["title", "company", "location", "skills", "skill"]
+
+# Streaming mode: rows per chunk, or a memory budget the chunk size is derived from
+CHUNK_ROWS = int(os.getenv("PROCESS_CHUNK_ROWS", "0")) or None
+MAX_MEMORY_MB = int(os.getenv("PROCESS_MAX_MEMORY_MB", "0")) or None
+
+# Deduplicated postings from dedup.py, used instead of the raw fetch when up to date
+DEDUP_SOURCE = "jobs_dedup"
 
-    # Load raw data
-    df = pd.read_csv(raw_path)
+# Working set per chunk relative to its raw size (skills, exploded skills frame, SQL buffers)
+MEMORY_OVERHEAD = 4
 
-    # Select expected columns if they exist
-    expected_cols = [
-        "title", "company", "location", "created",
-        "salary_min", "salary_max", "description", "redirect_url"
-    ]
-    df = df[[c for c in expected_cols if c in df.columns]]
 
-    # Save cleaned data
-    df.to_csv(processed_path, index=False)
+def clean_chunk(df, matcher):
+    """Clean one frame of raw jobs, tag its skills and salaries; returns (jobs_clean, job_skills)."""
+    currency = posting_currency(df)
+    df = df[[c for c in EXPECTED_COLS if c in df.columns]].copy()
 
-    # Extract skills
     def extract_skills(text):
-        if pd.isna(text):
-            return ""
-        text_lower = str(text).lower()
-        skills = []
-        for skill in ["python", "sql", "excel", "power bi", "tableau", "aws", "azure", "machine learning"]:
-            if skill in text_lower:
-                skills.append(skill)
-        return ", ".join(skills)
+        return ", ".join(matcher.extract(text))
 
     df["skills"] = df["description"].apply(extract_skills)
+    df[ANNUAL_COLS] = annual_salaries(df, currency)
 
-    # Save job skills
-    skills_path = os.path.join(processed_dir, "job_skills.csv")
     skills_df = (
         df[["title", "company", "location", "skills"]]
         .assign(skill=lambda x: x["skills"].str.split(", "))
         .explode("skill")
         .dropna()
     )
-    skills_df.to_csv(skills_path, index=False)
+    return df, skills_df
+
+
+def source_name() -> str:
+    """The deduplicated artifact if it is at least as new as the raw fetch, else the raw fetch."""
+    if storage.exists(DEDUP_SOURCE) and storage.mtime(DEDUP_SOURCE) >= storage.mtime("jobs"):
+        return DEDUP_SOURCE
+    return "jobs"
+
+
+def chunk_rows_for(max_memory_mb, sample_rows=1000, source="jobs"):
+    """Estimate how many raw rows fit in `max_memory_mb` from a sample of the file."""
+    sample = next(storage.iter_frames(source, columns=READ_COLS, batch_rows=sample_rows), None)
+    if sample is None or sample.empty:
+        return sample_rows
+    row_bytes = sample.memory_usage(deep=True).sum() / len(sample)
+    return max(1, int(max_memory_mb * 1024 * 1024 / (row_bytes * MEMORY_OVERHEAD)))
 
-    # Store in SQLite (optional but useful)
-    conn = sqlite3.connect(DB_PATH)
-    df.to_sql("jobs_clean", conn, if_exists="replace", index=False)
-    skills_df.to_sql("job_skills", conn, if_exists="replace", index=False)
-    conn.close()
 
-    print(f"✅ Processed jobs saved → {processed_path} & job_skills.csv")
+def main(chunk_rows=CHUNK_ROWS, max_memory_mb=MAX_MEMORY_MB):
+    # Check if the raw jobs artifact exists
+    if not storage.exists("jobs"):
+        print("❌ jobs data not found. Run fetch.py first.")
+        return
+
+    # Streaming mode reads the raw artifact a chunk at a time; otherwise it is one chunk
+    source = source_name()
+    if max_memory_mb and not chunk_rows:
+        chunk_rows = chunk_rows_for(max_memory_mb, source=source)
+        # Parquet is decoded a row group at a time, so those must fit the budget too
+        group_rows = storage.row_group_rows(source)
+        if group_rows and group_rows > chunk_rows:
+            print(f"⚠️ {source} has row groups of {group_rows} rows, more than the {chunk_rows} that fit "
+                  f"in {max_memory_mb} MB; rewrite it with a smaller ETL_ROW_GROUP_MB to stay within budget")
+    if chunk_rows:
+        frames = storage.iter_frames(source, columns=READ_COLS, batch_rows=chunk_rows)
+    else:
+        frames = [storage.read_frame(source, columns=READ_COLS)]
+
+    matcher = get_matcher()
+    clean_writer = skills_writer = None
+    total = 0
+    try:
+        # The keyed jobs_clean / job_skills tables are filled by export.py and skills.py
+        for raw in frames:
+            df, skills_df = clean_chunk(raw, matcher)
+            if clean_writer is None:
+                clean_writer = storage.FrameWriter("processed/jobs_clean", [c for c in df.columns if c != "skills"])
+                skills_writer = storage.FrameWriter("processed/job_skills", SKILL_COLS)
+
+            # Save cleaned data and job skills
+            clean_writer.write_frame(df)
+            skills_writer.write_frame(skills_df)
+            total += len(df)
+    except BaseException:
+        for writer in (clean_writer, skills_writer):
+            if writer is not None:
+                writer.close(commit=False)
+        raise
+
+    if clean_writer is None:
+        print("⚠️ No jobs to process.")
+        return
+
+    processed_path = clean_writer.close()[0]
+    skills_writer.close()
+    print(f"✅ Processed {total} jobs saved → {processed_path}")
 
 if __name__ == "__main__":
     main()
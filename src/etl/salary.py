@@ -0,0 +1,260 @@
+# src/etl/salary.py
+import csv
+import os
+import re
+from functools import lru_cache
+
+import pandas as pd
+from src.config import BASE_CURRENCY, CURRENCY_RATES_PATH, DB_PATH
+from src.db import connect
+from src.etl.bulk import bulk_write, frame_rows
+from src.schema import migrate
+
+# ---- Pattern pieces -------------------------------------------------------
+_CUR = r"(?P<{name}>us\$|c\$|a\$|₹|\$|£|€|rs\.?(?=\s*\d)|inr|usd|gbp|eur|cad|aud)"
+_NUM = r"(?P<{name}>\d[\d,]*(?:\.\d+)?)"
+_MULT = r"(?P<{name}>lpa|lakhs?|lacs?|crores?|cr|mn|k|m)\b"
+_LAKH = r"(?P<{name}>lpa|lakhs?|lacs?|crores?|cr)\b"
+_SEP = r"\s*(?:-|–|—|to)\s*"
+_PERIOD = (r"(?:\s*(?:/|per|an?|p\.?)\s*(?P<period>year|yr|annum|month|mo|week|wk|day|hour|hr)\b"
+           r"|\s*(?P<pa>p\.a\.|pa)\b)")
+
+
+def _p(template, name, optional=False):
+    piece = template.format(name=name)
+    return f"(?:{piece})?" if optional else piece
+
+
+# Tried in order on the rows still unparsed. Every pattern needs some evidence that
+# the numbers are money (a currency, a lakh/crore unit or a pay period), so "5-10
+# years" or "401k" never parse as salaries.
+_RANGE = _p(_NUM, "lo") + r"\s*" + _p(_MULT, "mult_lo", optional=True) + _SEP
+PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    # ₹8-12 LPA, $80k - $100k/year
+    _p(_CUR, "cur") + r"\s*" + _RANGE + _p(_CUR, "cur_hi", optional=True) + r"\s*" + _p(_NUM, "hi") + r"\s*"
+    + _p(_MULT, "mult_hi", optional=True) + _PERIOD + "?",
+    # 8-12 LPA
+    _RANGE + _p(_NUM, "hi") + r"\s*" + _p(_LAKH, "mult_hi") + _PERIOD + "?",
+    # 40,000 - 50,000 per month
+    _RANGE + _p(_NUM, "hi") + r"\s*" + _p(_MULT, "mult_hi", optional=True) + _PERIOD,
+    # ₹18,00,000 per annum, $80k/year, $25 an hour
+    _p(_CUR, "cur") + r"\s*" + _p(_NUM, "lo") + r"\s*" + _p(_MULT, "mult_lo", optional=True) + _PERIOD + "?",
+    # 12 LPA
+    _p(_NUM, "lo") + r"\s*" + _p(_LAKH, "mult_lo") + _PERIOD + "?",
+    # 90k per year
+    _p(_NUM, "lo") + r"\s*" + _p(_MULT, "mult_lo", optional=True) + _PERIOD,
+)]
+
+MULTIPLIERS = {
+    "k": 1e3, "m": 1e6, "mn": 1e6,
+    "lpa": 1e5, "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+}
+LAKH_UNITS = {"lpa", "lakh", "lakhs", "lac", "lacs", "cr", "crore", "crores"}
+
+CURRENCIES = {
+    "₹": "INR", "rs": "INR", "rs.": "INR", "inr": "INR",
+    "$": "USD", "us$": "USD", "usd": "USD",
+    "£": "GBP", "gbp": "GBP", "€": "EUR", "eur": "EUR",
+    "c$": "CAD", "cad": "CAD", "a$": "AUD", "aud": "AUD",
+}
+
+# Currency assumed for a bare "$" or a missing symbol, by the last part of location_raw
+COUNTRY_CURRENCY = {
+    "india": "INR", "in": "INR",
+    "usa": "USD", "us": "USD", "united states": "USD",
+    "uk": "GBP", "gb": "GBP", "united kingdom": "GBP",
+    "canada": "CAD", "ca": "CAD", "australia": "AUD", "au": "AUD",
+}
+DOLLAR_CURRENCIES = {"USD", "CAD", "AUD"}
+
+PERIODS = {
+    "year": "year", "yr": "year", "annum": "year", "pa": "year", "p.a.": "year",
+    "month": "month", "mo": "month", "week": "week", "wk": "week",
+    "day": "day", "hour": "hour", "hr": "hour",
+}
+PER_YEAR = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+
+SALARY_COLS = ["salary_min", "salary_max", "salary_currency", "salary_period",
+               "salary_min_annual", "salary_max_annual"]
+# The comparable bounds carried into jobs by process.py and export.py
+ANNUAL_COLS = ["salary_min_annual", "salary_max_annual"]
+
+# Matches below this yearly amount (in USD) are not salaries: "covid 19 - 2020 per
+# year", "work 9-5 pa". Amounts in an unknown currency are checked as BASE_CURRENCY.
+MIN_ANNUAL_USD = float(os.getenv("SALARY_MIN_ANNUAL_USD", "1000"))
+YEAR_RE = r"(?:19|20)\d\d"
+
+
+@lru_cache(maxsize=None)
+def load_rates(path=CURRENCY_RATES_PATH, base=BASE_CURRENCY) -> dict:
+    """{currency: units of `base` per unit} from the local rate table."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        to_usd = {row["currency"].upper(): float(row["rate_to_usd"]) for row in csv.DictReader(f)}
+    return {cur: rate / to_usd[base] for cur, rate in to_usd.items()}
+
+
+def _number(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s.str.replace(",", "", regex=False), errors="coerce")
+
+
+def _col(m: pd.DataFrame, name) -> pd.Series:
+    if name in m.columns:
+        return m[name].astype("object").str.lower()
+    return pd.Series(None, index=m.index, dtype="object")
+
+
+def location_currency(location: pd.Series) -> pd.Series:
+    """Default currency per row from the country at the end of a location string."""
+    country = location.astype("object").fillna("").astype(str).str.rsplit(",", n=1).str[-1]
+    return country.str.strip().str.lower().map(COUNTRY_CURRENCY)
+
+
+def posting_currency(df: pd.DataFrame) -> pd.Series:
+    """Default currency per posting: from the fetch's search country, else the end of its location."""
+    if "location" in df:
+        currency = location_currency(df["location"])
+    else:
+        currency = pd.Series(None, index=df.index, dtype="object")
+    if "search_country" in df:
+        currency = df["search_country"].astype("object").str.lower().map(COUNTRY_CURRENCY).fillna(currency)
+    return currency
+
+
+def _resolve(found: pd.DataFrame, default: pd.Series) -> pd.DataFrame:
+    """SALARY_COLS from the raw pieces of matched salaries (numbers, units, currency, period)."""
+    lo = _number(found["lo"].astype("object").fillna("").astype(str)) * found["mult_lo"].map(MULTIPLIERS).fillna(1)
+    hi = _number(found["hi"].astype("object").fillna("").astype(str)) * found["mult_hi"].map(MULTIPLIERS).fillna(1)
+
+    lakh = found["mult_lo"].isin(LAKH_UNITS) | found["mult_hi"].isin(LAKH_UNITS)
+    currency = found["cur"].map(CURRENCIES)
+    dollar_default = (found["cur"] == "$") & default.isin(DOLLAR_CURRENCIES)
+    currency = currency.mask(dollar_default, default)
+    currency = currency.mask(lakh & currency.isna(), "INR").fillna(default.where(lo.notna()))
+
+    period = found["period"].map(PERIODS)
+    period = period.mask(found["mult_lo"].eq("lpa") | found["mult_hi"].eq("lpa"), "year")
+    period = period.fillna("year").where(lo.notna())
+
+    per_year = period.map(PER_YEAR)
+    rate = currency.map(load_rates())
+    return pd.DataFrame({
+        "salary_min": lo,
+        "salary_max": hi,
+        "salary_currency": currency,
+        "salary_period": period,
+        "salary_min_annual": lo * per_year * rate,
+        "salary_max_annual": hi.fillna(lo) * per_year * rate,
+    }, index=found.index)
+
+
+def _plausible(parsed: pd.DataFrame, found: pd.DataFrame) -> pd.Series:
+    """
+    Rows holding a real salary: a non-inverted range, no bare year-like number
+    ("2020" without a currency or unit) and a yearly minimum of MIN_ANNUAL_USD.
+    """
+    rates = load_rates()
+    bare = found["cur"].isna() & found["mult_lo"].isna()
+    yearlike = bare & (found["lo"].str.fullmatch(YEAR_RE) | found["hi"].astype("object").fillna("").str.fullmatch(YEAR_RE))
+    annual = parsed["salary_min"] * parsed["salary_period"].map(PER_YEAR) * parsed["salary_currency"].map(rates).fillna(1.0)
+    return (parsed["salary_min"].notna() & ~(parsed["salary_max"] < parsed["salary_min"]) & ~yearlike
+            & (annual >= MIN_ANNUAL_USD * rates["USD"]))
+
+
+def parse_salaries(text: pd.Series, default_currency=None) -> pd.DataFrame:
+    """
+    Parse salaries out of a whole column of free text at once.
+
+    Returns SALARY_COLS aligned to `text`: min/max in the posting's own currency
+    and period, plus both bounds converted to a yearly amount in BASE_CURRENCY.
+    `default_currency` (a scalar or a Series aligned to `text`) is used for a bare
+    "$" or when no currency is given; lakh/crore amounts are always INR. Inverted
+    ranges and amounts below MIN_ANNUAL_USD a year are rejected, leaving the row
+    to the later patterns.
+    """
+    text = text.astype("object").where(text.notna(), "").astype(str)
+    if isinstance(default_currency, pd.Series):
+        default = default_currency.reindex(text.index).astype("object")
+    else:
+        default = pd.Series(default_currency, index=text.index, dtype="object")
+
+    out = pd.DataFrame(index=text.index, columns=SALARY_COLS, dtype="float64")
+    out[["salary_currency", "salary_period"]] = out[["salary_currency", "salary_period"]].astype("object")
+    pending = pd.Series(True, index=text.index)
+    for pattern in PATTERNS:
+        if not pending.any():
+            break
+        m = text[pending].str.extract(pattern)
+        hit = m["lo"].notna()
+        if not hit.any():
+            continue
+        m = m[hit]
+        found = pd.DataFrame({
+            "lo": m["lo"],
+            "hi": m["hi"] if "hi" in m.columns else None,
+            "mult_lo": _col(m, "mult_lo").fillna(_col(m, "mult_hi")),
+            "mult_hi": _col(m, "mult_hi").fillna(_col(m, "mult_lo")),
+            "cur": _col(m, "cur").fillna(_col(m, "cur_hi")),
+            "period": _col(m, "period").fillna(_col(m, "pa")),
+        }, index=m.index).astype("object")
+        parsed = _resolve(found, default.loc[m.index])
+        parsed = parsed[_plausible(parsed, found)]
+        out.loc[parsed.index] = parsed
+        pending.loc[parsed.index] = False
+    return out
+
+
+def annual_salaries(df: pd.DataFrame, default_currency: pd.Series) -> pd.DataFrame:
+    """
+    ANNUAL_COLS (yearly, in BASE_CURRENCY) for a frame of postings.
+
+    A salary parsed from the description wins; otherwise the structured
+    salary_min/salary_max, which Adzuna gives per year, are converted from
+    `default_currency`.
+    """
+    out = parse_salaries(df["description"], default_currency)[ANNUAL_COLS]
+    rate = default_currency.reindex(df.index).map(load_rates())
+    for col, source in zip(ANNUAL_COLS, ["salary_min", "salary_max"]):
+        if source in df:
+            out[col] = out[col].fillna(pd.to_numeric(df[source], errors="coerce") * rate)
+    out["salary_max_annual"] = out["salary_max_annual"].fillna(out["salary_min_annual"])
+    return out
+
+
+def main(reparse=False, chunk_rows=100_000):
+    """Parse salaries for jobs_raw rows that have not been parsed yet (all rows with reparse=True)."""
+    conn = connect(DB_PATH)
+    try:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_raw'").fetchone() is None:
+            print("⚠️ jobs_raw not found. Run ingest.py first.")
+            return
+        migrate(conn)
+
+        unparsed = "" if reparse else " AND salary_parsed_at IS NULL"
+        parsed_at = pd.Timestamp.now(tz="UTC").isoformat()
+        total = found = 0
+        last_id = 0
+        # Paged by id rather than one open SELECT, since each page updates the rows it read
+        while True:
+            chunk = pd.read_sql(f"""
+                SELECT id, location_raw, description FROM jobs_raw
+                WHERE id > ?{unparsed} ORDER BY id LIMIT ?
+            """, conn, params=(last_id, chunk_rows))
+            if chunk.empty:
+                break
+            last_id = int(chunk["id"].iloc[-1])
+            parsed = parse_salaries(chunk["description"], location_currency(chunk["location_raw"]))
+            parsed = parsed.assign(id=chunk["id"], salary_parsed_at=parsed_at)
+            bulk_write(conn, f"""
+                UPDATE jobs_raw SET {", ".join(f"{c} = ?" for c in SALARY_COLS)}, salary_parsed_at = ?
+                WHERE id = ?
+            """, frame_rows(parsed, SALARY_COLS + ["salary_parsed_at", "id"]))
+            total += len(chunk)
+            found += int(parsed["salary_min"].notna().sum())
+    finally:
+        conn.close()
+    print(f"✅ Salaries parsed: {found} of {total} postings")
+
+
+if __name__ == "__main__":
+    main()
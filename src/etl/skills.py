@@ -1,45 +1,62 @@
-import sqlite3
+import csv
 import pandas as pd
-import spacy
-from src.config import DB_PATH
-
-def extract_skills_from_text(text, skill_list):
-    found = []
-    for skill in skill_list:
-        if skill.lower() in text.lower():
-            found.append(skill)
-    return list(set(found))
-
-def main():
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql("SELECT rowid, * FROM jobs", conn)  # include rowid
-
-    cur = conn.cursor()
-    cur.execute("PRAGMA table_info(jobs)")
-    columns = [col[1] for col in cur.fetchall()]
-    if "skills" not in columns:
-        cur.execute("ALTER TABLE jobs ADD COLUMN skills TEXT")
-        conn.commit()
-
-    nlp = spacy.load("en_core_web_sm")
-
-    skill_list = [
-        "Python", "SQL", "Excel", "Machine Learning", "Deep Learning", "AI",
-        "TensorFlow", "PyTorch", "NLP", "Data Analysis", "Statistics",
-        "Tableau", "Power BI", "AWS", "Azure", "GCP", "Java", "C++",
-        "R", "Hadoop", "Spark", "Scala", "Docker", "Kubernetes"
-    ]
-
-    for idx, row in df.iterrows():
-        desc = str(row.get("description", ""))
-        if desc.strip():
-            skills = extract_skills_from_text(desc, skill_list)
-            skills_str = ",".join(skills)
-            cur.execute("UPDATE jobs SET skills = ? WHERE rowid = ?", (skills_str, row["rowid"]))
-
-    conn.commit()
+from src.config import DB_PATH, TAXONOMY_PATH
+from src.db import bump_version, connect
+from src.etl.bulk import bulk_write
+from src.nlp.matcher import get_matcher
+from src.schema import migrate
+
+def extract_skills_from_text(text, matcher=None):
+    return (matcher or get_matcher()).extract(text)
+
+def sync_skills(conn, path=TAXONOMY_PATH) -> dict:
+    """Upsert the taxonomy into the skills table and return {name: id}; existing IDs never change."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = [((r.get("name") or "").strip().lower(), (r.get("category") or "").strip() or None)
+                for r in csv.DictReader(f)]
+    with conn:
+        conn.executemany("""
+            INSERT INTO skills (name, category) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET category = excluded.category
+        """, [r for r in rows if r[0]])
+    return dict(conn.execute("SELECT name, id FROM skills").fetchall())
+
+def main(only_missing=True):
+    conn = connect(DB_PATH)
+    migrate(conn)
+    skill_ids = sync_skills(conn)
+
+    # Only postings the load stage added or changed have NULL skills
+    where = " WHERE skills IS NULL" if only_missing else ""
+    df = pd.read_sql(f"SELECT id, description FROM jobs{where}", conn)
+
+    matcher = get_matcher()
+
+    found = [extract_skills_from_text(desc, matcher) for desc in df["description"]]
+    job_ids = df["id"].tolist()
+    tagged_at = pd.Timestamp.now(tz="UTC").isoformat()
+
+    # One transaction, so a failed run never leaves job_skills cleared or half-filled
+    with conn:
+        count = bulk_write(conn, "UPDATE jobs SET skills = ? WHERE id = ?",
+                           zip((",".join(f) for f in found), job_ids), commit=False)
+
+        # Replace the tagged postings' rows in the job_skills junction
+        if only_missing:
+            bulk_write(conn, "DELETE FROM job_skills WHERE job_id = ?", ((i,) for i in job_ids), commit=False)
+        else:
+            conn.execute("DELETE FROM job_skills")
+        pairs = bulk_write(conn, "INSERT OR IGNORE INTO job_skills (job_id, skill_id) VALUES (?, ?)",
+                           ((job_id, skill_ids[name]) for job_id, names in zip(job_ids, found) for name in names),
+                           commit=False)
+        # Lets build_weekly's watermark pick up re-tagged postings
+        bulk_write(conn, "UPDATE jobs_clean SET updated_at = ? WHERE id = ?",
+                   ((tagged_at, i) for i in job_ids), commit=False)
+        if job_ids:
+            bump_version(conn, "jobs")
+
     conn.close()
-    print("✅ Skills extracted and saved into jobs.db")
+    print(f"✅ Skills extracted for {count} jobs ({pairs} job/skill pairs) and saved into jobs.db")
 
 if __name__ == "__main__":
     main()
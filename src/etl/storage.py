@@ -0,0 +1,249 @@
+# src/etl/storage.py
+import csv
+import json
+import os
+
+import pandas as pd
+from src.config import DATA_DIR, ETL_FORMAT, ETL_EXPORT_CSV
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # parquet is optional; fall back to CSV
+    pa = pq = None
+
+# Column types for the job artifacts; anything not listed is stored as text
+FLOAT_COLS = {"salary_min", "salary_max"}
+
+# Parquet row groups hold at most this many rows and about ROW_GROUP_MB of data
+# in memory: a reader decodes a whole row group at a time, whatever batch it asks for
+ROW_GROUP_SIZE = 50_000
+ROW_GROUP_MB = float(os.getenv("ETL_ROW_GROUP_MB", "16"))
+
+FORMATS = ("parquet", "csv")
+
+
+def storage_format() -> str:
+    if ETL_FORMAT not in FORMATS:
+        raise ValueError(f"Unknown ETL_FORMAT {ETL_FORMAT!r}; expected one of {', '.join(FORMATS)}")
+    if ETL_FORMAT == "parquet" and pq is None:
+        return "csv"
+    return ETL_FORMAT
+
+
+def artifact_path(name, fmt=None) -> str:
+    """Path of an artifact, e.g. "jobs" -> data/jobs.parquet, "processed/jobs_clean" -> data/processed/jobs_clean.csv."""
+    return os.path.join(DATA_DIR, f"{name}.{fmt or storage_format()}")
+
+
+def _arrow_schema(columns):
+    return pa.schema([(c, pa.float64() if c in FLOAT_COLS else pa.string()) for c in columns])
+
+
+def _typed(df):
+    """Coerce a frame to the artifact column types so every writer agrees."""
+    df = df.copy()
+    for col in df.columns:
+        if col in FLOAT_COLS:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        else:
+            df[col] = df[col].astype("string")
+    return df
+
+
+def write_frame(df, name, export_csv=ETL_EXPORT_CSV) -> str:
+    """Write `df` as artifact `name` in the configured format (plus a CSV copy if asked)."""
+    fmt = storage_format()
+    path = artifact_path(name, fmt)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt == "parquet":
+        table = pa.Table.from_pandas(_typed(df), schema=_arrow_schema(df.columns), preserve_index=False)
+        row_bytes = df.memory_usage(deep=True, index=False).sum() / max(len(df), 1)
+        pq.write_table(table, path, compression="zstd", row_group_size=_group_rows(row_bytes))
+    if fmt == "csv" or export_csv:
+        df.to_csv(artifact_path(name, "csv"), index=False)
+    return path
+
+
+def _read_order():
+    """Formats to look for when reading: the configured one first."""
+    return [storage_format()] + [f for f in FORMATS if f != storage_format()]
+
+
+def _find(name):
+    for fmt in _read_order():
+        path = artifact_path(name, fmt)
+        if os.path.exists(path) and (fmt == "csv" or pq is not None):
+            return fmt, path
+    raise FileNotFoundError(f"No artifact found for '{name}' in {DATA_DIR}")
+
+
+def exists(name) -> bool:
+    try:
+        _find(name)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def mtime(name) -> float:
+    """Modification time of artifact `name` (in whichever format is found)."""
+    return os.path.getmtime(_find(name)[1])
+
+
+def count_rows(name) -> int:
+    """Row count of artifact `name`; parquet answers from its footer without reading data."""
+    fmt, path = _find(name)
+    if fmt == "parquet":
+        return pq.ParquetFile(path).metadata.num_rows
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+
+def read_frame(name, columns=None) -> pd.DataFrame:
+    """
+    Read artifact `name`, preferring the configured format.
+
+    With `columns`, only those columns are read (ones the artifact lacks are skipped),
+    so e.g. a stage that never looks at descriptions never parses them.
+    """
+    fmt, path = _find(name)
+    if fmt == "parquet":
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            columns = [c for c in columns if c in available]
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    if columns is not None:
+        wanted = set(columns)
+        return pd.read_csv(path, usecols=lambda c: c in wanted)
+    return pd.read_csv(path)
+
+
+def _group_rows(row_bytes) -> int:
+    """Rows per parquet row group for rows of about `row_bytes` bytes each."""
+    return max(1, min(ROW_GROUP_SIZE, int(ROW_GROUP_MB * 1024 * 1024 / max(row_bytes, 1))))
+
+
+def row_group_rows(name):
+    """Rows in the largest parquet row group of artifact `name` (None for CSV, which streams by line)."""
+    fmt, path = _find(name)
+    if fmt != "parquet":
+        return None
+    meta = pq.ParquetFile(path).metadata
+    return max((meta.row_group(i).num_rows for i in range(meta.num_row_groups)), default=0)
+
+
+def iter_frames(name, columns=None, batch_rows=ROW_GROUP_SIZE):
+    """Yield artifact `name` as DataFrames of about `batch_rows` rows without loading it whole."""
+    fmt, path = _find(name)
+    if fmt == "parquet":
+        pf = pq.ParquetFile(path)
+        if columns is not None:
+            columns = [c for c in columns if c in set(pf.schema_arrow.names)]
+        for batch in pf.iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    wanted = set(columns) if columns is not None else None
+    usecols = (lambda c: c in wanted) if wanted is not None else None
+    yield from pd.read_csv(path, usecols=usecols, chunksize=batch_rows)
+
+
+class FrameWriter:
+    """
+    Streams rows (dicts) into an artifact as they arrive.
+
+    Parquet rows are buffered into row groups; CSV rows go straight to disk. When
+    CSV export is on, a CSV and a JSON array copy are streamed alongside. Files are
+    written under a temporary name and only swapped in by close(commit=True).
+    """
+
+    def __init__(self, name, columns, export_csv=ETL_EXPORT_CSV, json_copy=False):
+        self.columns = list(columns)
+        self.fmt = storage_format()
+        self.rows = 0
+        self.buffer = []
+        self.files = []  # (tmp path, final path)
+        self.parquet = None
+        self.buffer_bytes = 0
+        self.csv_writer = None
+        self.json_f = None
+
+        if self.fmt == "parquet":
+            path = artifact_path(name, "parquet")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.schema = _arrow_schema(self.columns)
+            self.parquet = pq.ParquetWriter(path + ".part", self.schema, compression="zstd")
+            self.files.append((path + ".part", path))
+
+        if self.fmt == "csv" or export_csv:
+            path = artifact_path(name, "csv")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.csv_f = open(path + ".part", "w", encoding="utf-8", newline="")
+            self.csv_writer = csv.DictWriter(self.csv_f, fieldnames=self.columns)
+            self.csv_writer.writeheader()
+            self.files.append((path + ".part", path))
+
+            if json_copy:
+                path = os.path.join(DATA_DIR, f"{name}.json")
+                self.json_f = open(path + ".part", "w", encoding="utf-8")
+                self.json_f.write("[")
+                self.files.append((path + ".part", path))
+
+    def write_rows(self, rows):
+        if self.csv_writer is not None:
+            self.csv_writer.writerows(rows)
+        if self.json_f is not None:
+            for row in rows:
+                self.json_f.write(("\n" if self.rows == 0 else ",\n") + json.dumps(row, ensure_ascii=False))
+                self.rows += 1
+        else:
+            self.rows += len(rows)
+        if self.parquet is not None:
+            self.buffer.extend(rows)
+            self.buffer_bytes += sum(len(str(v)) for row in rows for v in row.values() if v is not None)
+            if len(self.buffer) >= ROW_GROUP_SIZE or self.buffer_bytes >= ROW_GROUP_MB * 1024 * 1024:
+                self._flush()
+
+    def write_frame(self, df):
+        """Append a DataFrame chunk (columns in any order; missing ones are left empty)."""
+        df = df.reindex(columns=self.columns)
+        if self.parquet is not None:
+            self._flush()
+            table = pa.Table.from_pandas(_typed(df), schema=self.schema, preserve_index=False)
+            row_bytes = df.memory_usage(deep=True, index=False).sum() / max(len(df), 1)
+            self.parquet.write_table(table, row_group_size=_group_rows(row_bytes))
+        if self.csv_writer is not None:
+            df.to_csv(self.csv_f, header=False, index=False)
+        if self.json_f is not None:
+            for row in df.astype(object).where(df.notna(), None).to_dict(orient="records"):
+                self.json_f.write(("\n" if self.rows == 0 else ",\n") + json.dumps(row, ensure_ascii=False))
+                self.rows += 1
+        else:
+            self.rows += len(df)
+
+    def _flush(self):
+        if self.buffer:
+            table = pa.Table.from_pylist(
+                [{c: r.get(c) for c in self.columns} for r in self.buffer], schema=self.schema
+            )
+            self.parquet.write_table(table, row_group_size=_group_rows(self.buffer_bytes / len(self.buffer)))
+            self.buffer = []
+            self.buffer_bytes = 0
+
+    def close(self, commit=True):
+        if self.parquet is not None:
+            self._flush()
+            self.parquet.close()
+        if self.csv_writer is not None:
+            self.csv_f.close()
+        if self.json_f is not None:
+            self.json_f.write("\n]\n")
+            self.json_f.close()
+        for tmp, final in self.files:
+            if commit:
+                os.replace(tmp, final)
+            else:
+                os.remove(tmp)
+        return [final for _, final in self.files]
@@ -1,5 +1,6 @@
 # src/etl/utils.py
 
+import hashlib
 import re
 
 def normalize_title(t: str) -> str:
@@ -10,6 +11,11 @@ def normalize_title(t: str) -> str:
     return t
 
 
+def title_normalized(t):
+    """normalize_title() for values that may be missing (None stays None)."""
+    return None if _missing(t) else normalize_title(str(t))
+
+
 def split_location(loc):
     if not loc: return None, None, None
     parts = [p.strip() for p in re.split(r",|\\|", loc) if p.strip()]
@@ -41,3 +47,32 @@ def parse_salary(text):
         if unit == "m": val *= 1000000
         return val, None, cur, "year" if "year" in per or "annum" in per else "month"
     return None, None, None, None
+
+def _missing(v) -> bool:
+    """True for None, NaN and pandas' NA."""
+    try:
+        return v is None or bool(v != v)
+    except TypeError:
+        return True
+
+
+def _sha1(s: str) -> str:
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+
+def job_key(redirect_url=None, external_id=None, source=None, title=None, company=None, location=None, created=None) -> str:
+    """Stable identity for a posting: its URL, else source + external id, else its headline fields."""
+    def present(v):
+        return not _missing(v) and str(v).strip() != ""
+
+    if present(redirect_url):
+        return _sha1(f"url:{str(redirect_url).strip()}")
+    if present(external_id):
+        return _sha1(f"ext:{source or ''}:{str(external_id).strip()}")
+    parts = [str(v) if present(v) else "" for v in (title, company, location, created)]
+    return _sha1("row:" + "|".join(parts))
+
+
+def content_hash(values) -> str:
+    """Hash of a posting's content columns, used to spot changed rows."""
+    return _sha1("\x1f".join("" if _missing(v) else str(v) for v in values))
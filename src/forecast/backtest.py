@@ -0,0 +1,93 @@
+# src/forecast/backtest.py
+import time
+
+import numpy as np
+import pandas as pd
+from src.config import DB_PATH
+from src.db import connect
+from src.forecast.fast import FREQS, anchor, forecast_many
+from src.forecast.train import BACKENDS, MIN_POINTS, fit_prophet, skill_series
+
+
+def regularize(series, freq="W"):
+    """Put a (ds, y) series on a gap-free grid; missing periods are zero demand."""
+    ds = anchor(series["ds"], freq)
+    grid = pd.date_range(ds.min(), ds.max(), freq=FREQS[freq])
+    y = series.assign(ds=ds).groupby("ds")["y"].sum().reindex(grid, fill_value=0)
+    return pd.DataFrame({"ds": grid, "y": y.to_numpy(dtype=float)})
+
+
+def _errors(actual, predicted):
+    mae = np.mean(np.abs(actual - predicted))
+    denom = np.abs(actual) + np.abs(predicted)
+    smape = np.mean(np.where(denom == 0, 0.0, 2 * np.abs(actual - predicted) / np.where(denom == 0, 1, denom)))
+    return mae, smape
+
+
+def backtest(series_by_key: dict, horizon=4, freq="W", backends=BACKENDS, limit=None):
+    """
+    Hold out the last `horizon` periods of every series, forecast them with each
+    backend, and compare accuracy (MAE, sMAPE) and runtime on identical data.
+
+    Returns (summary per backend, per-series errors).
+    """
+    prepared = {}
+    for key, series in series_by_key.items():
+        series = regularize(series, freq)
+        if len(series) >= MIN_POINTS + horizon:
+            prepared[key] = series
+        if limit and len(prepared) >= limit:
+            break
+
+    train = {k: s.iloc[:-horizon].reset_index(drop=True) for k, s in prepared.items()}
+    holdout = {k: s.iloc[-horizon:] for k, s in prepared.items()}
+
+    rows, summary = [], []
+    for backend in backends:
+        start = time.perf_counter()
+        if backend == "fast":
+            forecasts = forecast_many(train, horizon, freq)
+        else:
+            forecasts = {k: fit_prophet(s, horizon, freq) for k, s in train.items()}
+        seconds = time.perf_counter() - start
+
+        for key, forecast in forecasts.items():
+            # Matched on date, so every backend is scored on the weeks actually held out
+            predicted = forecast.set_index(pd.to_datetime(forecast["ds"]))["yhat"].reindex(holdout[key]["ds"])
+            mae, smape = _errors(holdout[key]["y"].to_numpy(), predicted.to_numpy())
+            rows.append({"backend": backend, "series": key, "mae": mae, "smape": smape})
+        summary.append({"backend": backend, "series": len(forecasts), "seconds": seconds,
+                        "seconds_per_series": seconds / max(len(forecasts), 1)})
+
+    per_series = pd.DataFrame(rows, columns=["backend", "series", "mae", "smape"])
+    accuracy = per_series.groupby("backend")[["mae", "smape"]].mean().reset_index()
+    summary = pd.DataFrame(summary).merge(accuracy, on="backend", how="left")
+    return summary, per_series
+
+
+def main(horizon=4, limit=None, backends=BACKENDS, out=None):
+    conn = connect(DB_PATH)
+    try:
+        series_by_skill = skill_series(conn)
+    finally:
+        conn.close()
+    if not series_by_skill:
+        print("⚠️ No weekly_skill_demand to backtest. Run build_weekly first.")
+        return None
+
+    summary, per_series = backtest(series_by_skill, horizon, "W", backends, limit)
+    print(summary.to_string(index=False))
+    if out:
+        per_series.to_csv(out, index=False)
+        print(f"✅ Per-series errors saved → {out}")
+    return summary
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Backtest forecasting backends on weekly skill demand")
+    parser.add_argument("--horizon", type=int, default=4, help="weeks held out per series")
+    parser.add_argument("--limit", type=int, default=None, help="max series to test")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--out", default=None, help="CSV file for per-series errors")
+    args = parser.parse_args()
+    main(args.horizon, args.limit, args.backends, args.out)
@@ -1,38 +1,330 @@
+import hashlib
+import json
 import os
 import pandas as pd
-import sqlite3
-from prophet import Prophet
-import matplotlib.pyplot as plt
-from src.config import DB_PATH
-
-def main():
-    # Load jobs data from SQLite
-    conn = sqlite3.connect(DB_PATH)
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.config import DATA_DIR, DB_PATH
+from src.db import connect
+from src.etl.bulk import bulk_write, frame_rows
+from src.forecast.fast import FREQS, fit_fast, forecast_many
+from src.schema import migrate
+
+# Bump when the fitting code changes, so stored forecasts get refit
+MODEL_VERSION = "3"
+
+# Overall postings: daily counts, 30 days ahead; skills: weekly demand, 26 weeks ahead
+POSTINGS_HORIZON = 30
+SKILL_HORIZON = 26
+
+# Series shorter than this are not worth fitting
+MIN_POINTS = 6
+
+# Forecasting backend: "prophet", or "fast" (NumPy damped Holt over all series at once)
+BACKEND = os.getenv("FORECAST_BACKEND", "prophet")
+BACKENDS = ("prophet", "fast")
+
+# Seconds a single per-skill fit may run before it is abandoned
+TASK_TIMEOUT = int(os.getenv("FORECAST_TASK_TIMEOUT", "300"))
+
+FORECAST_COLS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+
+# Also fit one model per (skill, country), over postings the locations stage resolved to a country
+PER_COUNTRY = os.getenv("FORECAST_PER_COUNTRY", "0").lower() in ("1", "true", "yes")
+
+# Where each kind of skill series is stored, and the columns that key it
+SKILL_TABLES = {False: ("skill_forecasts", ["skill_id"]),
+                True: ("skill_country_forecasts", ["skill_id", "country_id"])}
+
+
+def fingerprint(series, model, periods, freq) -> str:
+    """Hash of everything a fit depends on: the input series, model, code version and horizon."""
+    data = series[["ds", "y"]].to_csv(index=False).encode("utf-8")
+    meta = json.dumps({"model": model, "version": MODEL_VERSION, "periods": periods, "freq": freq})
+    return hashlib.sha1(meta.encode("utf-8") + b"\0" + data).hexdigest()
+
+
+def fit_prophet(series, periods, freq="D"):
+    """Fit Prophet on (ds, y) and return ds/yhat/yhat_lower/yhat_upper for history + horizon."""
+    from prophet import Prophet
+
+    model = Prophet()
+    model.fit(series)
+    future = model.make_future_dataframe(periods=periods, freq=FREQS.get(freq, freq))
+    return model.predict(future)[FORECAST_COLS]
+
+
+def fit_series(series, periods, freq, backend=BACKEND):
+    """Fit one series with the chosen backend."""
+    if backend == "fast":
+        return fit_fast(series, periods, freq)
+    return fit_prophet(series, periods, freq)
+
+
+def stored_fingerprints(conn) -> dict:
+    return dict(conn.execute("SELECT target, fingerprint FROM forecast_runs").fetchall())
+
+
+def record_run(conn, target, model, fp, fitted_at, points):
+    conn.execute("""
+        INSERT OR REPLACE INTO forecast_runs (target, model, fingerprint, fitted_at, points)
+        VALUES (?, ?, ?, ?, ?)
+    """, (target, model, fp, fitted_at, points))
+    conn.commit()
+
+
+def postings_series(conn):
+    """Daily posting counts from the jobs table as a (ds, y) frame."""
     df = pd.read_sql("SELECT created FROM jobs", conn)
-    conn.close()
 
     # Convert dates (remove timezone if present)
-    df["created"] = pd.to_datetime(df["created"]).dt.tz_localize(None)
+    created = pd.to_datetime(df["created"], errors="coerce", utc=True).dt.tz_localize(None)
 
     # Count postings per day
-    daily_counts = df.groupby("created").size().reset_index(name="y")
-    daily_counts.rename(columns={"created": "ds"}, inplace=True)
+    daily = created.dt.normalize().value_counts().sort_index()
+    return pd.DataFrame({"ds": daily.index, "y": daily.values})
 
-    # Train Prophet model
-    model = Prophet()
-    model.fit(daily_counts)
 
-    # Forecast next 30 days
-    future = model.make_future_dataframe(periods=30)
-    forecast = model.predict(future)
+def skill_series(conn) -> dict:
+    """{skill_id: (ds, y) frame} of weekly demand from weekly_skill_demand."""
+    df = pd.read_sql("SELECT skill_id, week_start, demand FROM weekly_skill_demand ORDER BY skill_id, week_start", conn)
+    df["ds"] = pd.to_datetime(df["week_start"])
+    return {int(sid): g[["ds"]].assign(y=g["demand"].values).reset_index(drop=True)
+            for sid, g in df.groupby("skill_id")}
+
+
+def skill_country_series(conn) -> dict:
+    """{(skill_id, country_id): (ds, y) frame} of weekly postings per skill in each resolved country."""
+    from src.aggregate.build_weekly import week_start
+
+    df = pd.read_sql("""
+        SELECT js.skill_id, j.country_id, c.posted_at
+        FROM job_skills js JOIN jobs j ON j.id = js.job_id JOIN jobs_clean c ON c.id = js.job_id
+        WHERE j.country_id IS NOT NULL
+    """, conn)
+    df = df.assign(ds=week_start(df["posted_at"])).dropna(subset=["ds"])
+    counts = df.groupby(["skill_id", "country_id", "ds"]).size().rename("y").reset_index()
+    return {(int(sid), int(cid)): g[["ds", "y"]].reset_index(drop=True)
+            for (sid, cid), g in counts.groupby(["skill_id", "country_id"])}
+
+
+def _target(key) -> str:
+    """forecast_runs name of a skill series: skill:<id>, or skill:<id>:country:<id> per country."""
+    if isinstance(key, tuple):
+        return f"skill:{key[0]}:country:{key[1]}"
+    return f"skill:{key}"
+
 
-    # Plot results
-    fig = model.plot(forecast)
+def _key_values(key) -> tuple:
+    return key if isinstance(key, tuple) else (key,)
+
+
+def forecast_postings(conn, force=False, backend=BACKEND) -> bool:
+    """Fit the overall postings forecast if its inputs changed; returns True if it was refit."""
+    series = postings_series(conn)
+    if len(series) < MIN_POINTS:
+        print("⚠️ Not enough data for the postings forecast.")
+        return False
+
+    fp = fingerprint(series, backend, POSTINGS_HORIZON, "D")
+    if not force and stored_fingerprints(conn).get("postings") == fp:
+        print("✅ Postings forecast is up to date")
+        return False
+
+    forecast = fit_series(series, POSTINGS_HORIZON, "D", backend)
+    fitted_at = pd.Timestamp.now(tz="UTC").isoformat()
+    forecast = forecast.assign(
+        ds=forecast["ds"].dt.strftime("%Y-%m-%d"), model=backend, fingerprint=fp, fitted_at=fitted_at
+    )
+
+    with conn:
+        conn.execute("DELETE FROM postings_forecast")
+        bulk_write(conn, """
+            INSERT INTO postings_forecast (ds, yhat, yhat_lower, yhat_upper, model, fingerprint, fitted_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, frame_rows(forecast, FORECAST_COLS + ["model", "fingerprint", "fitted_at"]), commit=False)
+    record_run(conn, "postings", backend, fp, fitted_at, len(series))
+    print(f"✅ Postings forecast fitted on {len(series)} days ({backend})")
+    return True
+
+
+def _fit_task(target, series, fp, periods, freq, timeout):
+    """
+    Fit one series inside a worker process; returns (target, forecast or None, error).
+
+    The timeout is enforced in the worker with SIGALRM where available, so a stuck
+    fit frees its worker instead of holding up the whole pool.
+    """
+    import signal
+    import threading
+
+    use_alarm = (timeout and hasattr(signal, "SIGALRM")
+                 and threading.current_thread() is threading.main_thread())
+    if use_alarm:
+        def on_alarm(signum, frame):
+            raise TimeoutError(f"fit exceeded {timeout}s")
+        signal.signal(signal.SIGALRM, on_alarm)
+        signal.alarm(int(timeout))
+    try:
+        return target, fit_prophet(series, periods, freq), None
+    except Exception as e:
+        return target, None, f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+
+def write_skill_forecasts(conn, results, fitted_at, backend=BACKEND, per_country=False):
+    """Replace the stored forecasts for every fitted skill (or skill and country) in one transaction."""
+    table, keys = SKILL_TABLES[per_country]
+    frames = [
+        forecast.assign(**dict(zip(keys, _key_values(key))), week_start=forecast["ds"].dt.strftime("%Y-%m-%d"),
+                        model=backend, fingerprint=fp, fitted_at=fitted_at)
+        for key, forecast, fp in results
+    ]
+    cols = keys + ["week_start", "yhat", "yhat_lower", "yhat_upper", "model", "fingerprint", "fitted_at"]
+    with conn:
+        bulk_write(conn, f"DELETE FROM {table} WHERE {' AND '.join(f'{k} = ?' for k in keys)}",
+                   [_key_values(key) for key, _, _ in results], commit=False)
+        bulk_write(conn, f"""
+            INSERT INTO {table} ({", ".join(cols)})
+            VALUES ({", ".join("?" for _ in cols)})
+        """, frame_rows(pd.concat(frames, ignore_index=True), cols), commit=False)
+
+
+def drop_stale_forecasts(conn, keep, per_country=False) -> int:
+    """
+    Delete stored forecasts (and their forecast_runs rows) of series not in `keep`.
+
+    Skills that fell below MIN_POINTS or left the data are never refit, so their
+    old forecasts would otherwise be served forever. Returns how many were dropped.
+    """
+    table, keys = SKILL_TABLES[per_country]
+    stored = [tuple(r) if per_country else r[0]
+              for r in conn.execute(f"SELECT DISTINCT {', '.join(keys)} FROM {table}").fetchall()]
+    stale = [k for k in stored if k not in keep]
+    with conn:
+        bulk_write(conn, f"DELETE FROM {table} WHERE {' AND '.join(f'{k} = ?' for k in keys)}",
+                   [_key_values(k) for k in stale], commit=False)
+        bulk_write(conn, "DELETE FROM forecast_runs WHERE target = ?", [(_target(k),) for k in stale],
+                   commit=False)
+    return len(stale)
+
+
+def forecast_skills(conn, force=False, workers=None, timeout=TASK_TIMEOUT, backend=BACKEND,
+                    per_country=False) -> int:
+    """
+    Refit per-skill weekly forecasts whose inputs changed; returns how many were refit.
+
+    Fits are spread over a process pool of `workers` processes (default: all cores;
+    1 fits in-process). The "fast" backend skips the pool and fits every changed
+    series together as one matrix. Series shorter than MIN_POINTS are skipped (and
+    their stored forecasts dropped), and a fit that fails or runs past `timeout`
+    seconds is reported and left for the next run. With `per_country`, each
+    (skill, country) series is fitted into skill_country_forecasts instead.
+    """
+    try:
+        series_by_skill = skill_country_series(conn) if per_country else skill_series(conn)
+    except Exception as e:
+        print(f"⚠️ No skill demand to forecast: {e}")
+        return 0
+
+    stored = stored_fingerprints(conn)
+    tasks, short = [], 0
+    for skill_id, series in series_by_skill.items():
+        if len(series) < MIN_POINTS:
+            short += 1
+            continue
+        fp = fingerprint(series, backend, SKILL_HORIZON, "W")
+        if force or stored.get(_target(skill_id)) != fp:
+            tasks.append((skill_id, series, fp))
+
+    fps = {skill_id: fp for skill_id, _, fp in tasks}
+    results, failed = [], 0
+    workers = workers or os.cpu_count() or 1
+
+    def collect(target, forecast, error):
+        nonlocal failed
+        if error:
+            failed += 1
+            print(f"⚠️ Forecast for skill {target} failed: {error}")
+        else:
+            results.append((target, forecast, fps[target]))
+
+    if backend == "fast":
+        forecasts = forecast_many({skill_id: series for skill_id, series, _ in tasks}, SKILL_HORIZON, "W")
+        for skill_id, forecast in forecasts.items():
+            collect(skill_id, forecast, None)
+    elif workers == 1 or len(tasks) <= 1:
+        for skill_id, series, fp in tasks:
+            collect(*_fit_task(skill_id, series, fp, SKILL_HORIZON, "W", timeout))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = [pool.submit(_fit_task, skill_id, series, fp, SKILL_HORIZON, "W", timeout)
+                       for skill_id, series, fp in tasks]
+            for fut in as_completed(futures):
+                collect(*fut.result())
+
+    if results:
+        fitted_at = pd.Timestamp.now(tz="UTC").isoformat()
+        write_skill_forecasts(conn, results, fitted_at, backend, per_country)
+        points = {skill_id: len(series) for skill_id, series, _ in tasks}
+        bulk_write(conn, """
+            INSERT OR REPLACE INTO forecast_runs (target, model, fingerprint, fitted_at, points)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(_target(sid), backend, fp, fitted_at, points[sid]) for sid, _, fp in results])
+
+    keep = {key for key, series in series_by_skill.items() if len(series) >= MIN_POINTS}
+    dropped = drop_stale_forecasts(conn, keep, per_country)
+
+    label = "skill/country series" if per_country else "skills"
+    print(f"✅ Skill forecasts refit: {len(results)} of {len(series_by_skill)} {label} "
+          f"({backend}; {short} too short, {failed} failed, {dropped} stale dropped)")
+    return len(results)
+
+
+def save_plot(conn, path=os.path.join(DATA_DIR, "forecast.png")):
+    """Render the stored postings forecast to a PNG; returns its path (None if there is no forecast)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fc = pd.read_sql("SELECT ds, yhat, yhat_lower, yhat_upper FROM postings_forecast ORDER BY ds", conn)
+    if fc.empty:
+        return None
+    fc["ds"] = pd.to_datetime(fc["ds"])
+    plt.figure(figsize=(10, 6))
+    plt.plot(fc["ds"], fc["yhat"])
+    plt.fill_between(fc["ds"], fc["yhat_lower"], fc["yhat_upper"], alpha=0.2)
     plt.title("Job Postings Forecast")
-    plt.savefig(os.path.join("data", "forecast.png"))
-    plt.show()
+    plt.savefig(path)
+    plt.close()
+    return path
+
 
-    print("✅ Forecast completed → saved to data/forecast.png")
+def main(force=False, plot=True, workers=None, backend=BACKEND, per_country=PER_COUNTRY):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown forecast backend '{backend}' (choose from {', '.join(BACKENDS)})")
+    conn = connect(DB_PATH)
+    migrate(conn)
+    try:
+        refit = forecast_postings(conn, force, backend)
+        forecast_skills(conn, force, workers=workers, backend=backend)
+        if per_country:
+            forecast_skills(conn, force, workers=workers, backend=backend, per_country=True)
+        if plot and refit:
+            path = save_plot(conn)
+            if path:
+                print(f"✅ Forecast plot saved → {path}")
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Fit and store job postings / skill demand forecasts")
+    parser.add_argument("--force", action="store_true", help="refit even if inputs are unchanged")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND)
+    parser.add_argument("--workers", type=int, default=None, help="processes for per-skill Prophet fits")
+    parser.add_argument("--per-country", action="store_true", default=PER_COUNTRY,
+                        help="also fit one model per skill and country")
+    args = parser.parse_args()
+    main(force=args.force, backend=args.backend, workers=args.workers, per_country=args.per_country)
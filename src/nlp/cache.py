@@ -0,0 +1,88 @@
+# src/nlp/cache.py
+import hashlib
+import threading
+
+from src.config import NLP_CACHE_PATH
+from src.db import connect
+from src.etl.bulk import bulk_write, chunked
+from src.nlp.matcher import get_matcher
+
+# Part of every cache key with the taxonomy version: bump when how texts are
+# tagged changes, so entries tagged the old way are not served
+TAGGER_VERSION = "matcher-1"
+
+
+def description_hash(text) -> str:
+    return hashlib.sha1(str(text).encode("utf-8")).hexdigest()
+
+
+class SkillCache:
+    """
+    Skills per description, persisted in SQLite and keyed by (description hash, taxonomy version).
+
+    The rows for the current taxonomy are loaded into memory on first use; after
+    that only descriptions never seen before are tagged, in batches, and written
+    back. Tagging is the matcher's own extract(), as in the ETL skills stage.
+    Editing the taxonomy changes its version, which starts a fresh cache.
+    """
+
+    def __init__(self, path=NLP_CACHE_PATH, matcher=None, batch_size=256):
+        self.path = path
+        self.matcher = matcher or get_matcher()
+        self.version = f"{self.matcher.version}:{TAGGER_VERSION}"
+        self.batch_size = batch_size
+        self.memo = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        conn = connect(self.path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS skill_cache (
+                desc_hash TEXT NOT NULL,
+                taxonomy_version TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                PRIMARY KEY (desc_hash, taxonomy_version)
+            )
+        """)
+        return conn
+
+    def _load(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT desc_hash, skills FROM skill_cache WHERE taxonomy_version = ?",
+                (self.version,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {h: (s.split(",") if s else []) for h, s in rows}
+
+    def extract_many(self, texts) -> list:
+        """Skills for each text, in order; only cache misses are processed."""
+        texts = [str(t) for t in texts]
+        hashes = [description_hash(t) for t in texts]
+
+        with self.lock:
+            if self.memo is None:
+                self.memo = self._load()
+
+            misses = {}
+            for h, t in zip(hashes, texts):
+                if h not in self.memo and h not in misses:
+                    misses[h] = t
+
+            if misses:
+                conn = self._connect()
+                try:
+                    for batch in chunked(list(misses.items()), self.batch_size):
+                        tagged = [self.matcher.extract(t) for _, t in batch]
+                        rows = [(h, self.version, ",".join(s)) for (h, _), s in zip(batch, tagged)]
+                        bulk_write(conn, """
+                            INSERT OR REPLACE INTO skill_cache (desc_hash, taxonomy_version, skills)
+                            VALUES (?, ?, ?)
+                        """, rows)
+                        self.memo.update((h, s) for (h, _), s in zip(batch, tagged))
+                finally:
+                    conn.close()
+
+            return [self.memo[h] for h in hashes]
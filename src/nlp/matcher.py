@@ -0,0 +1,99 @@
+# src/nlp/matcher.py
+import csv
+import hashlib
+import json
+import re
+from functools import lru_cache
+from src.config import TAXONOMY_PATH
+
+# Word tokens; a trailing run of + or # is kept so "c++" and "c#" survive
+TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+
+# Marks a trie node where a skill phrase ends
+_END = ""
+
+
+def tokenize(text) -> list:
+    """Lowercase text and split it into matcher tokens."""
+    if text is None or text != text:  # None / NaN
+        return []
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def load_taxonomy(path=TAXONOMY_PATH) -> dict:
+    """Read taxonomy/skills.csv into {skill name: [aliases]}."""
+    skills = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            name = (row.get("name") or "").strip().lower()
+            if not name:
+                continue
+            aliases = [a.strip().lower() for a in (row.get("aliases") or "").split("|") if a.strip()]
+            skills.setdefault(name, []).extend(aliases)
+    return skills
+
+
+class SkillMatcher:
+    """
+    Token trie compiled from a skill taxonomy.
+
+    Every name and alias is stored as a sequence of tokens, so a description is
+    tagged in one left-to-right pass over its tokens. Matching whole tokens is
+    what keeps "r" out of "docker" and "ai" out of "maintain".
+    """
+
+    def __init__(self, skills: dict):
+        self.skills = list(skills)
+        # Identifies the compiled taxonomy, so cached results can be tied to it
+        self.version = hashlib.sha1(
+            json.dumps(skills, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        self.trie = {}
+        self.max_len = 0
+        for name, aliases in skills.items():
+            for term in [name, *aliases]:
+                tokens = tokenize(term)
+                if not tokens:
+                    continue
+                node = self.trie
+                for tok in tokens:
+                    node = node.setdefault(tok, {})
+                node[_END] = name
+                self.max_len = max(self.max_len, len(tokens))
+
+    @classmethod
+    def from_taxonomy(cls, path=TAXONOMY_PATH):
+        return cls(load_taxonomy(path))
+
+    def match_tokens(self, tokens) -> list:
+        """Return canonical skill names found in a token list, in order of first appearance."""
+        found = {}
+        trie = self.trie
+        n = len(tokens)
+        for i in range(n):
+            node = trie.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                name = node.get(_END)
+                if name is not None and name not in found:
+                    found[name] = None
+                if j >= n or j - i >= self.max_len:
+                    break
+                node = node.get(tokens[j])
+                j += 1
+        return list(found)
+
+    def extract(self, text) -> list:
+        """Return canonical skill names mentioned in a piece of text."""
+        return self.match_tokens(tokenize(text))
+
+
+@lru_cache(maxsize=None)
+def get_matcher(path=TAXONOMY_PATH) -> SkillMatcher:
+    """Process-wide matcher compiled once per taxonomy file."""
+    return SkillMatcher.from_taxonomy(path)
+
+
+def extract_skills(text) -> list:
+    """Tag text with the default taxonomy."""
+    return get_matcher().extract(text)
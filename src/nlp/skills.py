@@ -1,19 +1,13 @@
-import sqlite3
 import pandas as pd
 from src.config import DB_PATH
+from src.db import connect
+from src.nlp.matcher import get_matcher
 
 def extract_skills(text):
-    if pd.isna(text):
-        return ""
-    text_lower = str(text).lower()
-    skills = []
-    for skill in ["python", "sql", "excel", "power bi", "tableau", "aws", "azure", "machine learning"]:
-        if skill in text_lower:
-            skills.append(skill)
-    return ", ".join(skills)
+    return ", ".join(get_matcher().extract(text))
 
 def run_nlp_skill_extraction():
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect(DB_PATH)
 
     # Load job descriptions (no id in table, so we create one)
     df = pd.read_sql("SELECT description FROM jobs", conn)
@@ -0,0 +1,288 @@
+# src/perf/benchmark.py
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Pipeline stages in run order; each runs in its own process so its peak memory is its own
+STAGES = [
+    "fetch_parse", "ingest", "dedup", "salary", "process", "export",
+    "skills", "locations", "aggregate", "forecast", "api",
+]
+
+# Calls per API endpoint when measuring latency
+API_REPEATS = 20
+
+# Printed by a stage worker in front of its JSON result
+RESULT_MARKER = "BENCH_RESULT "
+
+
+# ---- Stages (run inside the worker; JOBS_DATA_DIR points at the workspace) ----
+
+def _count(table) -> int:
+    from src.db import connect
+
+    conn = connect()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _artifact_rows(name) -> int:
+    from src.etl import storage
+    return len(storage.read_frame(name, columns=["title"]))
+
+
+def _generate(ctx):
+    from src.perf import synthetic
+
+    def run():
+        os.makedirs(os.path.join(ctx["workdir"], "sample_data"), exist_ok=True)
+        synthetic.write_jsonl(os.path.join(ctx["workdir"], "sample_data", "sample_jobs.jsonl"),
+                              synthetic.jsonl_rows(ctx["rows"], ctx["seed"]))
+        pages = ({"role": r, "country": c, "payload": p}
+                 for r, c, p in synthetic.adzuna_pages(ctx["rows"], ctx["seed"]))
+        synthetic.write_jsonl(os.path.join(ctx["workdir"], "adzuna_pages.jsonl"), pages)
+        return ctx["rows"]
+    return run
+
+
+def _fetch_parse(ctx):
+    from src.etl.fetch_jobs import FIELDS
+    from src.etl.fetcher import parse_job
+    from src.etl.storage import FrameWriter
+
+    def run():
+        # Same decode -> parse_job -> streaming write path as fetch_jobs.main, minus the network
+        writer = FrameWriter("jobs", FIELDS, json_copy=True)
+        total = 0
+        with open(os.path.join(ctx["workdir"], "adzuna_pages.jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                page = json.loads(line)
+                rows = [parse_job(job, page["role"], page["country"]) for job in page["payload"]["results"]]
+                writer.write_rows(rows)
+                total += len(rows)
+        writer.close()
+        return total
+    return run
+
+
+def _main_then_count(module, count, **kwargs):
+    """Stage that runs `module`.main() and reports count() rows (a table name or a callable)."""
+    def stage(ctx):
+        import importlib
+        mod = importlib.import_module(module)
+
+        def run():
+            mod.main(**kwargs)
+            return count() if callable(count) else _count(count)
+        return run
+    return stage
+
+
+def _forecast(ctx):
+    from src.forecast import train
+
+    def run():
+        train.main(force=True, plot=False, backend=ctx["forecast_backend"])
+        return _count("forecast_runs")
+    return run
+
+
+def _api(ctx):
+    from src.api.cache import DatasetCache, records
+    from src.api.query import query_jobs, search_jobs
+    from src.config import DB_PATH
+
+    def timed(fn):
+        samples = []
+        for _ in range(API_REPEATS):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        return {"p50_ms": round(statistics.median(samples), 3),
+                "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 3)}
+
+    def run():
+        cache = DatasetCache(DB_PATH)
+        start = time.perf_counter()
+        cache.refresh()
+        latency = {"cache_load": {"p50_ms": round((time.perf_counter() - start) * 1000, 3)}}
+
+        first = query_jobs(DB_PATH, limit=50)
+        company = first["items"][0]["company"] if first["items"] else None
+        deep = first
+        for _ in range(20):
+            if not deep["next_cursor"]:
+                break
+            deep = query_jobs(DB_PATH, cursor=deep["next_cursor"], limit=50)
+
+        latency["/jobs"] = timed(lambda: records(cache.get().df.head(20)))
+        latency["/skills"] = timed(lambda: cache.get().skill_counts.head(20).to_dict())
+        latency["/jobs/query"] = timed(lambda: query_jobs(DB_PATH, limit=50))
+        latency["/jobs/query company"] = timed(lambda: query_jobs(DB_PATH, company=[company], limit=50))
+        latency["/jobs/query page 20"] = timed(lambda: query_jobs(DB_PATH, cursor=deep["next_cursor"], limit=50))
+        latency["/search"] = timed(lambda: search_jobs(DB_PATH, "python spark", limit=20))
+        ctx["extra"]["latency"] = latency
+        return API_REPEATS * (len(latency) - 1)
+    return run
+
+
+STAGE_FUNCS = {
+    "generate": _generate,
+    "fetch_parse": _fetch_parse,
+    "ingest": _main_then_count("src.etl.ingest", "jobs_raw"),
+    "dedup": _main_then_count("src.etl.dedup", lambda: _artifact_rows("jobs")),
+    "salary": _main_then_count("src.etl.salary", "jobs_raw"),
+    "process": _main_then_count("src.etl.process", lambda: _artifact_rows("processed/jobs_clean")),
+    "export": _main_then_count("src.etl.export", "jobs"),
+    "skills": _main_then_count("src.etl.skills", "jobs"),
+    "locations": _main_then_count("src.etl.locations", "jobs"),
+    "aggregate": _main_then_count("src.aggregate.build_weekly", "job_skills", incremental=False),
+    "forecast": _forecast,
+    "api": _api,
+}
+
+
+def run_stage(stage, ctx) -> dict:
+    """Run one stage in this process; module imports happen before the clock starts."""
+    import resource
+
+    ctx = dict(ctx, extra={})
+    run = STAGE_FUNCS[stage](ctx)
+    start = time.perf_counter()
+    rows = run()
+    seconds = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {
+        "seconds": round(seconds, 4),
+        "rows": rows,
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": round(peak_mb, 1),
+        **ctx["extra"],
+    }
+
+
+# ---- Driver ----------------------------------------------------------------
+
+def _spawn(stage, ctx) -> dict:
+    env = dict(os.environ, JOBS_DATA_DIR=os.path.join(ctx["workdir"], "data"),
+               PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.perf.benchmark", "--worker", stage, "--ctx", json.dumps(ctx)],
+        cwd=ctx["workdir"], env=env, capture_output=True, text=True
+    )
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    lines = (proc.stderr or proc.stdout).strip().splitlines()
+    return {"error": lines[-1] if lines else f"exit code {proc.returncode}"}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _delta(now, before):
+    if not before or "seconds" not in before or "seconds" not in now or not before["seconds"]:
+        return ""
+    return f"{(now['seconds'] / before['seconds'] - 1) * 100:+6.1f}%"
+
+
+def benchmark(rows, seed=0, stages=STAGES, workdir=None, forecast_backend="fast", keep=False) -> dict:
+    """
+    Run the pipeline on a synthetic corpus of `rows` postings in a scratch workspace.
+
+    Every stage runs in a fresh process (so peak RSS is per stage) against the
+    artifacts the previous stages left in the workspace.
+    """
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="jobs-bench-")
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    ctx = {"rows": rows, "seed": seed, "workdir": workdir, "forecast_backend": forecast_backend}
+
+    results = {}
+    try:
+        for stage in ["generate", *stages]:
+            print(f"⏱️  {stage} ...", flush=True)
+            results[stage] = _spawn(stage, ctx)
+    finally:
+        if own_workdir and not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "rows": rows, "seed": seed, "forecast_backend": forecast_backend,
+            "commit": _git_commit(), "python": platform.python_version(),
+            "platform": platform.platform(), "cpus": os.cpu_count(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": results,
+    }
+
+
+def main(rows=(1000,), seed=0, stages=STAGES, out=None, baseline=None, forecast_backend="fast", keep=False):
+    previous = {}
+    if baseline and os.path.exists(baseline):
+        with open(baseline, "r", encoding="utf-8") as f:
+            previous = {str(r["meta"]["rows"]): r["stages"] for r in json.load(f)}
+
+    runs = []
+    for n in rows:
+        print(f"🚀 Benchmarking {n:,} synthetic postings")
+        run = benchmark(n, seed, stages, forecast_backend=forecast_backend, keep=keep)
+        runs.append(run)
+
+        before = previous.get(str(n), {})
+        print(f"{'stage':<12} {'seconds':>10} {'rows/s':>12} {'peak MB':>9}  vs baseline")
+        for stage, r in run["stages"].items():
+            if "error" in r:
+                print(f"{stage:<12} ⚠️ {r['error']}")
+                continue
+            print(f"{stage:<12} {r['seconds']:>10.3f} {r['rows_per_sec'] or 0:>12,.0f} "
+                  f"{r['peak_rss_mb']:>9.1f}  {_delta(r, before.get(stage))}")
+            for endpoint, lat in r.get("latency", {}).items():
+                print(f"    {endpoint:<22} p50 {lat['p50_ms']:>9.3f} ms" +
+                      (f"  p95 {lat['p95_ms']:>9.3f} ms" if "p95_ms" in lat else ""))
+
+    if out:
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(runs, f, indent=2)
+        print(f"✅ Benchmark results saved → {out}")
+    return runs
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on a synthetic job corpus")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000],
+                        help="corpus sizes to run, e.g. 1000 100000 10000000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--forecast-backend", default="fast", choices=["prophet", "fast"])
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="earlier JSON results to compare against")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch workspace")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--ctx", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(RESULT_MARKER + json.dumps(run_stage(args.worker, json.loads(args.ctx))))
+    else:
+        main(args.rows, args.seed, args.stages, args.out, args.baseline, args.forecast_backend, args.keep)
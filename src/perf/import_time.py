@@ -0,0 +1,105 @@
+# src/perf/import_time.py
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Entry points whose startup cost we track
+ENTRY_POINTS = ["run.py", "run_etl.py", "run_pipeline.py", "streamlit_app.py", "src/dash/app.py", "src/api/main.py"]
+
+
+def top_level_imports(path) -> list:
+    """Module-level import statements of a script (imports inside functions are lazy and skipped)."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    return [
+        ast.unparse(node) for node in tree.body
+        if isinstance(node, ast.Import) or (isinstance(node, ast.ImportFrom) and node.level == 0)
+    ]
+
+
+def _importtime(code):
+    """Run code under -X importtime; returns (process, {top-level module: cumulative ms})."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2 or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        # Top-level imports are not indented in the import tree
+        if raw_name[:1] == " " and raw_name[1:2] != " ":
+            packages[raw_name.strip()] = int(cumulative) / 1000.0
+    return proc, packages
+
+
+def profile_imports(statements) -> dict:
+    """
+    Run a script's import statements in a fresh interpreter under -X importtime.
+
+    Returns the total time and the cumulative time of each top-level package, in
+    milliseconds. Modules the bare interpreter loads anyway (site, encodings...)
+    are left out so only the script's own cost is counted.
+    """
+    _, startup = _importtime("pass")
+    proc, packages = _importtime("\n".join(statements))
+    packages = {name: ms for name, ms in packages.items() if name not in startup}
+    return {
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode else None,
+        "total_ms": round(sum(packages.values()), 1),
+        "packages": dict(sorted(packages.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def profile_entry_points(entry_points=ENTRY_POINTS) -> dict:
+    results = {}
+    for entry in entry_points:
+        path = os.path.join(ROOT, entry)
+        if os.path.exists(path):
+            results[entry] = profile_imports(top_level_imports(path))
+    return results
+
+
+def main(top=5, budget_ms=None, out=None, baseline=None):
+    results = profile_entry_points()
+    previous = {}
+    if baseline and os.path.exists(baseline):
+        with open(baseline, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    over_budget = []
+    for entry, r in results.items():
+        delta = ""
+        if entry in previous:
+            delta = f" ({r['total_ms'] - previous[entry]['total_ms']:+.0f} ms vs baseline)"
+        status = "" if r["ok"] else f"  ⚠️ {r['error']}"
+        print(f"📦 {entry}: {r['total_ms']:.0f} ms{delta}{status}")
+        for name, ms in list(r["packages"].items())[:top]:
+            print(f"     {ms:8.1f} ms  {name}")
+        if budget_ms and r["total_ms"] > budget_ms:
+            over_budget.append(entry)
+
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Import profile saved → {out}")
+    if over_budget:
+        print(f"❌ Over the {budget_ms} ms import budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Profile import time of the CLIs and dashboards")
+    parser.add_argument("--top", type=int, default=5, help="slowest packages to show per entry point")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if any entry point exceeds this")
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="earlier JSON results to compare against")
+    args = parser.parse_args()
+    sys.exit(main(args.top, args.budget_ms, args.out, args.baseline))
@@ -0,0 +1,262 @@
+# src/perf/runs.py
+import cProfile
+import importlib
+import os
+import resource
+import sqlite3
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from src.config import DATA_DIR, DB_PATH
+from src.db import connect
+from src.schema import migrate
+
+# cProfile dumps (one .prof per stage) when profiling is on
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles")
+
+# What each stage reads and produces, counted before / after it runs:
+# ("artifact", name), ("source", "module:function" naming the artifact read),
+# ("table", name) or ("sql", count query)
+STAGE_ROWS = {
+    "fetch_jobs": (None, ("artifact", "jobs")),
+    "dedup": (("artifact", "jobs"), ("artifact", "jobs_dedup")),
+    "ingest": (None, ("table", "jobs_raw")),
+    "salary": (("sql", "SELECT COUNT(*) FROM jobs_raw WHERE salary_parsed_at IS NULL"),
+               ("sql", "SELECT COUNT(*) FROM jobs_raw WHERE salary_min IS NOT NULL")),
+    "process": (("source", "src.etl.process:source_name"), ("artifact", "processed/jobs_clean")),
+    "skills": (("sql", "SELECT COUNT(*) FROM jobs WHERE skills IS NULL"),
+               ("sql", "SELECT COUNT(*) FROM jobs WHERE skills IS NOT NULL")),
+    "export": (("artifact", "processed/jobs_clean"), ("table", "jobs")),
+    "locations": (("table", "jobs"), ("sql", "SELECT COUNT(*) FROM jobs WHERE country_id IS NOT NULL")),
+    "build_weekly": (("table", "job_skills"), ("table", "weekly_skill_demand")),
+    "forecast": (("table", "weekly_skill_demand"), ("table", "forecast_runs")),
+}
+
+RUN_COLS = ["run_id", "stage", "started_at", "status", "wall_s", "cpu_s", "peak_rss_mb",
+            "rows_in", "rows_out", "bytes_read", "bytes_written", "error", "profile_path"]
+
+
+# ---- Measurements ------------------------------------------------------------
+
+def _io_bytes():
+    """(bytes read, bytes written) by this process so far, from /proc (None elsewhere)."""
+    try:
+        with open("/proc/self/io", "r") as f:
+            fields = dict(line.split(":") for line in f if ":" in line)
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process (all threads) plus any finished child processes."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _reset_peak_rss() -> bool:
+    """Start a fresh peak-RSS window (Linux); False where only the process-wide peak exists."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _count(spec, db_path):
+    """Rows behind a STAGE_ROWS spec, or None if it does not exist (yet)."""
+    if spec is None:
+        return None
+    kind, target = spec
+    try:
+        if kind == "source":
+            module, fn = target.split(":")
+            kind, target = "artifact", getattr(importlib.import_module(module), fn)()
+        if kind == "artifact":
+            from src.etl import storage  # pandas/pyarrow stay out of the entry points' startup
+            return storage.count_rows(target)
+        sql = f"SELECT COUNT(*) FROM {target}" if kind == "table" else target
+        conn = connect(db_path)
+        try:
+            return conn.execute(sql).fetchone()[0]
+        finally:
+            conn.close()
+    except (FileNotFoundError, sqlite3.Error):
+        return None
+
+
+def _diff(after, before):
+    return after - before if after is not None and before is not None else None
+
+
+class PipelineRun:
+    """
+    Instruments the stages of one pipeline run and records them in pipeline_runs.
+
+    Each stage gets wall and CPU time, peak RSS, rows in and out (see STAGE_ROWS)
+    and bytes read/written. With `profile`, each stage also runs under cProfile
+    and its stats are saved to PROFILE_DIR.
+    """
+
+    def __init__(self, db_path=DB_PATH, profile=False, profile_dir=PROFILE_DIR):
+        self.db_path = db_path
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.run_id = time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        self.records = []
+
+    def stage(self, name, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) as stage `name`; returns its result and re-raises its errors."""
+        rows_in_spec, rows_out_spec = STAGE_ROWS.get(name, (None, None))
+        rows_in = _count(rows_in_spec, self.db_path)
+        record = {"run_id": self.run_id, "stage": name,
+                  "started_at": datetime.now(timezone.utc).isoformat(), "rows_in": rows_in}
+
+        read0, written0 = _io_bytes()
+        _reset_peak_rss()
+        cpu0 = _cpu_seconds()
+        profiler = cProfile.Profile() if self.profile else None
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            result = fn(*args, **kwargs)
+            record.update(status="ok", error=None)
+            return result
+        except BaseException as e:
+            record.update(status="failed", error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record["wall_s"] = round(time.perf_counter() - start, 4)
+            record["cpu_s"] = round(_cpu_seconds() - cpu0, 4)
+            record["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+            read1, written1 = _io_bytes()
+            record["bytes_read"] = _diff(read1, read0)
+            record["bytes_written"] = _diff(written1, written0)
+            record["rows_out"] = _count(rows_out_spec, self.db_path)
+            record["profile_path"] = self._save_profile(profiler, name)
+            self._record(record)
+
+    def _save_profile(self, profiler, name):
+        if profiler is None:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{self.run_id}_{name}.prof")
+        profiler.dump_stats(path)
+        return path
+
+    def _record(self, record):
+        self.records.append(record)
+        conn = connect(self.db_path)
+        try:
+            migrate(conn)
+            conn.execute(f"""
+                INSERT OR REPLACE INTO pipeline_runs ({", ".join(RUN_COLS)})
+                VALUES ({", ".join("?" for _ in RUN_COLS)})
+            """, [record.get(c) for c in RUN_COLS])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def summary(self):
+        """One line per stage of this run, slowest first."""
+        for r in sorted(self.records, key=lambda r: -r["wall_s"]):
+            print(f"⏱️  {r['stage']:<12} {r['wall_s']:>9.2f}s wall {r['cpu_s']:>9.2f}s cpu "
+                  f"{r['peak_rss_mb']:>8.1f} MB  rows {_fmt(r['rows_in'])} → {_fmt(r['rows_out'])}"
+                  + ("" if r["status"] == "ok" else f"  ❌ {r['error']}"))
+
+
+def _fmt(n):
+    return "-" if n is None or n != n else f"{int(n):,}"
+
+
+# ---- Trend view --------------------------------------------------------------
+
+def load_runs(db_path=DB_PATH, stage=None, last=10):
+    """Stage records of the `last` runs (optionally one stage), oldest first."""
+    import pandas as pd
+
+    conn = connect(db_path)
+    try:
+        migrate(conn)
+        runs = pd.read_sql("""
+            SELECT run_id FROM pipeline_runs GROUP BY run_id ORDER BY MIN(started_at) DESC LIMIT ?
+        """, conn, params=[last])
+        df = pd.read_sql(f"""
+            SELECT * FROM pipeline_runs
+            WHERE run_id IN ({", ".join("?" for _ in runs["run_id"])}) {"AND stage = ?" if stage else ""}
+            ORDER BY started_at
+        """, conn, params=[*runs["run_id"], *([stage] if stage else [])])
+    finally:
+        conn.close()
+    return df
+
+
+def trends(df):
+    """Per-stage history with wall time and row changes against the stage's previous run."""
+    df = df.sort_values(["stage", "started_at"]).copy()
+    grouped = df.groupby("stage")
+    df["wall_vs_prev"] = grouped["wall_s"].pct_change() * 100
+    df["rows_out_vs_prev"] = grouped["rows_out"].diff()
+    df["wall_vs_median"] = (df["wall_s"] / grouped["wall_s"].transform("median") - 1) * 100
+    return df
+
+
+def main(stage=None, last=10, db_path=DB_PATH):
+    import pandas as pd
+
+    df = load_runs(db_path, stage, last)
+    if df.empty:
+        print("⚠️ No pipeline runs recorded yet. Run: python run_etl.py")
+        return
+    df = trends(df)
+    # Stages in pipeline order (by when they first ran in the window)
+    order = df.groupby("stage")["started_at"].min().sort_values().index
+    for name in order:
+        g = df[df["stage"] == name]
+        print(f"\n📈 {name}")
+        view = pd.DataFrame({
+            "run": g["run_id"],
+            "status": g["status"],
+            "wall_s": g["wall_s"].round(2),
+            "Δ% prev": g["wall_vs_prev"].round(1),
+            "Δ% median": g["wall_vs_median"].round(1),
+            "cpu_s": g["cpu_s"].round(2),
+            "peak_mb": g["peak_rss_mb"].round(1),
+            "rows_in": g["rows_in"].map(_fmt),
+            "rows_out": g["rows_out"].map(_fmt),
+            "Δ rows_out": g["rows_out_vs_prev"].map(lambda v: "" if pd.isna(v) else f"{int(v):+,}"),
+            "MB read": (g["bytes_read"] / 1e6).round(1),
+            "MB written": (g["bytes_written"] / 1e6).round(1),
+        })
+        print(view.to_string(index=False, na_rep="-"))
+
+    latest = df[df["run_id"] == df.sort_values("started_at")["run_id"].iloc[-1]]
+    slowest = latest.sort_values("wall_s", ascending=False).iloc[0]
+    print(f"\n🐢 Slowest stage of the latest run ({slowest['run_id']}): "
+          f"{slowest['stage']} at {slowest['wall_s']:.2f}s")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Show pipeline stage timings and row counts across runs")
+    parser.add_argument("--stage", default=None, help="only this stage")
+    parser.add_argument("--last", type=int, default=10, help="number of most recent runs")
+    args = parser.parse_args()
+    main(args.stage, args.last)
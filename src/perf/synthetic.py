@@ -0,0 +1,128 @@
+# src/perf/synthetic.py
+import json
+import random
+from datetime import datetime, timedelta
+
+# Search grid of the real fetch (fetch_jobs.JOB_ROLES x COUNTRIES)
+ROLES = ["data analyst", "data scientist", "machine learning engineer", "business analyst", "software engineer"]
+COUNTRIES = ["in", "us", "gb", "ca", "au"]
+
+TITLES = {
+    "data analyst": ["Data Analyst", "Senior Data Analyst", "Junior Data Analyst", "BI Analyst"],
+    "data scientist": ["Data Scientist", "Senior Data Scientist", "Lead Data Scientist"],
+    "machine learning engineer": ["Machine Learning Engineer", "ML Engineer", "MLOps Engineer"],
+    "business analyst": ["Business Analyst", "Senior Business Analyst", "Product Analyst"],
+    "software engineer": ["Software Engineer", "Backend Engineer", "Data Engineer"],
+}
+
+LOCATIONS = {
+    "in": ["Bengaluru, Karnataka", "Bangalore, Karnataka, India", "Pune, Maharashtra", "Mumbai, Maharashtra",
+           "Hyderabad, Telangana", "Chennai, Tamil Nadu", "Gurgaon, Haryana", "Noida, Uttar Pradesh", "India"],
+    "us": ["New York, NY", "San Francisco, California", "Seattle, Washington", "Austin, Texas", "Remote, US"],
+    "gb": ["London, UK", "Manchester, England", "Edinburgh, Scotland", "UK"],
+    "ca": ["Toronto, Ontario", "Vancouver, British Columbia", "Canada"],
+    "au": ["Sydney, New South Wales", "Melbourne, Victoria", "Australia"],
+}
+
+SKILLS = ["python", "sql", "excel", "tableau", "power bi", "aws", "docker", "kubernetes", "spark",
+          "machine learning", "deep learning", "pytorch", "tensorflow", "pandas", "scikit-learn",
+          "nlp", "java", "scala", "hadoop", "data analysis", "statistics", "r"]
+
+FILLER = ("we are looking for a motivated engineer to join our growing team you will work with "
+          "stakeholders to design build and maintain reliable pipelines and reports across the "
+          "business strong communication skills and ownership are essential hybrid working "
+          "competitive benefits and learning budget").split()
+
+SALARY_TEXT = {
+    "in": ["Salary: ₹{lo}-{hi} LPA.", "CTC ₹{lo},00,000 per annum.", ""],
+    "us": ["Pay: ${lo}k - ${hi}k/year.", "${lo}k/year plus bonus.", ""],
+    "gb": ["Salary £{lo},000 - £{hi},000 p.a.", ""],
+    "ca": ["C${lo}k - C${hi}k per year.", ""],
+    "au": ["A${lo}k per year.", ""],
+}
+
+# Postings also returned by another role's search, as overlapping real searches do
+DUPLICATE_RATE = 0.1
+
+EPOCH = datetime(2024, 1, 1)
+
+
+def _description(rng, country):
+    skills = rng.sample(SKILLS, rng.randint(2, 6))
+    words = rng.choices(FILLER, k=rng.randint(30, 90))
+    for skill in skills:
+        words.insert(rng.randrange(len(words) + 1), skill)
+    lo = rng.randint(4, 40) if country == "in" else rng.randint(40, 160)
+    salary = rng.choice(SALARY_TEXT[country]).format(lo=lo, hi=lo + rng.randint(2, 20))
+    return " ".join(words).capitalize() + ". " + salary
+
+
+def adzuna_jobs(n, seed=0):
+    """
+    Yield (role, country, result) for `n` synthetic postings shaped like Adzuna search results.
+
+    The stream is deterministic for a given seed and never held in memory, so it
+    scales to millions of rows. About DUPLICATE_RATE of postings come back a second
+    time under another role (counted towards `n`).
+    """
+    rng = random.Random(seed)
+    emitted = i = 0
+    while emitted < n:
+        role, country = rng.choice(ROLES), rng.choice(COUNTRIES)
+        created = EPOCH + timedelta(minutes=rng.randrange(0, 600 * 24 * 60))
+        salary_lo = rng.choice([None, rng.randint(20, 150) * 1000])
+        job = {
+            "id": str(1_000_000 + i),
+            "title": rng.choice(TITLES[role]),
+            "company": {"display_name": f"Company {rng.randint(1, max(10, n // 50))}"},
+            "location": {"display_name": rng.choice(LOCATIONS[country])},
+            "created": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "salary_min": salary_lo,
+            "salary_max": salary_lo and salary_lo + rng.randint(0, 40) * 1000,
+            "description": _description(rng, country),
+            "redirect_url": f"https://www.adzuna.co.{country}/details/{1_000_000 + i}",
+        }
+        i += 1
+        yield role, country, job
+        emitted += 1
+        if emitted < n and rng.random() < DUPLICATE_RATE:
+            yield rng.choice([r for r in ROLES if r != role]), country, job
+            emitted += 1
+
+
+def adzuna_pages(n, seed=0, results_per_page=50):
+    """Yield (role, country, page payload) for synthetic results, like AdzunaFetcher.get_page returns."""
+    buffers = {}
+    for role, country, job in adzuna_jobs(n, seed):
+        batch = buffers.setdefault((role, country), [])
+        batch.append(job)
+        if len(batch) >= results_per_page:
+            yield role, country, {"count": len(batch), "results": batch}
+            buffers[(role, country)] = []
+    for (role, country), batch in buffers.items():
+        if batch:
+            yield role, country, {"count": len(batch), "results": batch}
+
+
+def jsonl_rows(n, seed=0):
+    """Yield `n` rows in the sample_data/sample_jobs.jsonl schema read by ingest.py."""
+    for i, (_, _, job) in enumerate(adzuna_jobs(n, seed)):
+        yield {
+            "external_id": f"B{i}",
+            "source": "synthetic",
+            "company": job["company"]["display_name"],
+            "title": job["title"],
+            "location": job["location"]["display_name"],
+            "posted_at": job["created"][:10],
+            "url": job["redirect_url"],
+            "description": job["description"],
+        }
+
+
+def write_jsonl(path, rows) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+    return count
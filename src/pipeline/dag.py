@@ -0,0 +1,278 @@
+# src/pipeline/dag.py
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+from src.config import DB_PATH
+from src.db import connect
+from src.perf.runs import PipelineRun
+from src.schema import migrate
+
+# Stages run side by side in worker processes, up to this many at once
+WORKERS = int(os.getenv("PIPELINE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+
+class Stage:
+    """
+    One step of the pipeline and what it depends on.
+
+    - target: "module:function" called in a worker process (kwargs are passed on)
+    - deps: stages whose outputs this stage reads
+    - inputs: files outside the pipeline it reads (taxonomies, sample data, rate tables)
+    - outputs: ("artifact", name), ("table", name) or ("file", path) it produces
+    - code: modules besides the target's whose source is part of its code version
+    - rebuild_on / rebuild_kwargs: inputs whose change calls the stage with
+      rebuild_kwargs instead of its incremental default (e.g. a new taxonomy)
+    - max_age: seconds after which the stage re-runs even if nothing local changed
+      (for remote sources such as the job board API)
+    """
+
+    def __init__(self, name, target, deps=(), inputs=(), outputs=(), code=(), kwargs=None,
+                 rebuild_on=(), rebuild_kwargs=None, max_age=None):
+        self.name = name
+        self.target = target
+        self.deps = tuple(deps)
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.code = tuple(code)
+        self.kwargs = dict(kwargs or {})
+        self.rebuild_on = tuple(rebuild_on)
+        self.rebuild_kwargs = dict(rebuild_kwargs or {})
+        self.max_age = max_age
+
+    @property
+    def writes_db(self) -> bool:
+        return any(kind == "table" for kind, _ in self.outputs)
+
+    def with_kwargs(self, **kwargs):
+        """Copy of the stage with extra keyword arguments for its target."""
+        return Stage(self.name, self.target, self.deps, self.inputs, self.outputs, self.code,
+                     {**self.kwargs, **kwargs}, self.rebuild_on, self.rebuild_kwargs, self.max_age)
+
+
+# ---- Fingerprints ------------------------------------------------------------
+
+def _sha1(*parts) -> str:
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(repr(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def file_hash(path, max_content_bytes=1 << 20) -> str:
+    """Content hash for small files (taxonomies, rate tables), size + mtime for large ones."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    if st.st_size > max_content_bytes:
+        return _sha1(st.st_size, st.st_mtime_ns)
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+_code_hashes = {}
+
+
+def code_hash(module) -> str:
+    """Hash of a module's source file, found without importing the module itself."""
+    if module not in _code_hashes:
+        spec = importlib.util.find_spec(module)
+        origin = spec.origin if spec is not None else None
+        _code_hashes[module] = file_hash(origin, max_content_bytes=float("inf")) if origin else "missing"
+    return _code_hashes[module]
+
+
+def _output_state(kind, target, db_path):
+    """Cheap identity of an output as it is now, or None if it does not exist."""
+    if kind == "artifact":
+        from src.etl import storage  # pandas/pyarrow stay out of the entry points' startup
+        return storage.mtime(target) if storage.exists(target) else None
+    if kind == "file":
+        return os.stat(target).st_mtime_ns if os.path.exists(target) else None
+    conn = connect(db_path)
+    try:
+        found = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (target,)).fetchone()
+    finally:
+        conn.close()
+    return "table" if found else None
+
+
+def _call(target, kwargs):
+    module, func = target.split(":")
+    return getattr(importlib.import_module(module), func)(**kwargs)
+
+
+def _execute(run, name, target, kwargs):
+    """Worker side: import and run one stage under PipelineRun; returns (record, error)."""
+    recorded = len(run.records)
+    try:
+        run.stage(name, _call, target, kwargs)
+        return run.records[-1], None
+    except BaseException:
+        error = traceback.format_exc()
+        if len(run.records) > recorded:
+            return run.records[-1], error
+        # Failed before PipelineRun recorded the stage (e.g. while counting its rows)
+        return {"run_id": run.run_id, "stage": name, "started_at": datetime.now(timezone.utc).isoformat(),
+                "status": "failed", "wall_s": 0.0, "cpu_s": 0.0, "peak_rss_mb": 0.0,
+                "rows_in": None, "rows_out": None, "error": error}, error
+
+
+class Pipeline:
+    """
+    Runs a DAG of Stages, skipping those whose fingerprint has not changed.
+
+    A stage's fingerprint covers its code (target module plus `code`), its kwargs,
+    its external inputs and the output fingerprints of its deps; it is stored in
+    pipeline_cache after each successful run. A stage is skipped while its
+    fingerprint matches, its outputs still exist and (with max_age) its last run
+    is recent enough. Outputs are reused in place rather than copied.
+
+    Stages whose deps are done run in parallel worker processes, except that only
+    one stage writing to the database runs at a time.
+    """
+
+    def __init__(self, stages, db_path=DB_PATH, workers=WORKERS, profile=False):
+        self.stages = {s.name: s for s in stages}
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+        self.db_path = db_path
+        self.workers = workers
+        self.run = PipelineRun(db_path, profile=profile)
+
+    def plan(self, targets=None) -> list:
+        """Names of the target stages and everything upstream of them, in dependency order."""
+        order, seen = [], set()
+
+        def visit(name, path=()):
+            if name in path:
+                raise ValueError(f"Stage cycle: {' → '.join(path + (name,))}")
+            if name in seen:
+                return
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}' (choose from {', '.join(self.stages)})")
+            for dep in self.stages[name].deps:
+                visit(dep, path + (name,))
+            seen.add(name)
+            order.append(name)
+
+        for name in targets or self.stages:
+            visit(name)
+        return order
+
+    def _cached(self):
+        conn = connect(self.db_path)
+        try:
+            migrate(conn)
+            rows = conn.execute("SELECT stage, fingerprint, output_fingerprint, inputs, finished_at FROM pipeline_cache")
+            return {r[0]: {"fingerprint": r[1], "output": r[2], "inputs": json.loads(r[3] or "{}"),
+                           "finished_at": r[4]} for r in rows.fetchall()}
+        finally:
+            conn.close()
+
+    def fingerprint(self, stage, outputs_of) -> tuple:
+        """(fingerprint, input hashes) of a stage, given the output fingerprints of its deps."""
+        inputs = {path: file_hash(path) for path in stage.inputs}
+        code = {m: code_hash(m) for m in (stage.target.split(":")[0], *stage.code)}
+        deps = {d: outputs_of[d] for d in stage.deps}
+        kwargs = sorted(stage.kwargs.items())
+        return _sha1(stage.name, stage.target, code, kwargs, sorted(inputs.items()), sorted(deps.items())), inputs
+
+    def output_fingerprint(self, stage, fingerprint):
+        """What downstream stages see: the stage's fingerprint plus the state of its file outputs."""
+        states = [(kind, target, _output_state(kind, target, self.db_path))
+                  for kind, target in stage.outputs if kind != "table"]
+        return _sha1(fingerprint, states)
+
+    def _fresh(self, stage, fingerprint, cached) -> bool:
+        if cached is None or cached["fingerprint"] != fingerprint:
+            return False
+        if any(_output_state(kind, target, self.db_path) is None for kind, target in stage.outputs):
+            return False
+        if stage.max_age is not None:
+            finished = datetime.fromisoformat(cached["finished_at"])
+            if (datetime.now(timezone.utc) - finished).total_seconds() > stage.max_age:
+                return False
+        return True
+
+    def _save(self, stage, fingerprint, output, inputs):
+        conn = connect(self.db_path)
+        try:
+            migrate(conn)
+            conn.execute("""
+                INSERT OR REPLACE INTO pipeline_cache (stage, fingerprint, output_fingerprint, inputs, run_id, finished_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (stage.name, fingerprint, output, json.dumps(inputs), self.run.run_id,
+                  datetime.now(timezone.utc).isoformat()))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def execute(self, targets=None, force=()) -> dict:
+        """
+        Run `targets` (default: all stages) and whatever upstream stages are stale.
+
+        `force` names stages to run regardless of their fingerprint (True for all).
+        Returns {stage: "ran" | "cached" | "failed" | "blocked"}; a failed stage
+        blocks its downstream stages but independent branches carry on.
+        """
+        pending = self.plan(targets)
+        cache = self._cached()
+        outputs_of, status = {}, {}
+        running = {}
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(status.get(d) in ("failed", "blocked") for d in stage.deps):
+                        status[name] = "blocked"
+                        pending.remove(name)
+                        print(f"⛔ {name}: skipped, an upstream stage failed")
+                        continue
+                    if any(d not in outputs_of for d in stage.deps):
+                        continue
+                    if stage.writes_db and any(self.stages[r[0]].writes_db for r in running.values()):
+                        continue
+
+                    fingerprint, inputs = self.fingerprint(stage, outputs_of)
+                    cached = cache.get(name)
+                    pending.remove(name)
+                    if (force is not True and name not in force) and self._fresh(stage, fingerprint, cached):
+                        outputs_of[name] = cached["output"]
+                        status[name] = "cached"
+                        print(f"⏭️  {name}: unchanged, skipped")
+                        continue
+
+                    kwargs = dict(stage.kwargs)
+                    if cached and any(cached["inputs"].get(p) != inputs.get(p) for p in stage.rebuild_on):
+                        kwargs.update(stage.rebuild_kwargs)
+                    print(f"▶️  {name}")
+                    future = pool.submit(_execute, self.run, name, stage.target, kwargs)
+                    running[future] = (name, fingerprint, inputs)
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, fingerprint, inputs = running.pop(future)
+                    stage = self.stages[name]
+                    record, error = future.result()
+                    self.run.records.append(record)
+                    if error is None:
+                        outputs_of[name] = self.output_fingerprint(stage, fingerprint)
+                        self._save(stage, fingerprint, outputs_of[name], inputs)
+                        status[name] = "ran"
+                    else:
+                        status[name] = "failed"
+                        print(f"❌ {name} failed:\n{error}")
+        return status
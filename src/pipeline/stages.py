@@ -0,0 +1,103 @@
+# src/pipeline/stages.py
+import os
+import sys
+
+from src.config import CURRENCY_RATES_PATH, LOCATIONS_PATH, TAXONOMY_PATH
+from src.db import connection
+from src.pipeline.dag import Pipeline, Stage
+from src.schema import migrate
+
+# The job board is re-fetched once the last fetch is older than this; local
+# changes (taxonomy, code, sample data) never trigger a fetch on their own
+FETCH_MAX_AGE_HOURS = float(os.getenv("FETCH_MAX_AGE_HOURS", "12"))
+
+# Read by ingest.py relative to the working directory
+SAMPLE_PATH = os.path.join("sample_data", "sample_jobs.jsonl")
+REPORT_PATH = os.path.join("reports", "job_market_report.pdf")
+
+STAGES = [
+    Stage("fetch_jobs", "src.etl.fetch_jobs:main",
+          outputs=[("artifact", "jobs")], code=["src.etl.fetcher"],
+          max_age=FETCH_MAX_AGE_HOURS * 3600),
+    Stage("dedup", "src.etl.dedup:main", deps=["fetch_jobs"],
+          outputs=[("artifact", "jobs_dedup")], code=["src.etl.utils"]),
+    Stage("ingest", "src.etl.ingest:main",
+          inputs=[SAMPLE_PATH], outputs=[("table", "jobs_raw")], code=["src.schema"]),
+    Stage("salary", "src.etl.salary:main", deps=["ingest"],
+          inputs=[CURRENCY_RATES_PATH], outputs=[("table", "jobs_raw")],
+          rebuild_on=[CURRENCY_RATES_PATH], rebuild_kwargs={"reparse": True}),
+    Stage("process", "src.etl.process:main", deps=["fetch_jobs", "dedup"],
+          inputs=[TAXONOMY_PATH, CURRENCY_RATES_PATH],
+          outputs=[("artifact", "processed/jobs_clean"), ("artifact", "processed/job_skills")],
+          code=["src.etl.utils", "src.nlp.matcher", "src.etl.salary"]),
+    Stage("export", "src.etl.export:main", deps=["process"],
+          outputs=[("table", "jobs"), ("table", "jobs_clean")], code=["src.etl.bulk", "src.schema"]),
+    Stage("skills", "src.etl.skills:main", deps=["export"],
+          inputs=[TAXONOMY_PATH], outputs=[("table", "jobs"), ("table", "job_skills")],
+          code=["src.nlp.matcher", "src.schema"],
+          rebuild_on=[TAXONOMY_PATH], rebuild_kwargs={"only_missing": False}),
+    Stage("locations", "src.etl.locations:main", deps=["export"],
+          inputs=[LOCATIONS_PATH], outputs=[("table", "location_map")]),
+    Stage("build_weekly", "src.aggregate.build_weekly:main", deps=["skills"],
+          outputs=[("table", "weekly_skill_demand")], code=["src.schema"]),
+    # No plot, so a headless pipeline run does not need matplotlib
+    Stage("forecast", "src.forecast.train:main", deps=["export", "build_weekly"],
+          outputs=[("table", "forecast_runs")], code=["src.forecast.fast"], kwargs={"plot": False}),
+    Stage("report", "src.analysis.report:main", deps=["skills"],
+          outputs=[("file", REPORT_PATH)]),
+]
+
+# What `python run_etl.py` refreshes; the PDF report is built on request
+ETL_TARGETS = ["salary", "skills", "locations", "forecast"]
+
+
+def stages(job_role=None):
+    """The pipeline's stages; with `job_role`, the fetch searches only that role."""
+    if not job_role:
+        return list(STAGES)
+    return [s.with_kwargs(roles=[job_role]) if s.name == "fetch_jobs" else s for s in STAGES]
+
+
+def run_pipeline(targets=None, force=(), job_role=None, profile=False) -> dict:
+    """Bring `targets` (default: ETL_TARGETS) up to date; exits non-zero if a stage failed."""
+    pipeline = Pipeline(stages(job_role), profile=profile)
+    # Migrated once up front, so stages running side by side never race on the schema
+    with connection(pipeline.db_path) as conn:
+        migrate(conn)
+    try:
+        status = pipeline.execute(targets or ETL_TARGETS, force=force)
+    finally:
+        pipeline.run.summary()
+    ran = sum(s == "ran" for s in status.values())
+    cached = sum(s == "cached" for s in status.values())
+    print(f"📊 Run {pipeline.run.run_id}: {ran} stages ran, {cached} unchanged. Trends: python -m src.perf.runs")
+    failed = [name for name, s in status.items() if s in ("failed", "blocked")]
+    if failed:
+        print(f"❌ Pipeline incomplete: {', '.join(failed)} did not finish")
+        sys.exit(1)
+    return status
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the pipeline, skipping stages whose inputs have not changed")
+    parser.add_argument("targets", nargs="*", help=f"stages to bring up to date (default: {' '.join(ETL_TARGETS)})")
+    parser.add_argument("--force", nargs="*", metavar="STAGE",
+                        help="re-run these stages even if unchanged (all stages when none are named)")
+    parser.add_argument("--role", default=None, help="fetch only this job role")
+    parser.add_argument("--profile", action="store_true", help="save a cProfile of every stage to data/profiles")
+    parser.add_argument("--plan", action="store_true", help="print the stages that would be considered and exit")
+    args = parser.parse_args(argv)
+
+    if args.plan:
+        pipeline = Pipeline(stages(args.role))
+        for name in pipeline.plan(args.targets or ETL_TARGETS):
+            deps = pipeline.stages[name].deps
+            print(f"{name}" + (f"  ← {', '.join(deps)}" if deps else ""))
+        return
+    force = True if args.force == [] else tuple(args.force or ())
+    run_pipeline(args.targets, force=force, job_role=args.role, profile=args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+# src/schema.py
+import sqlite3
+
+from src.etl.utils import job_key, title_normalized
+
+# Migrations run in order, each once per database, in its own transaction.
+# PRAGMA user_version records the last one applied.
+MIGRATIONS = []
+
+# jobs_clean: the narrow analytics projection of jobs (one row per jobs row)
+CLEAN_COLS = ["id", "title", "title_normalized", "company", "location", "posted_at",
+              "salary_min", "salary_max", "updated_at"]
+
+
+def migration(version, description):
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return register
+
+
+def _columns(conn, table) -> list:
+    return [c[1] for c in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+@migration(1, "core tables: jobs_raw, jobs, jobs_changes")
+def _core(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs_raw (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            external_id TEXT,
+            source TEXT,
+            company TEXT,
+            title TEXT,
+            location_raw TEXT,
+            posted_at TEXT,
+            url TEXT,
+            description TEXT,
+            raw TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            company TEXT,
+            location TEXT,
+            created TEXT,
+            salary_min REAL,
+            salary_max REAL,
+            description TEXT,
+            redirect_url TEXT,
+            job_key TEXT,
+            content_hash TEXT,
+            updated_at TEXT,
+            skills TEXT
+        )
+    """)
+    # Tables from before the upsert columns (or from the old db_init.py layout)
+    columns = _columns(conn, "jobs")
+    for col, kind in [("created", "TEXT"), ("salary_min", "REAL"), ("salary_max", "REAL"),
+                      ("redirect_url", "TEXT"), ("job_key", "TEXT"), ("content_hash", "TEXT"),
+                      ("updated_at", "TEXT"), ("skills", "TEXT")]:
+        if col not in columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {kind}")
+
+    # Backfill keys for rows loaded before keys existed
+    missing = conn.execute("""
+        SELECT id, redirect_url, title, company, location, created FROM jobs WHERE job_key IS NULL
+    """).fetchall()
+    if missing:
+        conn.executemany("UPDATE jobs SET job_key = ? WHERE id = ?", [
+            (job_key(redirect_url=url, title=t, company=c, location=l, created=cr), rid)
+            for rid, url, t, c, l, cr in missing
+        ])
+        # Older full reloads may hold the same posting twice; keep the newest copy
+        conn.execute("DELETE FROM jobs WHERE id NOT IN (SELECT MAX(id) FROM jobs GROUP BY job_key)")
+
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_job_key ON jobs(job_key)")
+    # Behind the API's filtered, keyset-paginated job queries
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_created_id ON jobs(IFNULL(created, ''), id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_company ON jobs(company COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_location ON jobs(location COLLATE NOCASE)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs_changes (
+            job_key TEXT NOT NULL,
+            change TEXT NOT NULL,
+            loaded_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_changes_loaded_at ON jobs_changes(loaded_at)")
+
+
+@migration(2, "analytics tables: skills, jobs_clean, job_skills, weekly_skill_demand")
+def _analytics(conn):
+    # process.py used to write keyless copies of these with to_sql; they are derived data
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()}
+    if "jobs_clean" in tables and "id" not in _columns(conn, "jobs_clean"):
+        conn.execute("DROP TABLE jobs_clean")
+    if "job_skills" in tables and "skill_id" not in _columns(conn, "job_skills"):
+        conn.execute("DROP TABLE job_skills")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            category TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs_clean (
+            id INTEGER PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,
+            title TEXT,
+            title_normalized TEXT,
+            company TEXT,
+            location TEXT,
+            posted_at TEXT,
+            salary_min REAL,
+            salary_max REAL,
+            updated_at TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_skills (
+            job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+            skill_id INTEGER NOT NULL REFERENCES skills(id),
+            PRIMARY KEY (job_id, skill_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS weekly_skill_demand (
+            week_start TEXT NOT NULL,
+            skill_id INTEGER NOT NULL REFERENCES skills(id),
+            demand INTEGER,
+            median_salary REAL,
+            p25_salary REAL,
+            p75_salary REAL,
+            PRIMARY KEY (week_start, skill_id)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS etl_watermarks (
+            name TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TEXT
+        )
+    """)
+
+    # Each index covers the GROUP BY / range scans that read it, so they never touch the table
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_created ON jobs(created)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_clean_posted_at ON jobs_clean(posted_at, salary_min, salary_max)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_clean_updated_at ON jobs_clean(updated_at, posted_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_clean_company ON jobs_clean(company)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_clean_location ON jobs_clean(location)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_clean_title ON jobs_clean(title_normalized)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_job_skills_skill ON job_skills(skill_id)")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_weekly_skill_demand_skill
+        ON weekly_skill_demand(skill_id, week_start, demand, median_salary)
+    """)
+
+    # Backfill from jobs; clearing jobs.skills makes the skills stage fill job_skills
+    rows = conn.execute("""
+        SELECT id, title, company, location, substr(created, 1, 10), salary_min, salary_max, updated_at FROM jobs
+    """)
+    conn.executemany(f"""
+        INSERT OR IGNORE INTO jobs_clean ({", ".join(CLEAN_COLS)})
+        VALUES ({", ".join("?" for _ in CLEAN_COLS)})
+    """, ((i, t, title_normalized(t), *rest) for i, t, *rest in rows))
+    conn.execute("UPDATE jobs SET skills = NULL WHERE skills IS NOT NULL")
+
+
+@migration(3, "dashboard index: jobs title")
+def _dashboard(conn):
+    # The role facet groups and filters on title like company/location (NOCASE)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_title ON jobs(title COLLATE NOCASE)")
+
+
+@migration(4, "API indexes: jobs salary bounds")
+def _salary_bounds(conn):
+    # The API's salary filters compare these expressions; a plain (salary_min, salary_max) index never served them
+    conn.execute("DROP INDEX IF EXISTS ix_jobs_salary")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_salary_high ON jobs(IFNULL(salary_max, salary_min))")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_salary_low ON jobs(IFNULL(salary_min, salary_max))")
+
+
+@migration(5, "jobs_changes: posted date an update moved a posting from")
+def _changes_prev_posted_at(conn):
+    # build_weekly recomputes the week a changed posting left, not only the one it joined
+    if "prev_posted_at" not in _columns(conn, "jobs_changes"):
+        conn.execute("ALTER TABLE jobs_changes ADD COLUMN prev_posted_at TEXT")
+
+
+@migration(6, "location tables: geo_countries, geo_states, geo_cities, location_map, jobs location IDs")
+def _locations(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS geo_countries (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("CREATE TABLE IF NOT EXISTS geo_states (id INTEGER PRIMARY KEY, name TEXT, country_id INTEGER)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS geo_cities (
+            id INTEGER PRIMARY KEY, name TEXT, state_id INTEGER, country_id INTEGER
+        )
+    """)
+    # Resolutions per distinct raw location, kept until the gazetteer changes
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS location_map (
+            raw TEXT PRIMARY KEY,
+            city_id INTEGER,
+            state_id INTEGER,
+            country_id INTEGER,
+            gazetteer_version TEXT
+        )
+    """)
+    # The locations stage used to add these itself
+    columns = _columns(conn, "jobs")
+    for col in ("city_id", "state_id", "country_id"):
+        if col not in columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_city_id ON jobs(city_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_country_id ON jobs(country_id)")
+
+
+@migration(7, "jobs_raw: parsed salary columns")
+def _raw_salaries(conn):
+    columns = _columns(conn, "jobs_raw")
+    for col, kind in [("salary_min", "REAL"), ("salary_max", "REAL"), ("salary_currency", "TEXT"),
+                      ("salary_period", "TEXT"), ("salary_min_annual", "REAL"), ("salary_max_annual", "REAL"),
+                      ("salary_parsed_at", "TEXT")]:
+        if col not in columns:
+            conn.execute(f"ALTER TABLE jobs_raw ADD COLUMN {col} {kind}")
+
+
+@migration(8, "forecast tables: postings_forecast, skill_forecasts, forecast_runs")
+def _forecasts(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS postings_forecast (
+            ds TEXT PRIMARY KEY,
+            yhat REAL,
+            yhat_lower REAL,
+            yhat_upper REAL,
+            model TEXT,
+            fingerprint TEXT,
+            fitted_at TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS skill_forecasts (
+            skill_id INTEGER NOT NULL,
+            week_start TEXT NOT NULL,
+            yhat REAL,
+            yhat_lower REAL,
+            yhat_upper REAL,
+            model TEXT,
+            fingerprint TEXT,
+            fitted_at TEXT,
+            PRIMARY KEY (skill_id, week_start)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS forecast_runs (
+            target TEXT PRIMARY KEY,
+            model TEXT,
+            fingerprint TEXT,
+            fitted_at TEXT,
+            points INTEGER
+        )
+    """)
+
+
+@migration(9, "pipeline tables: pipeline_cache, pipeline_runs")
+def _pipeline(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_cache (
+            stage TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            output_fingerprint TEXT NOT NULL,
+            inputs TEXT,
+            run_id TEXT,
+            finished_at TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            run_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            started_at TEXT,
+            status TEXT,
+            wall_s REAL,
+            cpu_s REAL,
+            peak_rss_mb REAL,
+            rows_in INTEGER,
+            rows_out INTEGER,
+            bytes_read INTEGER,
+            bytes_written INTEGER,
+            error TEXT,
+            profile_path TEXT,
+            PRIMARY KEY (run_id, stage)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_pipeline_runs_stage ON pipeline_runs(stage, started_at)")
+
+
+@migration(10, "dataset_versions: change counters for cached readers")
+def _dataset_versions(conn):
+    # Bumped by the writers of a dataset (db.bump_version), so caches of it ignore unrelated writes
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dataset_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    """)
+
+
+@migration(11, "search index: jobs_fts over jobs title, company and description")
+def _search_index(conn):
+    # External content on jobs (no copy of the text), kept in sync by triggers
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                title, company, description,
+                content='jobs', content_rowid='id', tokenize='porter unicode61'
+            )
+        """)
+    except sqlite3.OperationalError as e:  # SQLite built without FTS5; the API refuses to start
+        print(f"⚠️ Full-text search index not available: {e}")
+        return
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, company, description)
+            VALUES (new.id, new.title, new.company, new.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+            VALUES ('delete', old.id, old.title, old.company, old.description);
+        END
+    """)
+    # Only text changes touch the index, not skills/location backfills
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, description ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+            VALUES ('delete', old.id, old.title, old.company, old.description);
+            INSERT INTO jobs_fts (rowid, title, company, description)
+            VALUES (new.id, new.title, new.company, new.description);
+        END
+    """)
+    # Also indexes rows loaded before the index existed (a no-op on an empty table)
+    conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+
+@migration(12, "forecast table: skill_country_forecasts")
+def _country_forecasts(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS skill_country_forecasts (
+            skill_id INTEGER NOT NULL,
+            country_id INTEGER NOT NULL,
+            week_start TEXT NOT NULL,
+            yhat REAL,
+            yhat_lower REAL,
+            yhat_upper REAL,
+            model TEXT,
+            fingerprint TEXT,
+            fitted_at TEXT,
+            PRIMARY KEY (skill_id, country_id, week_start)
+        )
+    """)
+
+
+@migration(13, "jobs dedup columns: canonical_id, matched_roles, duplicates")
+def _dedup_columns(conn):
+    # Filled by export.py from the jobs_dedup clusters (src/etl/dedup.py)
+    columns = _columns(conn, "jobs")
+    for col, kind in [("canonical_id", "TEXT"), ("matched_roles", "TEXT"), ("duplicates", "INTEGER")]:
+        if col not in columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {kind}")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_canonical ON jobs(canonical_id)")
+
+
+@migration(14, "jobs salary columns: salary_min_annual, salary_max_annual")
+def _jobs_salary(conn):
+    # Yearly bounds in BASE_CURRENCY from process.py, comparable across countries
+    columns = _columns(conn, "jobs")
+    for col in ["salary_min_annual", "salary_max_annual"]:
+        if col not in columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} REAL")
+
+
+SCHEMA_VERSION = max(v for v, _, _ in MIGRATIONS)
+
+
+def version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn) -> int:
+    """
+    Apply pending migrations to a sqlite3 connection; returns the schema version.
+
+    Each migration runs under BEGIN IMMEDIATE and re-checks the version, so
+    processes that start at the same time apply it exactly once.
+    """
+    if version(conn) >= SCHEMA_VERSION:
+        return SCHEMA_VERSION
+    if conn.in_transaction:
+        conn.commit()
+    for number, description, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version(conn) >= number:
+                conn.rollback()
+                continue
+            fn(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        print(f"🗄️ Schema migrated to v{number}: {description}")
+    return SCHEMA_VERSION
+
+
+def main():
+    from src.db import connect
+
+    conn = connect()
+    try:
+        before = version(conn)
+        migrate(conn)
+        print(f"✅ Database schema at v{SCHEMA_VERSION}" + (f" (was v{before})" if before != SCHEMA_VERSION else ""))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,25 @@
 import os
 import sqlite3
+from collections import Counter
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-from wordcloud import WordCloud
-from collections import Counter
-
-# Forecasting
-from prophet import Prophet   # install with: pip install prophet
-
-# NLP
-import spacy
-
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    import en_core_web_sm
-    nlp = en_core_web_sm.load()
+from src.api.query import search_jobs
+from src.config import DB_PATH
+from src.dash import query
+from src.dash.frame import JobFrame
+from src.db import connect, stamp
+from src.lazy import LazyModule
+from src.nlp.cache import SkillCache
 
+# Heavy libraries load on first use, not at startup
+px = LazyModule("plotly.express")
 
+# Postings per page of the results table
+PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "50"))
 
+# "sql": every rerun filters and aggregates in SQLite; "memory": one encoded
+# JobFrame per process, shared by all sessions, filters with its row indexes
+BACKEND = os.getenv("DASHBOARD_BACKEND", "sql").lower()
 
 
 def run_etl():
@@ -40,43 +40,38 @@ def run_etl():
         return False, f"❌ Error running ETL: {e}"
 
 
-# Define DB path relative to repo root
-# Define DB path relative to repo root
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "data", "jobs.db")
-
-
 # --------------------------------------------------------------------
-# Load Data
+# Queries (filters and aggregates run in SQLite; only what is on screen is fetched)
 # --------------------------------------------------------------------
 @st.cache_data
-def load_data():
-    if os.path.exists(DB_PATH):
-        try:
-            conn = sqlite3.connect(DB_PATH)
-            df = pd.read_sql("SELECT * FROM jobs", conn)
-            conn.close()
-            return df
-        except Exception as e:
-            st.error(f"❌ Error reading database: {e}")
-            return pd.DataFrame()
-    else:
-        # Run ETL if DB missing
-        st.warning("⚠️ No jobs data found. Running ETL now...")
-        success, msg = run_etl()
-        if not success:
-            st.error(msg)
-            return pd.DataFrame()
-        else:
-            st.success(msg)
-            try:
-                conn = sqlite3.connect(DB_PATH)
-                df = pd.read_sql("SELECT * FROM jobs", conn)
-                conn.close()
-                return df
-            except Exception as e:
-                st.error(f"❌ Error loading DB after ETL: {e}")
-                return pd.DataFrame()
+def load_facets(db_stamp):
+    """Sidebar options and the salary range, re-read when jobs.db changes"""
+    city_labels = query.city_facets(DB_PATH) if query.by_city(DB_PATH) else {}
+    return {
+        "roles": query.facet_values("title", DB_PATH),
+        "locations": query.location_values(DB_PATH, city_labels),
+        "city_labels": city_labels,
+        "companies": query.facet_values("company", DB_PATH),
+        "salary": query.salary_bounds(DB_PATH),
+    }
+
+@st.cache_data
+def load_insights(db_stamp, where, params, city_labels):
+    """KPI cards and top-10 charts for one combination of filters"""
+    return {
+        **query.kpis(DB_PATH, where, params),
+        "locations": query.top_locations(DB_PATH, where, params, city_labels),
+        "companies": query.top_counts("company", DB_PATH, where, params),
+    }
+
+@st.cache_data
+def load_page(db_stamp, where, params, number, size):
+    return query.page(DB_PATH, where, params, number, size)
+
+@st.cache_resource(max_entries=1)
+def load_frame(db_stamp):
+    """In-memory backend: built once per jobs.db change, shared by every session"""
+    return JobFrame.load(DB_PATH)
 
 
 
@@ -98,8 +93,12 @@ if st.sidebar.button("🔄 Fetch Latest Jobs (Run ETL)"):
 # -------------------------
 # Auto-run ETL if no data
 # -------------------------
-df = load_data()
-if df.empty:
+try:
+    has_data = os.path.exists(DB_PATH) and query.has_jobs(DB_PATH)
+except sqlite3.Error as e:
+    st.error(f"❌ Error reading database: {e}")
+    st.stop()
+if not has_data:
     st.warning("⚠️ No jobs data found. Running ETL now...")
     success, msg = run_etl()
     if success:
@@ -110,51 +109,67 @@ if df.empty:
         st.text(msg)
         st.stop()
 
+db_stamp = stamp(DB_PATH)
+frame = load_frame(db_stamp) if BACKEND == "memory" else None
+facets = frame.options() if frame is not None else load_facets(db_stamp)
+
 # -------------------------
 # Dashboard starts here
 # -------------------------
 st.title("📊 Job Market Analytics Dashboard")
 
+# Keyword search runs against the jobs_fts index instead of scanning descriptions
+search_text = st.text_input("🔍 Search jobs", placeholder="e.g. python spark, power bi, nlp engineer")
+if search_text.strip():
+    try:
+        results = search_jobs(DB_PATH, search_text, limit=20, highlight=("**", "**"))["items"]
+    except (ValueError, LookupError, sqlite3.OperationalError) as e:
+        st.info(f"ℹ️ Search unavailable: {e}")
+        results = []
+    st.caption(f"{len(results)} best matches" if results else "No matching postings")
+    for r in results:
+        st.markdown(f"**[{r['title']}]({r['redirect_url']})** — {r['company'] or 'Unknown company'}, "
+                    f"{r['location'] or 'Unknown location'}  \n{r['snippet']}")
+    st.markdown("---")
+
 # Sidebar Filters
 st.sidebar.header("🔎 Filter Jobs")
-roles = df["title"].dropna().unique() if "title" in df.columns else []
-selected_roles = st.sidebar.multiselect("Filter by Job Role", roles)
-
-locations = df["location"].dropna().unique() if "location" in df.columns else []
-selected_locations = st.sidebar.multiselect("Filter by Location", locations)
-
-companies = df["company"].dropna().unique() if "company" in df.columns else []
-selected_companies = st.sidebar.multiselect("Filter by Company", companies)
-
-# Salary filter (only if columns exist)
-if {"salary_min", "salary_max"}.issubset(df.columns):
-    if df[["salary_min", "salary_max"]].notna().any().any():
-        salary_min = int(df["salary_min"].fillna(0).min())
-        salary_max = int(df["salary_max"].fillna(0).max())
-        selected_salary = st.sidebar.slider(
-            "Filter by Salary Range", salary_min, salary_max, (salary_min, salary_max)
-        )
-    else:
-        selected_salary = None
+selected_roles = st.sidebar.multiselect("Filter by Job Role", facets["roles"])
+
+# Postings the location stage resolved are listed by city, the rest by their raw location
+city_labels = facets["city_labels"]
+selected_locations = st.sidebar.multiselect("Filter by Location", facets["locations"])
+
+selected_companies = st.sidebar.multiselect("Filter by Company", facets["companies"])
+
+# Salary filter (only if some posting has a salary)
+if facets["salary"]:
+    salary_min, salary_max = facets["salary"]
+    selected_salary = st.sidebar.slider(
+        "Filter by Salary Range", salary_min, salary_max, (salary_min, salary_max)
+    )
 else:
     selected_salary = None
 
 # Apply filters
-filtered_df = df.copy()
-if selected_roles:
-    filtered_df = filtered_df[filtered_df["title"].isin(selected_roles)]
-if selected_locations:
-    filtered_df = filtered_df[filtered_df["location"].isin(selected_locations)]
-if selected_companies:
-    filtered_df = filtered_df[filtered_df["company"].isin(selected_companies)]
-if selected_salary:
-    filtered_df = filtered_df[
-        (filtered_df["salary_min"].fillna(0) >= selected_salary[0])
-        & (filtered_df["salary_max"].fillna(1_000_000) <= selected_salary[1])
-    ]
-
-st.subheader(f"📋 Showing {len(filtered_df)} job postings")
-st.dataframe(filtered_df)
+if frame is not None:
+    mask = frame.select(selected_roles, selected_locations, selected_companies, selected_salary)
+    insights = frame.insights(mask)
+else:
+    where, params = query.filter_sql(selected_roles, selected_locations, selected_companies,
+                                     selected_salary, city_labels)
+    params = tuple(params)
+    insights = load_insights(db_stamp, where, params, city_labels)
+
+st.subheader(f"📋 Showing {insights['total']:,} job postings")
+page_count = max(1, -(-insights["total"] // PAGE_SIZE))
+page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1) if page_count > 1 else 1
+if frame is not None:
+    st.dataframe(frame.page(mask, int(page_number), PAGE_SIZE))
+else:
+    st.dataframe(load_page(db_stamp, where, params, int(page_number), PAGE_SIZE))
+if page_count > 1:
+    st.caption(f"Page {int(page_number)} of {page_count:,}")
 
 # -------------------------
 # KPI Cards
@@ -162,30 +177,25 @@ st.dataframe(filtered_df)
 st.markdown("---")
 st.subheader("📊 Key Insights")
 
+location_counts = insights["locations"]
+company_counts = insights["companies"]
+
 kpi1, kpi2, kpi3, kpi4 = st.columns(4)
 
 with kpi1:
-    st.metric("📌 Total Jobs", f"{len(filtered_df):,}")
+    st.metric("📌 Total Jobs", f"{insights['total']:,}")
 
 with kpi2:
-    avg_salary = filtered_df[["salary_min", "salary_max"]].mean().mean()
-    avg_salary_text = f"${int(avg_salary):,}" if pd.notna(avg_salary) else "N/A"
+    avg_salary = insights["avg_salary"]
+    avg_salary_text = f"${int(avg_salary):,}" if avg_salary is not None else "N/A"
     st.metric("💰 Avg. Salary", avg_salary_text)
 
 with kpi3:
-    top_location = (
-        filtered_df["location"].mode()[0]
-        if "location" in filtered_df and not filtered_df["location"].dropna().empty
-        else "N/A"
-    )
+    top_location = location_counts.index[0] if not location_counts.empty else "N/A"
     st.metric("📍 Top Location", top_location)
 
 with kpi4:
-    top_company = (
-        filtered_df["company"].mode()[0]
-        if "company" in filtered_df and not filtered_df["company"].dropna().empty
-        else "N/A"
-    )
+    top_company = company_counts.index[0] if not company_counts.empty else "N/A"
     st.metric("🏢 Top Company", top_company)
 
 # -------------------------
@@ -197,8 +207,7 @@ st.subheader("📈 Job Insights")
 row1_col1, row1_col2 = st.columns(2)
 with row1_col1:
     st.markdown("**📍 Jobs by Location (Top 10)**")
-    if "location" in filtered_df and not filtered_df["location"].dropna().empty:
-        location_counts = filtered_df["location"].value_counts().head(10)
+    if not location_counts.empty:
         fig = px.bar(location_counts, x=location_counts.index, y=location_counts.values,
                      labels={"x": "Location", "y": "Job Count"}, color=location_counts.values,
                      color_continuous_scale="Blues")
@@ -206,8 +215,7 @@ with row1_col1:
 
 with row1_col2:
     st.markdown("**🏢 Jobs by Top Companies**")
-    if "company" in filtered_df and not filtered_df["company"].dropna().empty:
-        company_counts = filtered_df["company"].value_counts().head(10)
+    if not company_counts.empty:
         fig = px.bar(company_counts, x=company_counts.index, y=company_counts.values,
                      labels={"x": "Company", "y": "Job Count"}, color=company_counts.values,
                      color_continuous_scale="Purples")
@@ -218,27 +226,27 @@ with row1_col2:
 # -------------------------
 st.markdown("---")
 st.subheader("🔮 Job Postings Forecast")
+
+@st.cache_data
+def load_forecast(db_stamp):
+    """Forecast written offline by src/forecast/train.py (re-read when jobs.db changes)"""
+    conn = connect(DB_PATH, readonly=True)
+    try:
+        return pd.read_sql("SELECT ds, yhat, yhat_lower, yhat_upper, fitted_at FROM postings_forecast ORDER BY ds", conn)
+    finally:
+        conn.close()
+
 try:
-    if "created" in df.columns:
-        forecast_df = df.copy()
-        forecast_df["created"] = pd.to_datetime(forecast_df["created"], errors="coerce")
-        daily_counts = forecast_df.groupby(forecast_df["created"].dt.date).size().reset_index(name="y")
-        daily_counts.rename(columns={"created": "ds"}, inplace=True)
-
-        if len(daily_counts) > 5:
-            model = Prophet()
-            model.fit(daily_counts)
-            future = model.make_future_dataframe(periods=30)
-            forecast = model.predict(future)
-
-            fig1 = px.line(forecast, x="ds", y="yhat", title="Job Postings Forecast (Next 30 Days)")
-            st.plotly_chart(fig1, use_container_width=True)
-        else:
-            st.info("⚠️ Not enough data for forecasting.")
+    forecast = load_forecast(stamp(DB_PATH))
+    if not forecast.empty:
+        forecast["ds"] = pd.to_datetime(forecast["ds"])
+        fig1 = px.line(forecast, x="ds", y="yhat", title="Job Postings Forecast (Next 30 Days)")
+        st.plotly_chart(fig1, use_container_width=True)
+        st.caption(f"Model fitted at {forecast['fitted_at'].iloc[0]}")
     else:
-        st.info("⚠️ No timestamp column ('created') available for forecasting.")
-except Exception as e:
-    st.error(f"⚠️ Could not generate forecast: {e}")
+        st.info("⚠️ Not enough data for forecasting.")
+except Exception:
+    st.info("⚠️ No forecast yet. Run: python -m src.forecast.train")
 
 # -------------------------
 # NLP Skill Extraction
@@ -246,24 +254,25 @@ except Exception as e:
 st.markdown("---")
 st.subheader("🛠️ Top 10 Skills in Demand (NLP Extracted)")
 
-def extract_skills_from_text(text, skill_list):
-    doc = nlp(text)
-    return [token.text for token in doc if token.text.lower() in [s.lower() for s in skill_list]]
-
-skill_list = [
-    "Python", "SQL", "Excel", "Machine Learning", "Deep Learning", "AI",
-    "TensorFlow", "PyTorch", "NLP", "Data Analysis", "Statistics",
-    "Tableau", "Power BI", "AWS", "Azure", "GCP", "Java", "C++",
-    "R", "Hadoop", "Spark", "Scala", "Docker", "Kubernetes"
-]
+@st.cache_resource
+def get_skill_cache():
+    """Persistent per-description skill cache, shared by every session in this process"""
+    return SkillCache()
 
-all_skills = []
-if "description" in df.columns:
-    for desc in df["description"].dropna():
-        all_skills.extend(extract_skills_from_text(desc, skill_list))
-
-if all_skills:
-    skill_counts = pd.Series(all_skills).str.strip().value_counts().head(10)
+@st.cache_data
+def load_skill_counts(db_stamp):
+    """Top skills from job_skills; tagged here in batches only if the skills stage has not run"""
+    counts = query.top_skills(DB_PATH)
+    if not counts.empty:
+        return counts
+    tally = Counter()
+    for batch in query.descriptions(DB_PATH):
+        for skills in get_skill_cache().extract_many(batch):
+            tally.update(s.strip() for s in skills)
+    return pd.Series(dict(tally.most_common(10)), dtype="int64")
+
+skill_counts = load_skill_counts(db_stamp)
+if not skill_counts.empty:
     fig_skills = px.bar(
         x=skill_counts.values, y=skill_counts.index, orientation="h",
         labels={"x": "Job Count", "y": "Skill"},
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from src.etl.dedup import dedupe
+
+DESCRIPTION = ("We are hiring a data engineer to build batch and streaming pipelines in Python and SQL, "
+               "own our Airflow deployment, model data in dbt and keep the warehouse fast and tidy. ")
+
+
+def _posting(company, created, role, title="Data Engineer", description=DESCRIPTION, url=None):
+    return {"title": title, "company": company, "location": "London", "created": created,
+            "description": description, "redirect_url": url or f"https://x/{company}/{created}",
+            "search_role": role}
+
+
+def test_near_duplicates_collapse_within_a_company_only():
+    df = pd.DataFrame([
+        _posting("Acme", "2024-05-02", "data engineer"),
+        # Reposted with a trailing sentence and a title variant
+        _posting("ACME ", "2024-05-01", "python developer", title="Data Engineer (Remote)",
+                 description=DESCRIPTION + "Apply today."),
+        # Same text at another company (e.g. an agency) stays a separate posting
+        _posting("Globex", "2024-05-03", "data engineer"),
+        _posting("Acme", "2024-05-04", "data engineer", title="Office Manager",
+                 description="Run the office, order supplies and organise team events for forty people."),
+    ])
+    out = dedupe(df)
+    assert sorted(out["company"].str.strip()) == ["ACME", "Acme", "Globex"]
+    assert out["duplicates"].tolist() == [1, 0, 0]
+
+
+def test_canonical_row_is_the_earliest_copy_with_all_roles():
+    df = pd.DataFrame([
+        _posting("Acme", "2024-05-03", "data engineer", url="https://x/late"),
+        _posting("Acme", "2024-05-01", "python developer", url="https://x/early"),
+        _posting("Acme", None, "analytics engineer", url="https://x/undated"),
+    ])
+    out = dedupe(df)
+    assert len(out) == 1
+    row = out.iloc[0]
+    assert row["redirect_url"] == "https://x/early"
+    assert row["matched_roles"] == "analytics engineer, data engineer, python developer"
+    assert row["duplicates"] == 2
+    assert row["canonical_id"] and row["canonical_id"] == dedupe(df.iloc[[1]])["canonical_id"].iloc[0]
@@ -0,0 +1,80 @@
+import time
+
+import requests
+
+from src.etl.fetcher import AdzunaFetcher
+
+
+class StubResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def json(self):
+        if isinstance(self.body, Exception):
+            raise self.body
+        return self.body
+
+
+class StubSession:
+    """Answers search pages from `pages`; `failures[(country, page)]` are served first, in order."""
+
+    def __init__(self, pages, failures=None):
+        self.pages = pages
+        self.failures = {k: list(v) for k, v in (failures or {}).items()}
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        country, page = url.split("/")[-3], int(url.split("/")[-1])
+        self.calls.append((country, page, time.monotonic()))
+        queued = self.failures.get((country, page))
+        if queued:
+            failure = queued.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        return StubResponse(body=self.pages[country][page])
+
+
+def results(country, page, n=2):
+    return [{"title": f"{country} job {page}.{i}", "company": {"display_name": "Acme"},
+             "redirect_url": f"https://example.com/{country}/{page}/{i}"} for i in range(n)]
+
+
+def test_run_fetches_every_page_and_retries_transient_failures():
+    pages = {"gb": {p: {"count": 6, "results": results("gb", p)} for p in (1, 2, 3)}}
+    session = StubSession(pages, failures={
+        ("gb", 2): [StubResponse(429, headers={"Retry-After": "0"}), requests.exceptions.ChunkedEncodingError("cut")],
+        ("gb", 3): [StubResponse(body=ValueError("bad json"))],
+    })
+    fetcher = AdzunaFetcher("id", "key", results_per_page=2, rate=0, backoff=0, session=session)
+
+    rows = []
+    assert fetcher.run([("data engineer", "gb")], rows.extend) == 6
+    assert sorted(r["title"] for r in rows) == sorted(f"gb job {p}.{i}" for p in (1, 2, 3) for i in range(2))
+    assert sorted((c, p) for c, p, _ in session.calls) == [("gb", 1), ("gb", 2), ("gb", 2), ("gb", 2),
+                                                          ("gb", 3), ("gb", 3)]
+
+
+def test_a_page_that_keeps_failing_is_skipped_not_fatal():
+    pages = {"gb": {1: {"count": 4, "results": results("gb", 1)}, 2: None},
+             "us": {1: {"count": 2, "results": results("us", 1)}}}
+    session = StubSession(pages, failures={("gb", 2): [StubResponse(body=ValueError("bad json"))] * 3})
+    fetcher = AdzunaFetcher("id", "key", results_per_page=2, rate=0, backoff=0, max_retries=2, session=session)
+
+    rows = []
+    assert fetcher.run([("analyst", "gb"), ("analyst", "us")], rows.extend) == 4
+    assert {r["search_country"] for r in rows} == {"gb", "us"}
+
+
+def test_requests_are_rate_limited():
+    pages = {"gb": {p: {"count": 10, "results": results("gb", p, 1)} for p in range(1, 11)}}
+    session = StubSession(pages)
+    fetcher = AdzunaFetcher("id", "key", results_per_page=1, rate=50, burst=1, concurrency=4, session=session)
+
+    fetcher.run([("analyst", "gb")], lambda rows: None)
+    times = sorted(t for _, _, t in session.calls)
+    assert len(times) == 10
+    # 10 requests at 50/s with no burst take at least 9 intervals of 20 ms
+    assert times[-1] - times[0] >= 9 / 50 * 0.9
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from src.forecast.fast import forecast_many
+
+
+def weekly(start, values):
+    return pd.DataFrame({"ds": pd.date_range(start, periods=len(values), freq="7D"),
+                         "y": np.asarray(values, dtype=float)})
+
+
+def test_series_of_different_lengths_forecast_from_their_own_last_date():
+    short = weekly("2024-01-01", [30.0] * 20)
+    long = weekly("2023-10-23", np.arange(30.0))
+
+    batched = forecast_many({"short": short, "long": long}, periods=4, freq="W")
+
+    for key, series in (("short", short), ("long", long)):
+        frame = batched[key]
+        future = frame["ds"].iloc[-4:]
+        expected = series["ds"].iloc[-1] + pd.Timedelta(days=7) * np.arange(1, 5)
+        assert list(future) == list(expected)
+        assert (frame["ds"].dt.weekday == 0).all()  # weeks start on Monday, like week_start
+        assert list(frame["ds"].iloc[:len(series)]) == list(series["ds"])
+        # The batch it shares must not change a series' forecast
+        assert frame.equals(forecast_many({key: series}, periods=4, freq="W")[key])
+
+    assert np.allclose(batched["short"]["yhat"].iloc[-4:], 30.0)
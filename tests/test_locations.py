@@ -0,0 +1,55 @@
+import pandas as pd
+
+from src.etl.locations import Gazetteer
+
+ROWS = [
+    {"kind": "country", "name": "United States", "aliases": "us|usa"},
+    {"kind": "country", "name": "Canada", "aliases": ""},
+    {"kind": "country", "name": "United Kingdom", "aliases": "uk"},
+    {"kind": "country", "name": "Singapore", "aliases": ""},
+    {"kind": "state", "name": "New York", "country": "United States", "aliases": "ny"},
+    {"kind": "state", "name": "Washington", "country": "United States", "aliases": "wa"},
+    {"kind": "state", "name": "Ontario", "country": "Canada", "aliases": "on"},
+    {"kind": "state", "name": "England", "country": "United Kingdom", "aliases": ""},
+    {"kind": "state", "name": "Singapore", "country": "Singapore", "aliases": ""},
+    {"kind": "city", "name": "New York City", "state": "New York", "country": "United States",
+     "aliases": "new york|nyc"},
+    {"kind": "city", "name": "Seattle", "state": "Washington", "country": "United States", "aliases": ""},
+    {"kind": "city", "name": "London", "state": "England", "country": "United Kingdom", "aliases": ""},
+    {"kind": "city", "name": "Singapore", "state": "Singapore", "country": "Singapore", "aliases": ""},
+]
+
+
+def _names(g, ids):
+    city, state, country = ids
+    return (city and g.cities[city - 1], state and g.states[state - 1], country and g.countries[country - 1])
+
+
+def test_city_state_and_country_names_that_collide():
+    g = Gazetteer(ROWS)
+    # One part that is a city and a state reads as the city; a second part then reads as its state
+    assert _names(g, g.resolve("New York")) == ("New York City", "New York", "United States")
+    assert _names(g, g.resolve("New York, NY")) == ("New York City", "New York", "United States")
+    # A name that is only a state stays a state
+    assert _names(g, g.resolve("Washington, USA")) == (None, "Washington", "United States")
+    # City, state and country all called Singapore
+    assert _names(g, g.resolve("Singapore")) == ("Singapore", "Singapore", "Singapore")
+
+
+def test_conflicting_parts_drop_the_more_specific_match():
+    g = Gazetteer(ROWS)
+    # London, Ontario is not the gazetteer's London: keep the state, not the city
+    assert _names(g, g.resolve("London, Ontario")) == (None, "Ontario", "Canada")
+    assert _names(g, g.resolve("London, UK")) == ("London", "England", "United Kingdom")
+    # A state in another country is dropped in favour of the country
+    assert _names(g, g.resolve("Ontario, United States")) == (None, None, "United States")
+    assert g.resolve("Remote") == (None, None, None)
+
+
+def test_suffixes_punctuation_and_resolve_many():
+    g = Gazetteer(ROWS)
+    assert _names(g, g.resolve("Seattle Metro Area, WA")) == ("Seattle", "Washington", "United States")
+    assert _names(g, g.resolve("  new-york , u.s.a ")) == ("New York City", "New York", "United States")
+    ids = g.resolve_many(pd.Series(["London, UK", None, "London, UK", "Nowhere"]))
+    assert ids["city_id"].tolist() == [3, pd.NA, 3, pd.NA]
+    assert ids["country_id"].tolist() == [3, pd.NA, 3, pd.NA]
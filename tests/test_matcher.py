@@ -0,0 +1,48 @@
+from src.nlp.matcher import get_matcher
+
+# The skill list and substring test the matcher replaced (src/etl/skills.py before the trie)
+OLD_SKILLS = [
+    "Python", "SQL", "Excel", "Machine Learning", "Deep Learning", "AI",
+    "TensorFlow", "PyTorch", "NLP", "Data Analysis", "Statistics",
+    "Tableau", "Power BI", "AWS", "Azure", "GCP", "Java", "C++",
+    "R", "Hadoop", "Spark", "Scala", "Docker", "Kubernetes"
+]
+
+
+def _substring_skills(text):
+    return {s.lower() for s in OLD_SKILLS if s.lower() in text.lower()}
+
+
+def _matched(text):
+    old = {s.lower() for s in OLD_SKILLS}
+    return {s for s in get_matcher().extract(text) if s in old}
+
+
+# (description, skills the substring test found only inside other words)
+DESCRIPTIONS = [
+    ("Senior Data Analyst: SQL, Excel and Tableau or Power BI dashboards; Python is a plus.", {"r"}),
+    ("Research engineer building deep learning models in PyTorch and TensorFlow, deployed with Docker on AWS.",
+     {"r"}),
+    ("Data engineer (Spark, Scala, Hadoop) on Azure and GCP. Java or C++ background welcome.", {"r"}),
+    ("Statistics and data analysis in R; NLP experience with transformers desirable.", set()),
+    ("Platform role: Kubernetes, Docker, AWS. Machine learning exposure helpful.", {"r"}),
+]
+
+
+def test_matches_old_substring_output_on_real_mentions():
+    for text, in_words in DESCRIPTIONS:
+        assert _matched(text) == _substring_skills(text) - in_words, text
+
+
+def test_no_skills_inside_words_or_from_generic_words():
+    text = ("Maintain our reporting stack and ship containers of stock; the torch relay team "
+            "needs viz of usage stats. Regular travel.")
+    # The substring test found "ai" in maintain and "r" in reporting
+    assert {"ai", "r"} <= _substring_skills(text)
+    assert get_matcher().extract(text) == []
+
+
+def test_aliases_map_to_canonical_names():
+    assert get_matcher().extract("PowerBI, sklearn, k8s and Amazon Web Services") == [
+        "power bi", "scikit-learn", "kubernetes", "aws"
+    ]
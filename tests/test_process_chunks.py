@@ -0,0 +1,31 @@
+import math
+
+from src.etl import process, storage
+
+
+def write_jobs(n):
+    writer = storage.FrameWriter("jobs", process.EXPECTED_COLS[:8], export_csv=False)
+    writer.write_rows([{"title": f"Data Engineer {i}", "company": f"Company {i % 7}", "location": "London",
+                        "created": "2024-01-01T00:00:00Z", "salary_min": 50000.0, "salary_max": 60000.0,
+                        "description": f"Python and SQL pipelines, posting {i}. " * 20,
+                        "redirect_url": f"https://example.com/{i}"} for i in range(n)])
+    writer.close()
+
+
+def test_small_memory_budget_streams_in_budget_sized_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(storage, "ROW_GROUP_MB", 0.1)
+    write_jobs(2000)
+
+    chunk_rows = process.chunk_rows_for(1, source="jobs")
+    # Row groups are no larger than a budget-sized chunk, so reading one never decodes more
+    assert storage.row_group_rows("jobs") <= chunk_rows < 2000
+
+    sizes = []
+    clean_chunk = process.clean_chunk
+    monkeypatch.setattr(process, "clean_chunk", lambda df, matcher: (sizes.append(len(df)), clean_chunk(df, matcher))[1])
+    process.main(max_memory_mb=1)
+
+    assert len(sizes) == math.ceil(2000 / chunk_rows)
+    assert max(sizes) <= chunk_rows and sum(sizes) == 2000
+    assert storage.count_rows("processed/jobs_clean") == 2000
@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from src.etl.salary import ANNUAL_COLS, load_rates, parse_salaries
+
+
+def test_inverted_ranges_and_years_are_not_salaries():
+    parsed = parse_salaries(pd.Series(["work 9-5 pa", "covid 19 - 2020 per year",
+                                       "work 9-5 pa. Pay $80k - $100k/year"]), "USD")
+    assert parsed["salary_min"].iloc[:2].isna().all()
+    assert parsed.iloc[2][["salary_min", "salary_max", "salary_period"]].tolist() == [80000.0, 100000.0, "year"]
+
+
+def test_process_carries_yearly_salaries():
+    from src.etl.process import clean_chunk
+    from src.nlp.matcher import get_matcher
+
+    raw = pd.DataFrame({
+        "title": ["Analyst", "Engineer", "Scientist"],
+        "company": ["A", "B", "C"],
+        "location": ["Pune, Maharashtra", "Austin, Texas", "Remote"],
+        "created": ["2025-07-01"] * 3,
+        "salary_min": [None, 90000.0, None],
+        "salary_max": [None, 110000.0, None],
+        "description": ["SQL and Excel. Salary ₹8-12 LPA.", "Python on AWS.", "No pay given."],
+        "redirect_url": ["u1", "u2", "u3"],
+        "search_country": ["in", "us", "gb"],
+    })
+    df, _ = clean_chunk(raw, get_matcher())
+    assert "search_country" not in df
+    rates = load_rates()
+    # Parsed from the description, else the structured yearly fields in the country's currency
+    assert df["salary_min_annual"].tolist()[:2] == [pytest.approx(800000 * rates["INR"]), pytest.approx(90000.0)]
+    assert df["salary_max_annual"].tolist()[:2] == [pytest.approx(1200000 * rates["INR"]), pytest.approx(110000.0)]
+    assert df.loc[2, ANNUAL_COLS].isna().all()